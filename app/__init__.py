@@ -1,8 +1,185 @@
-from flask import Flask
-from app.routes import calendar, appointments
+import gzip
+import zlib
 
-def create_app():
+from flask import Flask, g, request
+
+from app.constans import constants
+from app.routes import calendar, appointments, batch, debug
+from app.services import cache_warmer_service, expiry_sweeper_service, hold_reaper_service
+from app.utils.idempotency_utils import booking_idempotency_store
+from app.utils.profiling_utils import configure_profiling, start_profile, stop_profile
+from app.utils.tracing_utils import configure_tracing, start_trace, end_trace, get_current_span
+
+
+def create_app(config=None):
     app = Flask(__name__)
+    app.config.update(
+        TRACE_SAMPLE_RATE=constants.TRACE_SAMPLE_RATE,
+        TRACE_BUFFER_SIZE=constants.TRACE_BUFFER_SIZE,
+        TRACE_EXPORT_FILE=None,
+        PROFILING_ENABLED=False,
+        PROFILE_SAMPLE_RATE=constants.PROFILE_SAMPLE_RATE,
+        PROFILE_TRACE_MEMORY=False,
+        CACHE_WARMER_ENABLED=False,
+        CACHE_WARMER_DAYS=constants.CACHE_WARMER_DAYS,
+        CACHE_WARMER_WORKERS=constants.CACHE_WARMER_WORKERS,
+        CACHE_WARMER_INTERVAL_SECONDS=constants.CACHE_WARMER_INTERVAL_SECONDS,
+        CACHE_WARMER_HOT_OWNERS=[],
+        CACHE_WARMER_HOT_THRESHOLD=constants.CACHE_WARMER_HOT_THRESHOLD,
+        SLOT_CACHE_MAX_DAYS=constants.SLOT_CACHE_MAX_DAYS,
+        SEARCH_CACHE_MAX_AGE=constants.SEARCH_CACHE_MAX_AGE,
+        IDEMPOTENCY_TTL_SECONDS=constants.IDEMPOTENCY_TTL_SECONDS,
+        IDEMPOTENCY_MAX_KEYS=constants.IDEMPOTENCY_MAX_KEYS,
+        COMPRESSION_ENABLED=True,
+        COMPRESSION_MIN_SIZE=constants.COMPRESSION_MIN_SIZE,
+        COMPRESSION_LEVEL=constants.COMPRESSION_LEVEL,
+        # None starts the sweeper and the reaper unless TESTING is set
+        EXPIRY_SWEEPER_ENABLED=None,
+        EXPIRY_SWEEP_INTERVAL_SECONDS=constants.EXPIRY_SWEEP_INTERVAL_SECONDS,
+        HOLD_TTL_SECONDS=constants.HOLD_TTL_SECONDS,
+        HOLD_REAPER_ENABLED=None,
+        HOLD_REAP_INTERVAL_SECONDS=constants.HOLD_REAP_INTERVAL_SECONDS,
+        INVITEE_DOUBLE_BOOKING_CHECK=False,
+        DEBUG_ENDPOINTS_ENABLED=False,
+    )
+    app.config.from_prefixed_env()
+    if config:
+        app.config.update(config)
+
     app.register_blueprint(calendar.bp, url_prefix="/api/calendar")
     app.register_blueprint(appointments.bp, url_prefix="/api/appointments")
-    return app
\ No newline at end of file
+    app.register_blueprint(batch.bp, url_prefix="/api")
+    if app.config["DEBUG_ENDPOINTS_ENABLED"]:
+        # Traces and profiles expose request internals, so they are only served when asked for
+        app.register_blueprint(debug.bp, url_prefix="/api/debug")
+    booking_idempotency_store.configure(
+        ttl_seconds=float(app.config["IDEMPOTENCY_TTL_SECONDS"]),
+        max_keys=int(app.config["IDEMPOTENCY_MAX_KEYS"]),
+    )
+    init_tracing(app)
+    init_profiling(app)
+    init_cache_warmer(app)
+    if app.config["COMPRESSION_ENABLED"]:
+        init_compression(app)
+    for background_task in ("EXPIRY_SWEEPER_ENABLED", "HOLD_REAPER_ENABLED"):
+        if app.config[background_task] is None:
+            app.config[background_task] = not app.config["TESTING"]
+    if app.config["EXPIRY_SWEEPER_ENABLED"]:
+        app.extensions["expiry_sweeper"] = expiry_sweeper_service.start_expiry_sweeper(
+            float(app.config["EXPIRY_SWEEP_INTERVAL_SECONDS"])
+        )
+    if app.config["HOLD_REAPER_ENABLED"]:
+        app.extensions["hold_reaper"] = hold_reaper_service.start_hold_reaper(
+            float(app.config["HOLD_REAP_INTERVAL_SECONDS"])
+        )
+    return app
+
+
+def init_tracing(app: Flask):
+    """
+    Open a root span for every sampled request, or any request sent with the trace header.
+    """
+    configure_tracing(
+        sample_rate=float(app.config["TRACE_SAMPLE_RATE"]),
+        buffer_size=int(app.config["TRACE_BUFFER_SIZE"]),
+        export_file=app.config["TRACE_EXPORT_FILE"],
+    )
+
+    @app.before_request
+    def begin_request_trace():
+        g.trace_token = start_trace(
+            f"{request.method} {request.path}",
+            force=constants.TRACE_HEADER in request.headers,
+            endpoint=request.endpoint
+        )
+
+    @app.after_request
+    def add_trace_id_header(response):
+        current_span = get_current_span()
+        if current_span is not None:
+            current_span.attributes["status_code"] = response.status_code
+            response.headers[constants.TRACE_ID_HEADER] = current_span.trace_id
+        return response
+
+    @app.teardown_request
+    def finish_request_trace(exc):
+        token = g.pop("trace_token", None)
+        end_trace(token, error=str(exc) if exc else None)
+
+
+def init_profiling(app: Flask):
+    """
+    Profile a sampled fraction of requests, or any request sent with the profile header, when
+    profiling is enabled. Stats are aggregated per route and served from the debug blueprint.
+    """
+    configure_profiling(
+        enabled=bool(app.config["PROFILING_ENABLED"]),
+        sample_rate=float(app.config["PROFILE_SAMPLE_RATE"]),
+        trace_memory=bool(app.config["PROFILE_TRACE_MEMORY"]),
+    )
+    if not app.config["PROFILING_ENABLED"]:
+        return
+
+    @app.before_request
+    def begin_request_profile():
+        g.profiler = start_profile(force=constants.PROFILE_HEADER in request.headers)
+
+    @app.teardown_request
+    def finish_request_profile(exc):
+        stop_profile(g.pop("profiler", None), request.endpoint or request.path)
+
+
+def init_cache_warmer(app: Flask):
+    """
+    Start the background slot cache warmer and let it back off while requests are being served.
+    """
+    if not app.config["CACHE_WARMER_ENABLED"]:
+        return
+    warmer = cache_warmer_service.start_cache_warmer(
+        days_ahead=int(app.config["CACHE_WARMER_DAYS"]),
+        workers=int(app.config["CACHE_WARMER_WORKERS"]),
+        interval_seconds=float(app.config["CACHE_WARMER_INTERVAL_SECONDS"]),
+        hot_owners=app.config["CACHE_WARMER_HOT_OWNERS"],
+        hot_threshold=int(app.config["CACHE_WARMER_HOT_THRESHOLD"]),
+        max_cached_days=int(app.config["SLOT_CACHE_MAX_DAYS"]),
+    )
+    app.extensions["cache_warmer"] = warmer
+
+    @app.before_request
+    def mark_foreground_started():
+        warmer.foreground_started()
+
+    @app.teardown_request
+    def mark_foreground_finished(exc):
+        warmer.foreground_finished()
+
+
+def init_compression(app: Flask):
+    """
+    Compress responses above the size threshold with gzip or deflate, as accepted by the client.
+    """
+    min_size = int(app.config["COMPRESSION_MIN_SIZE"])
+    level = int(app.config["COMPRESSION_LEVEL"])
+
+    @app.after_request
+    def compress_response(response):
+        response.vary.add("Accept-Encoding")
+        if (response.status_code != 200 or response.direct_passthrough
+                or "Content-Encoding" in response.headers):
+            return response
+        encoding = request.accept_encodings.best_match(["gzip", "deflate"])
+        if encoding is None:
+            return response
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+        if encoding == "gzip":
+            response.set_data(gzip.compress(data, compresslevel=level))
+        else:
+            response.set_data(zlib.compress(data, level))
+        response.headers["Content-Encoding"] = encoding
+        # The compressed body differs byte for byte, so only a weak validator still holds
+        etag, _ = response.get_etag()
+        if etag:
+            response.set_etag(etag, weak=True)
+        return response
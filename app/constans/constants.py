@@ -2,4 +2,89 @@ DATE_FORMAT = "%Y-%m-%d"
 TIME_FORMAT = "%H:%M"
 DATETIME_FORMAT = f"{DATE_FORMAT}T{TIME_FORMAT}"
 SLOT_START_KEY = "start"
-SLOT_END_KEY = "end"
\ No newline at end of file
+SLOT_END_KEY = "end"
+SLOT_SEATS_LEFT_KEY = "seats_left"
+TEAM_FREE_MEMBERS_KEY = "free_members"
+
+# Tracing
+TRACE_SAMPLE_RATE = 0.0
+TRACE_BUFFER_SIZE = 1000
+TRACE_HEADER = "X-Trace"
+TRACE_ID_HEADER = "X-Trace-Id"
+
+# Profiling
+PROFILE_SAMPLE_RATE = 0.0
+PROFILE_HEADER = "X-Profile"
+
+# Cache warmer
+CACHE_WARMER_DAYS = 7
+CACHE_WARMER_WORKERS = 2
+CACHE_WARMER_INTERVAL_SECONDS = 60
+CACHE_WARMER_POLL_SECONDS = 1
+CACHE_WARMER_HOT_THRESHOLD = 5
+CACHE_WARMER_YIELD_SECONDS = 0.01
+CACHE_WARMER_MAX_YIELDS = 100
+SLOT_CACHE_MAX_DAYS = 10000
+
+# Expiry sweeper
+EXPIRY_SWEEP_INTERVAL_SECONDS = 3600
+EXPIRY_KIND_APPOINTMENTS = "appointments"
+EXPIRY_KIND_SLOT_CACHE = "slot_cache"
+EXPIRY_KIND_RECURRING_APPOINTMENT = "recurring_appointment"
+
+# Conditional requests
+ETAG_LENGTH = 20
+
+# Wire formats and compression
+JSON_MIMETYPE = "application/json"
+COMPACT_JSON_MIMETYPE = "application/vnd.calendar.compact+json"
+MSGPACK_MIMETYPE = "application/msgpack"
+COMPRESSION_MIN_SIZE = 500
+COMPRESSION_LEVEL = 6
+
+# Search
+MAX_SEARCH_RANGE_DAYS = 31
+SEARCH_CACHE_MAX_AGE = 30
+
+# Batch API
+BATCH_MAX_OPERATIONS = 100
+BATCH_MAX_WORKERS = 8
+
+# Idempotency
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+IDEMPOTENCY_TTL_SECONDS = 24 * 60 * 60
+IDEMPOTENCY_MAX_KEYS = 10000
+
+# Holds
+HOLD_TTL_SECONDS = 300
+HOLD_MAX_TTL_SECONDS = 1800
+HOLD_REAP_INTERVAL_SECONDS = 1
+
+# Recurring availability
+# Bit i of a weekday mask stands for date.weekday() == i, Monday is bit 0
+WEEKDAY_NAMES = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+ALL_WEEKDAYS_MASK = 0b1111111
+
+# Recurring appointments
+# Occurrence ids are "<series_id>@<YYYY-MM-DD>"
+OCCURRENCE_ID_SEPARATOR = "@"
+# Days of a series listed as upcoming when the request gives no end date
+RECURRING_EXPANSION_DAYS = 90
+
+# Rule templates
+# Template slot lists kept in memory, oldest entries are evicted first
+TEMPLATE_SLOT_CACHE_MAX_ENTRIES = 50000
+
+# Team booking
+# Members are compared by their appointments within this many days either side of the booked day
+TEAM_LOAD_DAYS = 3
+
+# Utilization analytics
+# Reports group days by day or by week starting on Monday
+UTILIZATION_BUCKETS = ("day", "week")
+UTILIZATION_MAX_DAYS = 731
+# Computed days kept per calendar, oldest entries are evicted first
+UTILIZATION_INDEX_MAX_DAYS = 2 * UTILIZATION_MAX_DAYS
+# Days computed per hold of the slot cache lock, so long reports do not hold up bookings
+UTILIZATION_LOCK_DAYS = 31
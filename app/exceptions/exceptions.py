@@ -3,3 +3,15 @@ class NoCalenderFoundException(Exception):
 
 class NoAvailableSlotsInCacheException(Exception):
     pass
+
+class IdempotencyKeyConflictException(Exception):
+    pass
+
+class AppointmentNotFoundException(Exception):
+    pass
+
+class HoldNotFoundException(Exception):
+    pass
+
+class InviteeDoubleBookedException(Exception):
+    pass
@@ -0,0 +1,49 @@
+from datetime import timedelta
+from typing import Any, Dict
+
+from app.constans import constants
+from app.models.blackout_request import BlackoutRequest
+from app.utils.datetime_utils import parse_date
+from app.utils.tracing_utils import traced
+
+
+@traced()
+def map_to_blackout_request(data: Dict[str, Any]) -> BlackoutRequest:
+    """
+    Map dictionary data to BlackoutRequest object.
+
+    Args:
+        data (dict): Dictionary containing blackout data with format:
+            {
+                "blackouts": [
+                    {"date": "YYYY-MM-DD"},  (blocks the whole day)
+                    {"start_time": "YYYY-MM-DDTHH:MM", "end_time": "YYYY-MM-DDTHH:MM"},
+                    ...
+                ]
+            }
+
+    Returns:
+        BlackoutRequest: Transformed request object.
+
+    Raises:
+        ValueError: If a blackout is invalid or the blackouts key is missing.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("blackouts"), list):
+        raise ValueError("Invalid input: 'blackouts' key is missing or is not a list.")
+
+    blackouts = []
+    try:
+        for blackout in data["blackouts"]:
+            if blackout.get("date"):
+                start_time = parse_date(blackout["date"])
+                end_time = start_time + timedelta(days=1)
+            else:
+                start_time = parse_date(blackout["start_time"], constants.DATETIME_FORMAT)
+                end_time = parse_date(blackout["end_time"], constants.DATETIME_FORMAT)
+            if start_time >= end_time:
+                raise ValueError("Blackout start time must be before end time.")
+            blackouts.append((start_time, end_time))
+    except KeyError as e:
+        print(f"Missing required field in blackout: {e.args[0]}")
+        raise ValueError(f"Missing required field in blackout: {e.args[0]}")
+    return BlackoutRequest(blackouts=blackouts)
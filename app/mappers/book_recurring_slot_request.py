@@ -0,0 +1,44 @@
+from app.mappers.book_time_slot_request import map_to_book_time_slot_request
+from app.models.book_recurring_slot_request import BookRecurringSlotRequest
+from app.utils.datetime_utils import parse_date, to_date
+from app.utils.tracing_utils import traced
+
+
+@traced()
+def map_to_book_recurring_slot_request(data: dict) -> BookRecurringSlotRequest:
+    """
+    Map dictionary data to BookRecurringSlotRequest object.
+
+    Args:
+        data (dict): Dictionary containing booking data with format:
+            {
+                "owner": "owner_name",
+                "invitee": "invitee_name",
+                "start_time": "YYYY-MM-DDTHH:MM",  (first occurrence)
+                "end_time": "YYYY-MM-DDTHH:MM",
+                "interval_weeks": 1,  (optional)
+                "until": "YYYY-MM-DD"  (optional, last day of the series)
+            }
+
+    Returns:
+        BookRecurringSlotRequest: Transformed request object
+    """
+    first_occurrence = map_to_book_time_slot_request(data)
+    if first_occurrence.start_time.date() != first_occurrence.end_time.date():
+        raise ValueError("Recurring appointments must start and end on the same day.")
+    interval_weeks = int(data["interval_weeks"]) if data.get("interval_weeks") is not None else 1
+    if interval_weeks < 1:
+        raise ValueError("interval_weeks must be at least 1.")
+    until = None
+    if data.get("until"):
+        until = to_date(parse_date(data["until"]))
+        if until < first_occurrence.start_time.date():
+            raise ValueError("until must not be before the first occurrence.")
+    return BookRecurringSlotRequest(
+        owner=first_occurrence.owner,
+        invitee=first_occurrence.invitee,
+        start_time=first_occurrence.start_time,
+        end_time=first_occurrence.end_time,
+        interval_weeks=interval_weeks,
+        until=until
+    )
@@ -0,0 +1,46 @@
+from app.constans import constants
+from app.models.book_team_slot_request import BookTeamSlotRequest
+from app.utils.datetime_utils import parse_date
+from app.utils.tracing_utils import traced
+
+
+@traced()
+def map_to_book_team_slot_request(data: dict) -> BookTeamSlotRequest:
+    """
+    Map dictionary data to BookTeamSlotRequest object.
+
+    Args:
+        data (dict): Dictionary containing booking data with format:
+            {
+                "team": "team_name",
+                "invitee": "invitee_name",
+                "start_time": "YYYY-MM-DDTHH:MM",
+                "end_time": "YYYY-MM-DDTHH:MM",
+                "check_invitee": true  (optional, rejects double bookings of the invitee across owners)
+            }
+
+    Returns:
+        BookTeamSlotRequest: Transformed request object
+
+    Raises:
+        ValueError: If a field is missing or invalid.
+    """
+    try:
+        team = data["team"]
+        invitee = data["invitee"]
+        if not team or not invitee:
+            raise ValueError("Team and invitee names cannot be empty.")
+        start_time = parse_date(data["start_time"], constants.DATETIME_FORMAT)
+        end_time = parse_date(data["end_time"], constants.DATETIME_FORMAT)
+        if start_time >= end_time:
+            raise ValueError("Start time must be before end time.")
+        return BookTeamSlotRequest(
+            team=team,
+            invitee=invitee,
+            start_time=start_time,
+            end_time=end_time,
+            check_invitee=bool(data.get("check_invitee", False))
+        )
+    except KeyError as e:
+        print(f"Missing required field: {str(e)}")
+        raise ValueError(f"Missing required field: {str(e)}")
@@ -1,8 +1,10 @@
 from app.constans import constants
 from app.models.book_time_slot_request import BookTimeSlotRequest
 from app.utils.datetime_utils import parse_date
+from app.utils.tracing_utils import traced
 
 
+@traced()
 def map_to_book_time_slot_request(data: dict) -> BookTimeSlotRequest:
     """
     Map dictionary data to BookTimeSlotRequest object.
@@ -13,7 +15,9 @@ def map_to_book_time_slot_request(data: dict) -> BookTimeSlotRequest:
                 "owner": "owner_name",
                 "invitee": "invitee_name",
                 "start_time": "YYYY-MM-DDTHH:MM",
-                "end_time": "YYYY-MM-DDTHH:MM"
+                "end_time": "YYYY-MM-DDTHH:MM",
+                "hold_id": "id returned by hold_slot",  (optional, confirms the hold)
+                "check_invitee": true  (optional, rejects double bookings of the invitee across owners)
             }
 
     Returns:
@@ -39,7 +43,9 @@ def map_to_book_time_slot_request(data: dict) -> BookTimeSlotRequest:
             owner=owner,
             invitee=invitee,
             start_time=start_time,
-            end_time=end_time
+            end_time=end_time,
+            hold_id=data.get("hold_id") or None,
+            check_invitee=bool(data.get("check_invitee", False))
         )
     except KeyError as e:
         print(f"Missing required field: {str(e)}")
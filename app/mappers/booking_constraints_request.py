@@ -0,0 +1,43 @@
+from datetime import timedelta
+from typing import Any, Dict
+
+from app.models.booking_constraints_request import BookingConstraintsRequest
+from app.utils.tracing_utils import traced
+
+
+@traced()
+def map_to_booking_constraints_request(data: Dict[str, Any]) -> BookingConstraintsRequest:
+    """
+    Map dictionary data to BookingConstraintsRequest object. Missing fields turn the constraint off.
+
+    Args:
+        data (dict): Dictionary containing booking constraints with format:
+            {
+                "buffer_before": 15,  (minutes kept free before every appointment)
+                "buffer_after": 10,  (minutes kept free after every appointment)
+                "min_notice": 120,  (minutes between now and the earliest bookable start)
+                "max_per_day": 4  (most appointments on one day)
+            }
+
+    Returns:
+        BookingConstraintsRequest: Transformed request object.
+
+    Raises:
+        ValueError: If a value is negative or not a whole number.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Invalid input: booking constraints must be an object.")
+
+    minutes = {}
+    for key in ("buffer_before", "buffer_after", "min_notice"):
+        value = int(data.get(key) or 0)
+        if value < 0:
+            raise ValueError(f"{key} must not be negative.")
+        minutes[key] = timedelta(minutes=value)
+
+    max_per_day = data.get("max_per_day")
+    if max_per_day is not None:
+        max_per_day = int(max_per_day)
+        if max_per_day <= 0:
+            raise ValueError("max_per_day must be a positive number.")
+    return BookingConstraintsRequest(max_per_day=max_per_day, **minutes)
@@ -0,0 +1,29 @@
+from app.models.cancel_appointment_request import CancelAppointmentRequest
+from app.utils.tracing_utils import traced
+
+
+@traced()
+def map_to_cancel_appointment_request(data: dict) -> CancelAppointmentRequest:
+    """
+    Map dictionary data to CancelAppointmentRequest object.
+
+    Args:
+        data (dict): Dictionary containing cancellation data with format:
+            {
+                "owner": "owner_name",
+                "appointment_id": "id returned when the slot was booked"
+            }
+
+    Returns:
+        CancelAppointmentRequest: Transformed request object
+    """
+    try:
+        owner = data["owner"]
+        appointment_id = data["appointment_id"]
+        if not owner or not appointment_id:
+            print("Owner and appointment id cannot be empty.")
+            raise ValueError("Owner and appointment id cannot be empty.")
+        return CancelAppointmentRequest(owner=owner, appointment_id=appointment_id)
+    except KeyError as e:
+        print(f"Missing required field: {str(e)}")
+        raise ValueError(f"Missing required field: {str(e)}")
@@ -0,0 +1,53 @@
+from app.constans import constants
+from app.models.hold_time_slot_request import HoldTimeSlotRequest
+from app.utils.datetime_utils import parse_date
+from app.utils.tracing_utils import traced
+
+
+@traced()
+def map_to_hold_time_slot_request(data: dict) -> HoldTimeSlotRequest:
+    """
+    Map dictionary data to HoldTimeSlotRequest object.
+
+    Args:
+        data (dict): Dictionary containing hold data with format:
+            {
+                "owner": "owner_name",
+                "invitee": "invitee_name",
+                "start_time": "YYYY-MM-DDTHH:MM",
+                "end_time": "YYYY-MM-DDTHH:MM",
+                "ttl_seconds": 300  (optional)
+            }
+
+    Returns:
+        HoldTimeSlotRequest: Transformed request object
+    """
+    try:
+        owner = data["owner"]
+        invitee = data["invitee"]
+        if not owner or not invitee:
+            print("Owner and invitee names cannot be empty.")
+            raise ValueError("Owner and invitee names cannot be empty.")
+        start_time = parse_date(data["start_time"], constants.DATETIME_FORMAT)
+        end_time = parse_date(data["end_time"], constants.DATETIME_FORMAT)
+
+        if start_time >= end_time:
+            print("Start time must be before end time.")
+            raise ValueError("Start time must be before end time.")
+
+        ttl_seconds = data.get("ttl_seconds")
+        if ttl_seconds is not None:
+            ttl_seconds = int(ttl_seconds)
+            if not 0 < ttl_seconds <= constants.HOLD_MAX_TTL_SECONDS:
+                raise ValueError(f"ttl_seconds must be between 1 and {constants.HOLD_MAX_TTL_SECONDS}.")
+
+        return HoldTimeSlotRequest(
+            owner=owner,
+            invitee=invitee,
+            start_time=start_time,
+            end_time=end_time,
+            ttl_seconds=ttl_seconds
+        )
+    except KeyError as e:
+        print(f"Missing required field: {str(e)}")
+        raise ValueError(f"Missing required field: {str(e)}")
@@ -0,0 +1,47 @@
+from app.constans import constants
+from app.models.reschedule_appointment_request import RescheduleAppointmentRequest
+from app.utils.datetime_utils import parse_date
+from app.utils.tracing_utils import traced
+
+
+@traced()
+def map_to_reschedule_appointment_request(data: dict) -> RescheduleAppointmentRequest:
+    """
+    Map dictionary data to RescheduleAppointmentRequest object.
+
+    Args:
+        data (dict): Dictionary containing rescheduling data with format:
+            {
+                "owner": "owner_name",
+                "appointment_id": "id returned when the slot was booked",
+                "start_time": "YYYY-MM-DDTHH:MM",
+                "end_time": "YYYY-MM-DDTHH:MM",
+                "check_invitee": true  (optional, rejects double bookings of the invitee across owners)
+            }
+
+    Returns:
+        RescheduleAppointmentRequest: Transformed request object
+    """
+    try:
+        owner = data["owner"]
+        appointment_id = data["appointment_id"]
+        if not owner or not appointment_id:
+            print("Owner and appointment id cannot be empty.")
+            raise ValueError("Owner and appointment id cannot be empty.")
+        start_time = parse_date(data["start_time"], constants.DATETIME_FORMAT)
+        end_time = parse_date(data["end_time"], constants.DATETIME_FORMAT)
+
+        if start_time >= end_time:
+            print("Start time must be before end time.")
+            raise ValueError("Start time must be before end time.")
+
+        return RescheduleAppointmentRequest(
+            owner=owner,
+            appointment_id=appointment_id,
+            start_time=start_time,
+            end_time=end_time,
+            check_invitee=bool(data.get("check_invitee", False))
+        )
+    except KeyError as e:
+        print(f"Missing required field: {str(e)}")
+        raise ValueError(f"Missing required field: {str(e)}")
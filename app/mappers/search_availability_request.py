@@ -1,7 +1,12 @@
+from datetime import timedelta
+
+from app.constans import constants
 from app.models.search_available_request import SearchAvailabilityRequest
 from app.utils.datetime_utils import parse_date
+from app.utils.tracing_utils import traced
 
 
+@traced()
 def map_to_search_availability_request(data: dict) -> SearchAvailabilityRequest:
     """
     Map dictionary data to SearchAvailabilityRequest object.
@@ -10,7 +15,9 @@ def map_to_search_availability_request(data: dict) -> SearchAvailabilityRequest:
         data (dict): Dictionary containing search availability data with format:
             {
                 "owner": "owner_name",
-                "date": "YYYY-MM-DD"
+                "request_date": "YYYY-MM-DD",
+                "end_date": "YYYY-MM-DD",  (optional, searches the range up to this day)
+                "duration": 150  (optional, minutes, searches free windows at least this long)
             }
 
     Returns:
@@ -21,9 +28,24 @@ def map_to_search_availability_request(data: dict) -> SearchAvailabilityRequest:
         request_date = parse_date(data["request_date"])
         if not owner or not request_date:
             raise ValueError("owner field is required")
+        end_date = None
+        if data.get("end_date"):
+            end_date = parse_date(data["end_date"])
+            if end_date < request_date:
+                raise ValueError("End date must not be before request date.")
+            if (end_date - request_date).days >= constants.MAX_SEARCH_RANGE_DAYS:
+                raise ValueError(f"Search range cannot exceed {constants.MAX_SEARCH_RANGE_DAYS} days.")
+        duration = None
+        if data.get("duration"):
+            minutes = int(data["duration"])
+            if minutes <= 0:
+                raise ValueError("Duration must be a positive number of minutes.")
+            duration = timedelta(minutes=minutes)
         return SearchAvailabilityRequest(
             owner=owner,
-            request_date=request_date
+            request_date=request_date,
+            end_date=end_date,
+            duration=duration
         )
     except KeyError as e:
         print(f"Missing required field: {str(e)}")
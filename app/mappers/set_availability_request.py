@@ -1,10 +1,13 @@
 from typing import Dict, Any
 
+from app.constans import constants
 from app.models.models import AvailabilityRule
 from app.models.set_availability_request import SetAvailabilityRequest
-from app.utils.datetime_utils import parse_date, parse_time
+from app.utils.datetime_utils import parse_date, parse_time, parse_weekdays, to_date
+from app.utils.tracing_utils import traced
 
 
+@traced()
 def map_to_set_availability_request(data: Dict[str, Any]) -> SetAvailabilityRequest:
     """
     Map dictionary data to SetAvailabilityRequest object with proper AvailabilityRule transformations.
@@ -17,7 +20,11 @@ def map_to_set_availability_request(data: Dict[str, Any]) -> SetAvailabilityRequ
                         "start_date": "YYYY-MM-DD",
                         "end_date": "YYYY-MM-DD",
                         "start_time": "HH:MM",
-                        "end_time": "HH:MM"
+                        "end_time": "HH:MM",
+                        "weekdays": ["MON", "WED", "FRI"],  (optional, defaults to every day)
+                        "interval_weeks": 2,  (optional, repeat every N weeks from the start week)
+                        "exception_dates": ["YYYY-MM-DD"],  (optional, days without availability)
+                        "capacity": 10  (optional, attendees per slot, default 1)
                     },
                     ...
                 ]
@@ -36,17 +43,39 @@ def map_to_set_availability_request(data: Dict[str, Any]) -> SetAvailabilityRequ
         raise ValueError("Invalid input: 'availability_rules' key is missing or data is not a dictionary.")
 
     try:
-        transformed_rules = [
-            AvailabilityRule(
-                start_date=parse_date(rule["start_date"]),
-                end_date=parse_date(rule["end_date"]),
-                start_time=parse_time(rule["start_time"]),
-                end_time=parse_time(rule["end_time"]),
-            )
-            for rule in data["availability_rules"]
-        ]
+        transformed_rules = [map_to_availability_rule(rule) for rule in data["availability_rules"]]
         return SetAvailabilityRequest(availability_rules=transformed_rules)
 
     except KeyError as e:
         print(f"Missing required field in availability rule: {e.args[0]}")
         raise KeyError(f"Missing required field in availability rule: {e.args[0]}") from e
+
+
+def map_to_availability_rule(rule: Dict[str, Any]) -> AvailabilityRule:
+    """
+    Map one availability rule, including its optional recurrence fields.
+
+    Raises:
+        ValueError: If a field is invalid.
+        KeyError: If a required field is missing.
+    """
+    weekday_mask = constants.ALL_WEEKDAYS_MASK
+    if rule.get("weekdays") is not None:
+        weekday_mask = parse_weekdays(rule["weekdays"])
+    interval_weeks = int(rule["interval_weeks"]) if rule.get("interval_weeks") is not None else 1
+    if interval_weeks < 1:
+        raise ValueError("interval_weeks must be at least 1.")
+    exception_dates = frozenset(to_date(parse_date(day)) for day in rule.get("exception_dates") or [])
+    capacity = int(rule["capacity"]) if rule.get("capacity") is not None else 1
+    if capacity < 1:
+        raise ValueError("capacity must be at least 1.")
+    return AvailabilityRule(
+        start_date=parse_date(rule["start_date"]),
+        end_date=parse_date(rule["end_date"]),
+        start_time=parse_time(rule["start_time"]),
+        end_time=parse_time(rule["end_time"]),
+        weekday_mask=weekday_mask,
+        interval_weeks=interval_weeks,
+        exception_dates=exception_dates,
+        capacity=capacity
+    )
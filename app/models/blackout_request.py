@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Tuple
+
+
+@dataclass
+class BlackoutRequest:
+    # (start_time, end_time) intervals to block
+    blackouts: List[Tuple[datetime, datetime]]
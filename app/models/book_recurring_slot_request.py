@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Optional
+
+
+@dataclass
+class BookRecurringSlotRequest:
+    owner: str
+    invitee: str
+    # Times of the first occurrence
+    start_time: datetime
+    end_time: datetime
+    interval_weeks: int = 1
+    # Last day of the series, None repeats indefinitely
+    until: Optional[date] = None
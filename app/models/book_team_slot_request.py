@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class BookTeamSlotRequest:
+    team: str
+    invitee: str
+    start_time: datetime
+    end_time: datetime
+    # Reject the booking if the invitee has an overlapping appointment with any owner
+    check_invitee: bool = False
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 
 
 @dataclass
@@ -8,3 +9,7 @@ class BookTimeSlotRequest:
     invitee: str
     start_time: datetime
     end_time: datetime
+    # Hold to confirm, taken with hold_slot before booking
+    hold_id: Optional[str] = None
+    # Reject the booking if the invitee has an overlapping appointment with any owner
+    check_invitee: bool = False
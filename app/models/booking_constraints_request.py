@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Optional
+
+
+@dataclass
+class BookingConstraintsRequest:
+    buffer_before: timedelta = timedelta(0)
+    buffer_after: timedelta = timedelta(0)
+    min_notice: timedelta = timedelta(0)
+    # None allows any number of appointments per day
+    max_per_day: Optional[int] = None
@@ -0,0 +1,7 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class CancelAppointmentRequest:
+    owner: str
+    appointment_id: str
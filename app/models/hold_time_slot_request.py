@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class HoldTimeSlotRequest:
+    owner: str
+    invitee: str
+    start_time: datetime
+    end_time: datetime
+    # Seconds the slot stays held, None uses the configured default
+    ttl_seconds: Optional[int] = None
@@ -1,8 +1,15 @@
+import heapq
+import threading
+import uuid
+from bisect import bisect_left, insort
+from collections import Counter
 from dataclasses import dataclass, field
-from datetime import datetime, date, time
-from typing import List, Dict
+from datetime import datetime, date, time, timedelta
+from typing import List, Dict, Tuple, Optional, FrozenSet, Set, Iterator
 
 from app.constans import constants
+from app.utils.datetime_utils import minutes_between, to_date, week_index
+from app.utils.timezone_utils import get_day_bounds, local_to_utc, server_time_to_utc, utc_to_local
 
 
 @dataclass
@@ -11,14 +18,44 @@ class AvailabilityRule:
     end_time: time
     start_date: date
     end_date: date
+    # Recurrence: weekdays the rule applies on, every interval_weeks weeks from the start week
+    weekday_mask: int = constants.ALL_WEEKDAYS_MASK
+    interval_weeks: int = 1
+    exception_dates: FrozenSet[date] = field(default_factory=frozenset)
+    # Attendees one slot of the rule can take, above 1 for group bookings
+    capacity: int = 1
+
+    def is_recurring(self) -> bool:
+        return (self.weekday_mask != constants.ALL_WEEKDAYS_MASK or self.interval_weeks != 1
+                or bool(self.exception_dates))
+
+    def applies_on(self, day) -> bool:
+        """
+        Check if the rule gives availability on a day, using bit and week arithmetic only.
+        """
+        day = to_date(day)
+        if not to_date(self.start_date) <= day <= to_date(self.end_date):
+            return False
+        if not self.weekday_mask >> day.weekday() & 1:
+            return False
+        if (week_index(day) - week_index(self.start_date)) % self.interval_weeks:
+            return False
+        return day not in self.exception_dates
 
     def to_dict(self):
-        return {
+        rule = {
             "start_date": self.start_date.strftime(constants.DATE_FORMAT),
             "end_date": self.end_date.strftime(constants.DATE_FORMAT),
             "start_time": self.start_time.strftime(constants.TIME_FORMAT),
             "end_time": self.end_time.strftime(constants.TIME_FORMAT)
         }
+        if self.is_recurring():
+            rule["weekdays"] = [name for bit, name in enumerate(constants.WEEKDAY_NAMES) if self.weekday_mask >> bit & 1]
+            rule["interval_weeks"] = self.interval_weeks
+            rule["exception_dates"] = sorted(d.strftime(constants.DATE_FORMAT) for d in self.exception_dates)
+        if self.capacity > 1:
+            rule["capacity"] = self.capacity
+        return rule
 
 
 @dataclass
@@ -26,43 +63,731 @@ class Appointment:
     invitee: str
     start_time: datetime
     end_time: datetime
+    appointment_id: str = field(default_factory=lambda: uuid.uuid4().hex, compare=False)
+
+    def __lt__(self, other: "Appointment") -> bool:
+        # Orders the per-day appointment lists so they can be searched with bisect
+        return (self.start_time, self.end_time) < (other.start_time, other.end_time)
 
     def to_dict(self):
         return {
+            "appointment_id": self.appointment_id,
             "invitee": self.invitee,
             "start_time": self.start_time.strftime(constants.DATETIME_FORMAT),
             "end_time": self.end_time.strftime(constants.DATETIME_FORMAT)
         }
 
 
+@dataclass
+class RecurringAppointment:
+    """
+    A series of appointments repeating every interval_weeks weeks, stored as one record.
+    Occurrences are computed for the days being queried instead of being stored.
+
+    With a timezone the series repeats at the owner's wall time of its first occurrence, so
+    its stored times move by an hour when the clocks change. Days are the owner's days.
+    """
+    invitee: str
+    # Stored times of the first occurrence
+    start_time: datetime
+    end_time: datetime
+    interval_weeks: int = 1
+    # Last day an occurrence can fall on, None repeats indefinitely
+    until: Optional[date] = None
+    # Days of cancelled occurrences
+    exception_dates: Set[date] = field(default_factory=set)
+    series_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    # IANA timezone of the owner's calendar, set when the series is added to it
+    timezone: Optional[str] = None
+
+    @property
+    def step_days(self) -> int:
+        return 7 * self.interval_weeks
+
+    @property
+    def local_start_time(self) -> datetime:
+        """Wall time of the first occurrence, which every occurrence repeats."""
+        return self.start_time if self.timezone is None else utc_to_local(self.start_time, self.timezone)
+
+    @property
+    def local_end_time(self) -> datetime:
+        return self.end_time if self.timezone is None else utc_to_local(self.end_time, self.timezone)
+
+    @property
+    def first_day(self) -> date:
+        return self.local_start_time.date()
+
+    def is_on_cycle(self, day: date) -> bool:
+        """Check if a day falls on the series' cycle, ignoring until and cancelled occurrences."""
+        offset = (day - self.first_day).days
+        return offset >= 0 and offset % self.step_days == 0
+
+    def occurs_on(self, day) -> bool:
+        day = to_date(day)
+        if not self.is_on_cycle(day) or (self.until is not None and day > self.until):
+            return False
+        return day not in self.exception_dates
+
+    def occurrence_on(self, day) -> Tuple[datetime, datetime]:
+        """Return the stored start and end of the occurrence on a day of the owner."""
+        local_start = self.local_start_time
+        start_time = datetime.combine(to_date(day), local_start.time())
+        end_time = start_time + (self.local_end_time - local_start)
+        if self.timezone is None:
+            return start_time, end_time
+        return local_to_utc(start_time, self.timezone), local_to_utc(end_time, self.timezone)
+
+    def occurrence_id(self, day) -> str:
+        return f"{self.series_id}{constants.OCCURRENCE_ID_SEPARATOR}{to_date(day).strftime(constants.DATE_FORMAT)}"
+
+    def occurrences_between(self, first_day, last_day) -> Iterator[Appointment]:
+        """
+        Yield the occurrences from first_day to last_day inclusive, stepping from cycle day to cycle day.
+        """
+        series_first_day = self.first_day
+        day = max(to_date(first_day), series_first_day)
+        last_day = to_date(last_day)
+        if self.until is not None:
+            last_day = min(last_day, self.until)
+        day += timedelta(days=-(day - series_first_day).days % self.step_days)
+        while day <= last_day:
+            if day not in self.exception_dates:
+                start_time, end_time = self.occurrence_on(day)
+                yield Appointment(
+                    invitee=self.invitee,
+                    start_time=start_time,
+                    end_time=end_time,
+                    appointment_id=self.occurrence_id(day)
+                )
+            day += timedelta(days=self.step_days)
+
+    def to_dict(self):
+        return {
+            "series_id": self.series_id,
+            "invitee": self.invitee,
+            "start_time": self.start_time.strftime(constants.DATETIME_FORMAT),
+            "end_time": self.end_time.strftime(constants.DATETIME_FORMAT),
+            "interval_weeks": self.interval_weeks,
+            "until": self.until.strftime(constants.DATE_FORMAT) if self.until else None,
+            "exception_dates": sorted(d.strftime(constants.DATE_FORMAT) for d in self.exception_dates)
+        }
+
+
+@dataclass
+class Hold:
+    """A slot reserved for an invitee until expires_at, while they confirm the booking."""
+    invitee: str
+    start_time: datetime
+    end_time: datetime
+    expires_at: datetime
+    hold_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    def is_active(self, now: Optional[datetime] = None) -> bool:
+        return self.expires_at > (now or datetime.now())
+
+    def to_dict(self):
+        return {
+            "hold_id": self.hold_id,
+            "invitee": self.invitee,
+            "start_time": self.start_time.strftime(constants.DATETIME_FORMAT),
+            "end_time": self.end_time.strftime(constants.DATETIME_FORMAT),
+            "expires_at": self.expires_at.isoformat(timespec="seconds")
+        }
+
+
+@dataclass
+class BlackoutIndex:
+    """Blocked intervals kept sorted and merged, so the ones touching a day are found with bisect."""
+    intervals: List[Tuple[datetime, datetime]] = field(default_factory=list)
+
+    def add(self, start_time: datetime, end_time: datetime):
+        # Merge with every interval overlapping or touching the new one
+        first = bisect_left(self.intervals, (start_time,))
+        if first > 0 and self.intervals[first - 1][1] >= start_time:
+            first -= 1
+        last = first
+        while last < len(self.intervals) and self.intervals[last][0] <= end_time:
+            start_time = min(start_time, self.intervals[last][0])
+            end_time = max(end_time, self.intervals[last][1])
+            last += 1
+        self.intervals[first:last] = [(start_time, end_time)]
+
+    def overlapping(self, start_time: datetime, end_time: datetime) -> List[Tuple[datetime, datetime]]:
+        first = bisect_left(self.intervals, (start_time,))
+        if first > 0 and self.intervals[first - 1][1] > start_time:
+            first -= 1
+        last = bisect_left(self.intervals, (end_time,), lo=first)
+        return self.intervals[first:last]
+
+
+@dataclass
+class FreeGapIndex:
+    """
+    Free intervals of one day, the availability windows minus busy time, kept sorted by start
+    for updates and by length so a gap of a given duration is found with bisect.
+    """
+    gaps: List[Tuple[datetime, datetime]] = field(default_factory=list)
+    # (length, start, end) of every gap
+    by_length: List[Tuple[timedelta, datetime, datetime]] = field(default_factory=list)
+
+    def add(self, start_time: datetime, end_time: datetime):
+        if start_time < end_time:
+            insort(self.gaps, (start_time, end_time))
+            insort(self.by_length, (end_time - start_time, start_time, end_time))
+
+    def occupy(self, start_time: datetime, end_time: datetime):
+        # Cut the busy interval out of every gap it overlaps, keeping the free parts on either side
+        first = bisect_left(self.gaps, (start_time,))
+        if first > 0 and self.gaps[first - 1][1] > start_time:
+            first -= 1
+        last = first
+        while last < len(self.gaps) and self.gaps[last][0] < end_time:
+            last += 1
+        overlapped = self.gaps[first:last]
+        del self.gaps[first:last]
+        for gap_start, gap_end in overlapped:
+            del self.by_length[bisect_left(self.by_length, (gap_end - gap_start, gap_start, gap_end))]
+            self.add(gap_start, min(gap_end, start_time))
+            self.add(max(gap_start, end_time), gap_end)
+
+    def find(self, duration: timedelta) -> Optional[Tuple[datetime, datetime]]:
+        """Return the shortest gap lasting at least duration, or None."""
+        index = bisect_left(self.by_length, (duration,))
+        if index == len(self.by_length):
+            return None
+        return self.by_length[index][1:]
+
+    def fitting(self, duration: timedelta) -> List[Tuple[datetime, datetime]]:
+        """Return every gap lasting at least duration, ordered by start."""
+        return sorted(gap[1:] for gap in self.by_length[bisect_left(self.by_length, (duration,)):])
+
+
+@dataclass
+class InviteeAppointments:
+    """
+    One-off appointments of an invitee with every owner, as (start, end, owner, appointment_id)
+    entries sorted by start. max_ends[i] is the latest end among entries[:i + 1], so whether any
+    entry overlaps an interval is answered with one bisect even when entries overlap each other.
+    """
+    entries: List[Tuple[datetime, datetime, str, str]] = field(default_factory=list)
+    max_ends: List[datetime] = field(default_factory=list)
+
+    def add(self, entry: Tuple[datetime, datetime, str, str]):
+        index = bisect_left(self.entries, entry)
+        self.entries.insert(index, entry)
+        self._update_max_ends(index)
+
+    def remove(self, entry: Tuple[datetime, datetime, str, str]):
+        index = bisect_left(self.entries, entry)
+        if index < len(self.entries) and self.entries[index] == entry:
+            del self.entries[index]
+            self._update_max_ends(index)
+
+    def _update_max_ends(self, index: int):
+        # Running maxima before index are unchanged, the rest are recomputed
+        del self.max_ends[index:]
+        latest_end = self.max_ends[-1] if self.max_ends else None
+        for _, end_time, _, _ in self.entries[index:]:
+            latest_end = end_time if latest_end is None else max(latest_end, end_time)
+            self.max_ends.append(latest_end)
+
+    def overlaps(self, start_time: datetime, end_time: datetime, exclude_id: Optional[str] = None) -> bool:
+        # Entries starting before end_time overlap if the latest of their ends is after start_time
+        index = bisect_left(self.entries, (end_time,))
+        if index == 0 or self.max_ends[index - 1] <= start_time:
+            return False
+        if exclude_id is None:
+            return True
+        # The running maximum may come from the excluded entry, so only then are the entries scanned
+        return any(
+            entry_end > start_time and appointment_id != exclude_id
+            for _, entry_end, _, appointment_id in self.entries[:index]
+        )
+
+    def starting_between(self, start_time: datetime, end_time: datetime) -> List[Tuple[datetime, datetime, str, str]]:
+        return self.entries[bisect_left(self.entries, (start_time,)):bisect_left(self.entries, (end_time,))]
+
+
+@dataclass
+class UtilizationIndex:
+    """
+    Available and booked minutes per day of one calendar. A day is computed once, then bookings
+    and cancellations adjust its booked minutes in place. Running totals over a reported range
+    answer the total of any part of it with two lookups, they are rebuilt after a change.
+    """
+    available: Dict[date, int] = field(default_factory=dict)
+    booked: Dict[date, int] = field(default_factory=dict)
+    # (first day, running available totals, running booked totals), entry i covering the days before first + i
+    prefix: Optional[Tuple[date, List[int], List[int]]] = None
+
+    def set_day(self, day: date, available_minutes: int, booked_minutes: int):
+        self.available[day] = available_minutes
+        self.booked[day] = booked_minutes
+        self.prefix = None
+        while len(self.available) > constants.UTILIZATION_INDEX_MAX_DAYS:
+            # Dicts keep insertion order, so this evicts the day computed first
+            oldest_day = next(iter(self.available))
+            del self.available[oldest_day]
+            del self.booked[oldest_day]
+
+    def add_booked(self, day: date, minutes: int):
+        # Days not computed yet count their appointments when they are
+        if day in self.booked:
+            self.booked[day] += minutes
+            self.prefix = None
+
+    def clear(self):
+        """Drop every computed day, after a change to the rules, blackouts or recurring series."""
+        self.available.clear()
+        self.booked.clear()
+        self.prefix = None
+
+    def get_prefix(self, start_date: date, end_date: date) -> Tuple[date, List[int], List[int]]:
+        """
+        Return running totals covering start_date to end_date, days which must be computed.
+        The last ones built are reused while they cover the range.
+        """
+        if self.prefix is not None:
+            first_day, available_prefix, _ = self.prefix
+            if first_day <= start_date and (end_date - first_day).days < len(available_prefix) - 1:
+                return self.prefix
+        available_prefix, booked_prefix = [0], [0]
+        for offset in range((end_date - start_date).days + 1):
+            day = start_date + timedelta(days=offset)
+            available_prefix.append(available_prefix[-1] + self.available[day])
+            booked_prefix.append(booked_prefix[-1] + self.booked[day])
+        self.prefix = (start_date, available_prefix, booked_prefix)
+        return self.prefix
+
+
+@dataclass
+class HolidayCalendar:
+    """Blackouts shared by every calendar that references the holiday calendar by name."""
+    name: str
+    blackouts: BlackoutIndex = field(default_factory=BlackoutIndex)
+    # Owners referencing this holiday calendar
+    subscribers: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class RuleTemplate:
+    """Named availability rules stored once and referenced by many calendars."""
+    name: str
+    availability_rules: List[AvailabilityRule] = field(default_factory=list)
+    # Incremented when the rules are replaced, part of the template slot cache key
+    version: int = 0
+    # Owners referencing this template
+    subscribers: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class Team:
+    """Owners whose availability is pooled, bookings go to the least-loaded free member."""
+    name: str
+    members: List[str] = field(default_factory=list)
+
+
 @dataclass
 class Calendar:
     owner: str
     availability_rules: List[AvailabilityRule] = field(default_factory=list)
+    # Per-day appointment lists, kept sorted by start time
     appointments: Dict[date, List[Appointment]] = field(default_factory=dict)
+    # Key: appointment_id, Value: Appointment, for lookups by id
+    appointment_index: Dict[str, Appointment] = field(default_factory=dict)
+    # Seats taken per exact (start_time, end_time) interval, kept in step with the per-day lists
+    seat_counts: Counter = field(default_factory=Counter)
+    # Key: series_id, Value: RecurringAppointment
+    recurring_appointments: Dict[str, RecurringAppointment] = field(default_factory=dict)
+    # Names of shared rule templates giving availability in addition to availability_rules
+    rule_template_names: List[str] = field(default_factory=list)
+    # Intervals the owner blocked inside their availability rules
+    blackouts: BlackoutIndex = field(default_factory=BlackoutIndex)
+    # Names of shared holiday calendars whose blackouts also apply
+    holiday_calendar_names: List[str] = field(default_factory=list)
+    # Key: hold_id, Value: Hold, removed on confirmation, release or expiry
+    holds: Dict[str, Hold] = field(default_factory=dict)
+    # Booking constraints evaluated by the slot engine: free time kept before and after every
+    # appointment, how far ahead a slot must start, and the most appointments on one day
+    buffer_before: timedelta = timedelta(0)
+    buffer_after: timedelta = timedelta(0)
+    min_notice: timedelta = timedelta(0)
+    max_per_day: Optional[int] = None
+    # IANA timezone of the owner. Rules are evaluated in its wall time while appointments, holds
+    # and blackouts are stored in naive UTC. None keeps every time naive, as given by clients.
+    timezone: Optional[str] = None
+
+    # Incremented whenever availability rules or appointments change, used to build ETags
+    version: int = 0
+    # Past days moved out of appointments by the expiry sweeper, as (invitee, start_time, end_time) tuples
+    archived_appointments: Dict[date, Tuple[Tuple[str, datetime, datetime], ...]] = field(default_factory=dict)
+    # Per-day available and booked minutes for utilization reports
+    utilization: UtilizationIndex = field(default_factory=UtilizationIndex)
 
     def add_appointment(self, appointment: Appointment) -> bool:
+        self._insert_into_day(appointment)
+        self.appointment_index[appointment.appointment_id] = appointment
+        index_invitee_appointment(self.owner, appointment)
+        self.bump_version()
+        return True
+
+    def remove_appointment(self, appointment_id: str) -> Optional[Appointment]:
+        """
+        Remove an appointment by id.
+
+        Returns:
+            Appointment: The removed appointment, or None if the id is unknown.
+        """
+        appointment = self.appointment_index.pop(appointment_id, None)
+        if appointment is None:
+            return None
+        self._remove_from_day(appointment)
+        unindex_invitee_appointment(self.owner, appointment)
+        self.bump_version()
+        return appointment
+
+    def move_appointment(self, appointment_id: str, start_time: datetime, end_time: datetime) -> Optional[Appointment]:
+        """
+        Move an appointment to a new time in one step, keeping its id and invitee.
+
+        Returns:
+            Appointment: The moved appointment, or None if the id is unknown.
+        """
+        appointment = self.appointment_index.get(appointment_id)
+        if appointment is None:
+            return None
+        self._remove_from_day(appointment)
+        unindex_invitee_appointment(self.owner, appointment)
+        appointment.start_time = start_time
+        appointment.end_time = end_time
+        self._insert_into_day(appointment)
+        index_invitee_appointment(self.owner, appointment)
+        self.bump_version()
+        return appointment
+
+    def add_recurring_appointment(self, series: RecurringAppointment):
+        series.timezone = self.timezone
+        self.recurring_appointments[series.series_id] = series
+        with invitee_index_lock:
+            invitee_series_index.setdefault(series.invitee, set()).add((self.owner, series.series_id))
+        if series.until is not None:
+            schedule_expiry(series.until, constants.EXPIRY_KIND_RECURRING_APPOINTMENT, self.owner, series.series_id)
+        self.utilization.clear()
+        self.bump_version()
+
+    def remove_recurring_appointment(self, series_id: str,
+                                     archive_before: Optional[datetime] = None) -> Optional[RecurringAppointment]:
+        """
+        Remove a series. Its occurrences starting before archive_before, the current time by
+        default, are moved into the archive so past bookings stay on record.
+
+        Returns:
+            RecurringAppointment: The removed series, or None if the id is unknown.
+        """
+        series = self.recurring_appointments.pop(series_id, None)
+        if series is not None:
+            self._archive_occurrences(series, archive_before or self.current_time())
+            with invitee_index_lock:
+                owner_series = invitee_series_index.get(series.invitee, set())
+                owner_series.discard((self.owner, series_id))
+                if not owner_series:
+                    invitee_series_index.pop(series.invitee, None)
+            self.utilization.clear()
+            self.bump_version()
+        return series
+
+    def cancel_occurrence(self, series_id: str, day: date) -> Optional[RecurringAppointment]:
+        """
+        Cancel one occurrence of a series by recording its day as an exception.
+
+        Returns:
+            RecurringAppointment: The series, or None if it has no occurrence on the day.
+        """
+        series = self.recurring_appointments.get(series_id)
+        if series is None or not series.occurs_on(day):
+            return None
+        series.exception_dates.add(day)
+        occurrence_start, occurrence_end = series.occurrence_on(day)
+        self.utilization.add_booked(self.local_day(occurrence_start), -minutes_between(occurrence_start, occurrence_end))
+        self.bump_version()
+        return series
+
+    def add_hold(self, hold: Hold):
+        self.holds[hold.hold_id] = hold
+        self.bump_version()
+
+    def remove_hold(self, hold_id: str) -> Optional[Hold]:
+        hold = self.holds.pop(hold_id, None)
+        if hold is not None:
+            self.bump_version()
+        return hold
+
+    def count_on(self, day: date, exclude: Optional[Appointment] = None) -> int:
+        """
+        Count the appointments and recurring occurrences on a day, leaving out exclude.
+        The per-day appointment lists give the one-off count without a scan.
+        """
+        if self.timezone is not None:
+            # Stored days are UTC days, so the owner's day is collected from the ones it spans
+            day_start, day_end = self.day_bounds(day)
+            return sum(
+                1 for start_time, _, appointment_id in self.appointments_between(day_start, day_end)
+                if exclude is None or appointment_id != exclude.appointment_id
+            )
+        count = len(self.appointments.get(day, ()))
+        if exclude is not None and exclude.start_time.date() == day:
+            count -= 1
+        return count + sum(1 for series in self.recurring_appointments.values() if series.occurs_on(day))
+
+    def is_day_full(self, day: date, exclude: Optional[Appointment] = None) -> bool:
+        return self.max_per_day is not None and self.count_on(day, exclude) >= self.max_per_day
+
+    def seats_taken(self, start_time: datetime, end_time: datetime, now: Optional[datetime] = None,
+                    exclude: Optional[Appointment] = None) -> int:
+        """
+        Count the appointments and active holds on exactly this interval, leaving out exclude.
+        """
+        seats = self.seat_counts.get((start_time, end_time), 0)
+        if exclude is not None and (exclude.start_time, exclude.end_time) == (start_time, end_time):
+            seats -= 1
+        now = now or datetime.now()
+        return seats + sum(
+            1 for hold in self.holds.values()
+            if (hold.start_time, hold.end_time) == (start_time, end_time) and hold.is_active(now)
+        )
+
+    def appointments_between(self, start_time: datetime, end_time: datetime) -> List[Tuple[datetime, datetime, str]]:
+        """
+        List (start, end, id) of the appointments and recurring occurrences starting from
+        start_time up to end_time, looking only at the days the interval spans.
+        """
+        found = []
+        day = start_time.date()
+        while day <= end_time.date():
+            found.extend(
+                (a.start_time, a.end_time, a.appointment_id) for a in self.appointments.get(day, ())
+                if start_time <= a.start_time < end_time
+            )
+            day += timedelta(days=1)
+        # Series repeat on the owner's days, which are not the stored days with a timezone
+        for series in self.recurring_appointments.values():
+            for occurrence in series.occurrences_between(self.local_day(start_time), self.local_day(end_time)):
+                if start_time <= occurrence.start_time < end_time:
+                    found.append((occurrence.start_time, occurrence.end_time, occurrence.appointment_id))
+        return found
+
+    def to_local(self, instant: datetime) -> datetime:
+        """Convert a stored time to the owner's wall time."""
+        return instant if self.timezone is None else utc_to_local(instant, self.timezone)
+
+    def from_local(self, wall_time: datetime) -> datetime:
+        """Convert a wall time of the owner to stored time."""
+        return wall_time if self.timezone is None else local_to_utc(wall_time, self.timezone)
+
+    def local_day(self, instant: datetime) -> date:
+        """Return the owner's day a stored time falls on, the day its slots are cached under."""
+        return self.to_local(instant).date()
+
+    def day_bounds(self, day) -> Tuple[datetime, datetime]:
+        """
+        Return the stored times the owner's day starts and ends at. Days of a timezone are
+        23 or 25 hours long when the clocks change.
+        """
+        return get_day_bounds(to_date(day), self.timezone)
+
+    def current_time(self, now: Optional[datetime] = None) -> datetime:
+        """
+        Return the current time, or now given in server time, as stored time of the calendar.
+        """
+        now = now or datetime.now()
+        return now if self.timezone is None else server_time_to_utc(now)
+
+    def _insert_into_day(self, appointment: Appointment):
         appointment_date = appointment.start_time.date()
         if appointment_date not in self.appointments:
             self.appointments[appointment_date] = []
-        self.appointments[appointment_date].append(appointment)
-        return True
+            schedule_expiry(appointment_date, constants.EXPIRY_KIND_APPOINTMENTS, self.owner)
+        insort(self.appointments[appointment_date], appointment)
+        self.seat_counts[(appointment.start_time, appointment.end_time)] += 1
+        self.utilization.add_booked(self.local_day(appointment.start_time), minutes_between(appointment.start_time, appointment.end_time))
+
+    def _remove_from_day(self, appointment: Appointment):
+        appointment_date = appointment.start_time.date()
+        appointments = self.appointments.get(appointment_date, [])
+        index = bisect_left(appointments, appointment)
+        # Skip appointments sharing the same times until the one with this identity
+        while index < len(appointments) and appointments[index] is not appointment:
+            index += 1
+        if index < len(appointments):
+            del appointments[index]
+            self._release_seat(appointment)
+            self.utilization.add_booked(self.local_day(appointment.start_time), -minutes_between(appointment.start_time, appointment.end_time))
+        if not appointments:
+            self.appointments.pop(appointment_date, None)
 
-    def get_upcoming_appointments(self) -> List[Appointment]:
-        today = datetime.now().date()
-        time_now = datetime.now()
+    def _release_seat(self, appointment: Appointment):
+        key = (appointment.start_time, appointment.end_time)
+        self.seat_counts[key] -= 1
+        if self.seat_counts[key] <= 0:
+            del self.seat_counts[key]
+
+    def bump_version(self) -> int:
+        self.version += 1
+        return self.version
+
+    def archive_day(self, appointment_date: date) -> int:
+        """
+        Move the appointments of a past day into the compact archive.
+
+        Returns:
+            int: Number of appointments archived.
+        """
+        appointments = self.appointments.pop(appointment_date, None)
+        if not appointments:
+            return 0
+        for appointment in appointments:
+            self.appointment_index.pop(appointment.appointment_id, None)
+            unindex_invitee_appointment(self.owner, appointment)
+            self._release_seat(appointment)
+        archived = tuple((a.invitee, a.start_time, a.end_time) for a in appointments)
+        self.archived_appointments[appointment_date] = self.archived_appointments.get(appointment_date, ()) + archived
+        return len(archived)
+
+    def _archive_occurrences(self, series: RecurringAppointment, before: datetime):
+        archived: Dict[date, list] = {}
+        for occurrence in series.occurrences_between(series.first_day, self.local_day(before)):
+            if occurrence.start_time < before:
+                archived.setdefault(occurrence.start_time.date(), []).append(
+                    (occurrence.invitee, occurrence.start_time, occurrence.end_time)
+                )
+        for stored_day, occurrences in archived.items():
+            self.archived_appointments[stored_day] = self.archived_appointments.get(stored_day, ()) + tuple(occurrences)
+
+    def get_upcoming_appointments(self, until: Optional[date] = None) -> List[Appointment]:
+        """
+        List upcoming appointments, up to and including the day until when given.
+        Recurring series are only expanded up to until, or RECURRING_EXPANSION_DAYS days
+        from today when no until is given.
+        """
+        time_now = self.current_time()
+        today = time_now.date()
+        expand_until = until or today + timedelta(days=constants.RECURRING_EXPANSION_DAYS)
         upcoming_appointments = []
-        for appointment_date, appointments in self.appointments.items():
-            if appointment_date >= today:
-                upcoming_appointments.extend({
-                                                 "invitee": appointment.invitee,
-                                                 "start_time": appointment.start_time.strftime(constants.DATETIME_FORMAT),
-                                                 "end_time": appointment.end_time.strftime(constants.DATETIME_FORMAT)
-                                             } for appointment in appointments if appointment.start_time >= time_now)
+        occurrences = (
+            occurrence
+            for series in self.recurring_appointments.values()
+            for occurrence in series.occurrences_between(self.local_day(time_now), expand_until)
+        )
+        day_appointments = (
+            appointment
+            for appointment_date, appointments in self.appointments.items()
+            if appointment_date >= today and (until is None or appointment_date <= until)
+            for appointment in appointments
+        )
+        for appointment in (*day_appointments, *occurrences):
+            if appointment.start_time >= time_now:
+                upcoming_appointments.append({
+                    "appointment_id": appointment.appointment_id,
+                    "invitee": appointment.invitee,
+                    "start_time": appointment.start_time.strftime(constants.DATETIME_FORMAT),
+                    "end_time": appointment.end_time.strftime(constants.DATETIME_FORMAT)
+                })
         return upcoming_appointments
 
 
 calendars = {}  # Key: owner_id, Value: Calendar instance
 
+# Shared holiday calendars, Key: name, Value: HolidayCalendar referenced by owners
+holiday_calendars: Dict[str, HolidayCalendar] = {}
+
+# Pooled team calendars, Key: team name, Value: Team
+teams: Dict[str, Team] = {}
+
+# Shared rule templates, Key: name, Value: RuleTemplate referenced by owners
+rule_templates: Dict[str, RuleTemplate] = {}
+
+# Identical rules of different templates share one AvailabilityRule, Key: rule_key(rule)
+interned_rules: Dict[tuple, AvailabilityRule] = {}
+
+# Rule slots of a template on a day, shared by every owner using it,
+# Key: (template name, template version, date_key, timezone), Value: tuple of (start, end) datetimes
+template_slots_cache: Dict[Tuple[str, int, str, Optional[str]], Tuple[Tuple[datetime, datetime], ...]] = {}
+template_slots_lock = threading.Lock()
+
 # Temporary cache for available slots (to be validated during booking)
 available_slots_cache = {}
+
+# Free-gap index of each cached day, Key: owner, Value: dict of date_key to FreeGapIndex
+free_gaps_cache: Dict[str, Dict[str, FreeGapIndex]] = {}
+
+# Serialized search responses, Key: (owner, date_key), Value: media type to bytes of the cached slot list
+encoded_slots_cache = {}
+
+# Guards writes to the slot cache so each entry, its encoded response and free gaps change together
+slot_cache_lock = threading.RLock()
+
+# Searches per owner since the cache warmer last ran, used to detect hot owners
+recent_search_counts = Counter()
+recent_search_counts_lock = threading.Lock()
+
+
+def record_search(owner: str):
+    with recent_search_counts_lock:
+        recent_search_counts[owner] += 1
+
+# Owners whose availability changed since the cache warmer last refreshed them
+stale_cache_owners = set()
+
+# Min-heap of (date, kind, owner, key) entries so past dates can be expired without scanning every calendar
+expiry_heap: List[Tuple[date, str, str, str]] = []
+expiry_heap_lock = threading.Lock()
+
+
+def schedule_expiry(expiry_date: date, kind: str, owner: str, key: str = ""):
+    with expiry_heap_lock:
+        heapq.heappush(expiry_heap, (expiry_date, kind, owner, key))
+
+
+# Min-heap of (expires_at, owner, hold_id) entries so the reaper only touches holds that expired
+hold_heap: List[Tuple[datetime, str, str]] = []
+hold_heap_lock = threading.Lock()
+
+
+def schedule_hold_expiry(hold: Hold, owner: str):
+    with hold_heap_lock:
+        heapq.heappush(hold_heap, (hold.expires_at, owner, hold.hold_id))
+
+
+# One-off appointments of every owner by invitee, sorted by (start_time, end_time, owner, appointment_id)
+invitee_index: Dict[str, InviteeAppointments] = {}
+# Recurring series by invitee as (owner, series_id), expanded when the invitee is queried
+invitee_series_index: Dict[str, Set[Tuple[str, str]]] = {}
+invitee_index_lock = threading.Lock()
+
+
+def index_invitee_appointment(owner: str, appointment: Appointment):
+    with invitee_index_lock:
+        invitee_index.setdefault(appointment.invitee, InviteeAppointments()).add(
+            (appointment.start_time, appointment.end_time, owner, appointment.appointment_id)
+        )
+
+
+def unindex_invitee_appointment(owner: str, appointment: Appointment):
+    entry = (appointment.start_time, appointment.end_time, owner, appointment.appointment_id)
+    with invitee_index_lock:
+        invitee_appointments = invitee_index.get(appointment.invitee)
+        if invitee_appointments is None:
+            return
+        invitee_appointments.remove(entry)
+        if not invitee_appointments.entries:
+            invitee_index.pop(appointment.invitee, None)
+
+
+def rule_key(rule: AvailabilityRule) -> tuple:
+    return (to_date(rule.start_date), to_date(rule.end_date), rule.start_time, rule.end_time,
+            rule.weekday_mask, rule.interval_weeks, rule.exception_dates, rule.capacity)
+
+
+def intern_rule(rule: AvailabilityRule) -> AvailabilityRule:
+    """Return the shared AvailabilityRule equal to rule, storing rule if it is the first one."""
+    return interned_rules.setdefault(rule_key(rule), rule)
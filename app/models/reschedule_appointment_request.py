@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class RescheduleAppointmentRequest:
+    owner: str
+    appointment_id: str
+    start_time: datetime
+    end_time: datetime
+    check_invitee: bool = False
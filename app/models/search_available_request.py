@@ -1,7 +1,12 @@
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
+from typing import Optional
 
 @dataclass
 class SearchAvailabilityRequest:
     owner: str
-    request_date: date
\ No newline at end of file
+    request_date: date
+    # Last day of a range search, None searches request_date only
+    end_date: Optional[date] = None
+    # Minimum length of a free window, set to search free gaps instead of fixed slots
+    duration: Optional[timedelta] = None
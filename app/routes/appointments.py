@@ -1,18 +1,81 @@
-from flask import Blueprint, request, jsonify
+import json
 
+from flask import Blueprint, request, jsonify, current_app
+
+from app.constans import constants
+from app.exceptions.exceptions import (
+    AppointmentNotFoundException,
+    HoldNotFoundException,
+    IdempotencyKeyConflictException,
+    InviteeDoubleBookedException,
+    NoAvailableSlotsInCacheException,
+    NoCalenderFoundException
+)
+from app.mappers.book_recurring_slot_request import map_to_book_recurring_slot_request
+from app.mappers.book_team_slot_request import map_to_book_team_slot_request
 from app.mappers.book_time_slot_request import map_to_book_time_slot_request
+from app.mappers.cancel_appointment_request import map_to_cancel_appointment_request
+from app.mappers.hold_time_slot_request import map_to_hold_time_slot_request
+from app.mappers.reschedule_appointment_request import map_to_reschedule_appointment_request
 from app.mappers.search_availability_request import map_to_search_availability_request
-from app.services.booking_service import search_time_slots, book_time_slot
+from app.models.models import calendars
+from app.services.booking_service import (
+    search_time_slots,
+    get_notice_cutoff_key,
+    book_time_slot,
+    book_recurring_slot,
+    cancel_appointment,
+    reschedule_appointment,
+    hold_time_slot,
+    release_hold
+)
+from app.services.invitee_service import list_invitee_appointments
+from app.services.team_service import search_team_slots, book_team_slot
+from app.utils.booking_service_utils import get_encoded_slots_response
+from app.utils.datetime_utils import parse_date
+from app.utils.http_utils import get_calendar_etag, not_modified_response
+from app.utils.idempotency_utils import booking_idempotency_store
+from app.utils.tracing_utils import span
+from app.utils.wire_format_utils import negotiate_media_type
 
 bp = Blueprint("appointments", __name__)
 
 @bp.route("/search_slots", methods=["GET"])
 def search_available_slots():
+    """
+    Search available slots, taking owner, request_date and an optional end_date from the query
+    string, or from a JSON body when the query string has neither owner nor request_date. With a
+    duration in minutes, free windows at least that long are returned instead of fixed slots.
+    Query string searches can be stored by browsers and caching proxies.
+    """
     try:
-        payload = request.get_json(force=True) or {}
+        # Unrelated query parameters, such as a cache buster, do not turn a body search into a query search
+        from_query = "owner" in request.args or "request_date" in request.args
+        payload = request.args.to_dict() if from_query else (request.get_json(force=True) or {})
         search_availability_request = map_to_search_availability_request(payload)
+        owner = search_availability_request.owner
+        date_key = search_availability_request.request_date.strftime(constants.DATE_FORMAT)
+        end_date = search_availability_request.end_date
+        end_key = end_date.strftime(constants.DATE_FORMAT) if end_date else date_key
+        media_type = negotiate_media_type(request.accept_mimetypes)
+        etag_parts = (date_key, end_key, media_type)
+        if search_availability_request.duration:
+            etag_parts += (str(search_availability_request.duration),)
+        if owner in calendars:
+            # Slots starting before the minimum notice cutoff drop out as it moves on
+            cutoff_key = get_notice_cutoff_key(search_availability_request.request_date, calendars[owner])
+            if cutoff_key is not None:
+                etag_parts += (cutoff_key,)
+        etag = get_calendar_etag(owner, *etag_parts)
+        if etag and request.if_none_match.contains_weak(etag):
+            return set_search_cache_headers(not_modified_response(etag), from_query)
         response = search_time_slots(search_availability_request)
-        return jsonify(response), 200
+        body = get_encoded_slots_response(owner, date_key, response, media_type)
+        http_response = current_app.response_class(body, status=200, mimetype=media_type)
+        http_response.vary.add("Accept")
+        if etag:
+            http_response.set_etag(etag)
+        return set_search_cache_headers(http_response, from_query)
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except KeyError as e:
@@ -21,22 +84,241 @@ def search_available_slots():
         print(f"Error in search_available_slots: {e}")
         return jsonify({"error": "An internal server error occurred."}), 500
 
+def set_search_cache_headers(response, from_query: bool):
+    """
+    Let shared caches store query string searches for a short time. Searches sent with a body
+    cannot be keyed by a cache and must always be revalidated.
+    """
+    if from_query:
+        response.cache_control.public = True
+        response.cache_control.max_age = current_app.config.get(
+            "SEARCH_CACHE_MAX_AGE", constants.SEARCH_CACHE_MAX_AGE
+        )
+    else:
+        response.cache_control.no_cache = True
+    return response
+
+
 @bp.route("/book_slot", methods=["POST"])
 def book_time_slot_api():
     """
     Book a time slot for a given calendar owner and invitee.
+    Retries sent with the same Idempotency-Key header get the original result without booking again.
     """
     try:
         data = request.get_json(force=True)
         if not data:
             return jsonify({"error": "Request payload is empty"}), 400
         book_time_slot_request = map_to_book_time_slot_request(data)
-        result = book_time_slot(book_time_slot_request)
+        if current_app.config.get("INVITEE_DOUBLE_BOOKING_CHECK", False):
+            book_time_slot_request.check_invitee = True
+        idempotency_key = request.headers.get(constants.IDEMPOTENCY_KEY_HEADER)
+        if not idempotency_key:
+            result = book_time_slot(book_time_slot_request)
+            with span("jsonify"):
+                return jsonify(result), 200
+        result, replayed = booking_idempotency_store.run(
+            idempotency_key,
+            json.dumps(data, sort_keys=True),
+            lambda: book_time_slot(book_time_slot_request)
+        )
+        with span("jsonify"):
+            response = jsonify(result)
+        if replayed:
+            response.headers[constants.IDEMPOTENT_REPLAYED_HEADER] = "true"
+        return response, 200
+    except IdempotencyKeyConflictException as e:
+        return jsonify({"error": str(e)}), 422
+    except HoldNotFoundException as e:
+        return jsonify({"error": str(e)}), 404
+    except InviteeDoubleBookedException as e:
+        return jsonify({"error": str(e)}), 409
+    except KeyError as e:
+        return jsonify({"error": f"Missing required field: {str(e)}"}), 400
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(e)
+        return jsonify({"error": f"An error occurred time slot booking: {str(e)}"}), 500
+
+@bp.route("/search_team_slots", methods=["GET"])
+def search_team_slots_api():
+    """
+    Search the slots at least one member of a team is free for, taking team and request_date
+    from the query string.
+    """
+    try:
+        team = request.args.get("team")
+        request_date_arg = request.args.get("request_date")
+        if not team or not request_date_arg:
+            return jsonify({"error": "team and request_date parameters are required"}), 400
+        return jsonify(search_team_slots(team, parse_date(request_date_arg))), 200
+    except NoCalenderFoundException as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(e)
+        return jsonify({"error": "An internal server error occurred."}), 500
+
+
+@bp.route("/book_team_slot", methods=["POST"])
+def book_team_slot_api():
+    """
+    Book a slot with the least-loaded free member of a team. The response names the member booked.
+    """
+    try:
+        data = request.get_json(force=True)
+        if not data:
+            return jsonify({"error": "Request payload is empty"}), 400
+        book_team_slot_request = map_to_book_team_slot_request(data)
+        if current_app.config.get("INVITEE_DOUBLE_BOOKING_CHECK", False):
+            book_team_slot_request.check_invitee = True
+        return jsonify(book_team_slot(book_team_slot_request)), 200
+    except NoCalenderFoundException as e:
+        return jsonify({"error": str(e)}), 404
+    except (NoAvailableSlotsInCacheException, InviteeDoubleBookedException) as e:
+        return jsonify({"error": str(e)}), 409
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(e)
+        return jsonify({"error": f"An error occurred booking the team slot: {str(e)}"}), 500
+
+
+@bp.route("/by_invitee", methods=["GET"])
+def list_invitee_appointments_api():
+    """
+    List an invitee's appointments with every owner starting between the start and end query parameters.
+    """
+    try:
+        invitee = request.args.get("invitee")
+        start_arg = request.args.get("start")
+        end_arg = request.args.get("end")
+        if not invitee or not start_arg or not end_arg:
+            return jsonify({"error": "invitee, start and end parameters are required"}), 400
+        start_datetime = parse_date(start_arg, constants.DATETIME_FORMAT)
+        end_datetime = parse_date(end_arg, constants.DATETIME_FORMAT)
+        if start_datetime >= end_datetime:
+            return jsonify({"error": "Start must be before end."}), 400
+        return jsonify({"appointments": list_invitee_appointments(invitee, start_datetime, end_datetime)}), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(e)
+        return jsonify({"error": "An internal server error occurred."}), 500
+
+
+@bp.route("/book_recurring_slot", methods=["POST"])
+def book_recurring_slot_api():
+    """
+    Book a slot repeating every interval_weeks weeks, optionally until a last day.
+    """
+    try:
+        data = request.get_json(force=True)
+        if not data:
+            return jsonify({"error": "Request payload is empty"}), 400
+        result = book_recurring_slot(map_to_book_recurring_slot_request(data))
         return jsonify(result), 200
+    except NoCalenderFoundException as e:
+        return jsonify({"error": str(e)}), 404
+    except NoAvailableSlotsInCacheException as e:
+        return jsonify({"error": str(e)}), 409
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(e)
+        return jsonify({"error": f"An error occurred booking the recurring slot: {str(e)}"}), 500
+
+
+@bp.route("/hold_slot", methods=["POST"])
+def hold_time_slot_api():
+    """
+    Hold a searched slot for an invitee for a few minutes. Book the slot with the returned
+    hold_id to confirm it, otherwise it becomes available again when the hold expires.
+    """
+    try:
+        data = request.get_json(force=True)
+        if not data:
+            return jsonify({"error": "Request payload is empty"}), 400
+        hold_time_slot_request = map_to_hold_time_slot_request(data)
+        if hold_time_slot_request.ttl_seconds is None:
+            hold_time_slot_request.ttl_seconds = int(
+                current_app.config.get("HOLD_TTL_SECONDS", constants.HOLD_TTL_SECONDS)
+            )
+        return jsonify(hold_time_slot(hold_time_slot_request)), 200
+    except NoCalenderFoundException as e:
+        return jsonify({"error": str(e)}), 404
+    except NoAvailableSlotsInCacheException as e:
+        return jsonify({"error": str(e)}), 409
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(e)
+        return jsonify({"error": f"An error occurred holding the time slot: {str(e)}"}), 500
+
+
+@bp.route("/release_hold", methods=["POST"])
+def release_hold_api():
+    """
+    Release a hold before it expires, for example when the invitee abandons the booking.
+    """
+    try:
+        data = request.get_json(force=True) or {}
+        owner = data["owner"]
+        hold_id = data["hold_id"]
+        if not release_hold(owner, hold_id):
+            return jsonify({"error": f"Hold {hold_id} not found for owner: {owner}"}), 404
+        return jsonify({"message": "Hold released successfully"}), 200
+    except NoCalenderFoundException as e:
+        return jsonify({"error": str(e)}), 404
     except KeyError as e:
         return jsonify({"error": f"Missing required field: {str(e)}"}), 400
+    except Exception as e:
+        print(e)
+        return jsonify({"error": f"An error occurred releasing the hold: {str(e)}"}), 500
+
+
+@bp.route("/cancel_slot", methods=["POST"])
+def cancel_appointment_api():
+    """
+    Cancel a booked appointment by its id, freeing the slot for new bookings.
+    """
+    try:
+        data = request.get_json(force=True)
+        if not data:
+            return jsonify({"error": "Request payload is empty"}), 400
+        result = cancel_appointment(map_to_cancel_appointment_request(data))
+        return jsonify(result), 200
+    except (NoCalenderFoundException, AppointmentNotFoundException) as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(e)
+        return jsonify({"error": f"An error occurred cancelling the appointment: {str(e)}"}), 500
+
+
+@bp.route("/reschedule_slot", methods=["POST"])
+def reschedule_appointment_api():
+    """
+    Move a booked appointment to another available slot of the same owner.
+    """
+    try:
+        data = request.get_json(force=True)
+        if not data:
+            return jsonify({"error": "Request payload is empty"}), 400
+        reschedule_appointment_request = map_to_reschedule_appointment_request(data)
+        if current_app.config.get("INVITEE_DOUBLE_BOOKING_CHECK", False):
+            reschedule_appointment_request.check_invitee = True
+        result = reschedule_appointment(reschedule_appointment_request)
+        return jsonify(result), 200
+    except (NoCalenderFoundException, AppointmentNotFoundException) as e:
+        return jsonify({"error": str(e)}), 404
+    except (NoAvailableSlotsInCacheException, InviteeDoubleBookedException) as e:
+        return jsonify({"error": str(e)}), 409
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(e)
-        return jsonify({"error": f"An error occurred time slot booking: {str(e)}"}), 500
\ No newline at end of file
+        return jsonify({"error": f"An error occurred rescheduling the appointment: {str(e)}"}), 500
@@ -0,0 +1,29 @@
+from flask import Blueprint, request, jsonify, current_app
+from werkzeug.exceptions import BadRequest
+
+from app.services.batch_service import run_batch
+
+bp = Blueprint("batch", __name__)
+
+
+@bp.route("/batch", methods=["POST"])
+def batch_operations():
+    """
+    Run several search_slots, book_slot and list_upcoming operations in one request.
+    """
+    try:
+        data = request.get_json(force=True)
+        if not isinstance(data, dict) or "operations" not in data:
+            return jsonify({"error": "Request payload must contain 'operations'"}), 400
+        results = run_batch(
+            data["operations"],
+            check_invitee=bool(current_app.config.get("INVITEE_DOUBLE_BOOKING_CHECK", False))
+        )
+        return jsonify({"results": results}), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"Error in batch_operations: {e}")
+        return jsonify({"error": "An internal server error occurred."}), 500
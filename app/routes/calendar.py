@@ -1,9 +1,31 @@
-from flask import Blueprint, request, jsonify
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify, current_app
 from werkzeug.exceptions import BadRequest
 
+from app.constans import constants
+from app.exceptions.exceptions import NoCalenderFoundException
+from app.mappers.blackout_request import map_to_blackout_request
+from app.mappers.booking_constraints_request import map_to_booking_constraints_request
 from app.mappers.set_availability_request import map_to_set_availability_request
 from app.models.models import calendars
-from app.services.calendar_service import set_availability, list_upcoming_appointments_for_owner
+from app.services.calendar_service import (
+    set_availability,
+    list_upcoming_appointments_for_owner,
+    add_blackouts,
+    set_booking_constraints,
+    set_timezone,
+    add_holiday_blackouts,
+    subscribe_holiday_calendar,
+    set_rule_template,
+    subscribe_rule_template
+)
+from app.services.analytics_service import get_organization_utilization, get_owner_utilization
+from app.services.team_service import set_team
+from app.utils.datetime_utils import parse_date, to_date
+from app.utils.http_utils import get_calendar_etag, not_modified_response
+from app.utils.tracing_utils import span
+from app.utils.wire_format_utils import negotiate_media_type, compact_appointments, encode_payload
 
 bp = Blueprint("calendar", __name__)
 
@@ -24,9 +46,127 @@ def set_calendar_availability(owner):
         return jsonify({"error": str(e)}), 500
 
 
+@bp.route("/blackouts/<owner>", methods=["POST"])
+def set_calendar_blackouts(owner):
+    """Block dates or intervals inside an owner's availability."""
+    try:
+        response = add_blackouts(owner, map_to_blackout_request(request.get_json(force=True)))
+        return jsonify(response)
+    except NoCalenderFoundException as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/constraints/<owner>", methods=["POST"])
+def set_calendar_booking_constraints(owner):
+    """Set the buffer times, minimum notice and daily appointment limit of an owner."""
+    try:
+        response = set_booking_constraints(owner, map_to_booking_constraints_request(request.get_json(force=True)))
+        return jsonify(response)
+    except NoCalenderFoundException as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/timezone/<owner>", methods=["POST"])
+def set_calendar_timezone(owner):
+    """Set the IANA timezone an owner's availability rules are evaluated in."""
+    try:
+        response = set_timezone(owner, (request.get_json(force=True) or {}).get("timezone"))
+        return jsonify(response)
+    except NoCalenderFoundException as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/teams/<name>", methods=["POST"])
+def set_team_members(name):
+    """Create or replace a team whose members' availability is pooled for round-robin booking."""
+    try:
+        response = set_team(name, (request.get_json(force=True) or {}).get("members"))
+        return jsonify(response)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/holidays/<name>", methods=["POST"])
+def set_holiday_blackouts(name):
+    """Add blackouts to a shared holiday calendar, creating it if needed."""
+    try:
+        response = add_holiday_blackouts(name, map_to_blackout_request(request.get_json(force=True)))
+        return jsonify(response)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/holidays/<name>/subscribe/<owner>", methods=["POST"])
+def subscribe_to_holiday_calendar(name, owner):
+    """Apply a shared holiday calendar's blackouts to an owner's calendar."""
+    try:
+        return jsonify(subscribe_holiday_calendar(owner, name))
+    except NoCalenderFoundException as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/templates/<name>", methods=["POST"])
+def set_calendar_rule_template(name):
+    """Create or replace a named rule template with the set_availability body format."""
+    try:
+        response = set_rule_template(name, map_to_set_availability_request(request.get_json(force=True)))
+        return jsonify(response)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except KeyError as e:
+        return jsonify({"error": str(e)}), 400
+    except BadRequest as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/templates/<name>/subscribe/<owner>", methods=["POST"])
+def subscribe_to_rule_template(name, owner):
+    """Give an owner the availability of a rule template."""
+    try:
+        return jsonify(subscribe_rule_template(owner, name))
+    except NoCalenderFoundException as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @bp.route('/appointments/list_upcoming', methods=['GET'])
 def list_upcoming_appointments():
-    """Retrieve all upcoming appointments for a calendar owner."""
+    """
+    Retrieve all upcoming appointments for a calendar owner, optionally up to an until date.
+    """
     owner = request.args.get('owner')
     if not owner:
         return jsonify({"error": "Owner parameter is required"}), 400
@@ -34,8 +174,31 @@ def list_upcoming_appointments():
     if owner not in calendars:
         return jsonify({"error": "Calendar owner not found"}), 404
     try:
-        upcoming_appointments = list_upcoming_appointments_for_owner(owner)
-        return jsonify({"upcoming_appointments": upcoming_appointments}), 200
+        now = datetime.now()
+        until_arg = request.args.get('until')
+        until = to_date(parse_date(until_arg)) if until_arg else None
+        media_type = negotiate_media_type(request.accept_mimetypes)
+        # The upcoming list also changes as appointments start, which happens on minute boundaries
+        etag = get_calendar_etag(owner, now.strftime(constants.DATETIME_FORMAT), until_arg or "", media_type)
+        if etag and request.if_none_match.contains_weak(etag):
+            return not_modified_response(etag)
+        upcoming_appointments = list_upcoming_appointments_for_owner(owner, until)
+        with span("encode"):
+            if media_type == constants.JSON_MIMETYPE:
+                response = jsonify({"upcoming_appointments": upcoming_appointments})
+            else:
+                payload = {"upcoming_appointments": upcoming_appointments}
+                if media_type == constants.COMPACT_JSON_MIMETYPE:
+                    base = now.replace(hour=0, minute=0, second=0, microsecond=0)
+                    payload = {
+                        "base": base.strftime(constants.DATETIME_FORMAT),
+                        "upcoming_appointments": compact_appointments(upcoming_appointments, base)
+                    }
+                response = current_app.response_class(encode_payload(payload, media_type), mimetype=media_type)
+        response.vary.add("Accept")
+        if etag:
+            response.set_etag(etag)
+        return response, 200
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except KeyError as e:
@@ -44,3 +207,26 @@ def list_upcoming_appointments():
         return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+@bp.route('/utilization', methods=['GET'])
+def get_utilization():
+    """
+    Report booked versus available minutes per day or week, for one owner or the whole organization.
+    """
+    start_arg, end_arg = request.args.get('start'), request.args.get('end')
+    if not start_arg or not end_arg:
+        return jsonify({"error": "start and end parameters are required"}), 400
+    try:
+        start_date, end_date = to_date(parse_date(start_arg)), to_date(parse_date(end_arg))
+        bucket = request.args.get('bucket', 'day')
+        owner = request.args.get('owner')
+        if owner:
+            return jsonify(get_owner_utilization(owner, start_date, end_date, bucket))
+        return jsonify(get_organization_utilization(start_date, end_date, bucket))
+    except NoCalenderFoundException as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
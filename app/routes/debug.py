@@ -0,0 +1,43 @@
+from flask import Blueprint, request, jsonify
+
+from app.utils import tracing_utils
+from app.utils.profiling_utils import get_profile_report, reset_profiles, get_memory_snapshot
+
+bp = Blueprint("debug", __name__)
+
+
+@bp.route("/traces", methods=["GET"])
+def list_traces():
+    """Return the spans held in the in-memory trace buffer, optionally for a single trace."""
+    trace_id = request.args.get("trace_id")
+    spans = tracing_utils.ring_buffer_exporter.get_spans(trace_id)
+    return jsonify({"spans": [span.to_dict() for span in spans]}), 200
+
+
+@bp.route("/profiles", methods=["GET"])
+def list_profiles():
+    """Return the cProfile stats aggregated per route, optionally for a single route."""
+    try:
+        route = request.args.get("route")
+        limit = int(request.args.get("limit", 20))
+        sort_by = request.args.get("sort", "cumulative")
+        return jsonify({"profiles": get_profile_report(route, limit, sort_by)}), 200
+    except (ValueError, KeyError) as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@bp.route("/profiles", methods=["DELETE"])
+def clear_profiles():
+    """Discard the aggregated profile stats."""
+    reset_profiles()
+    return jsonify({"message": "Profiles cleared"}), 200
+
+
+@bp.route("/memory", methods=["GET"])
+def memory_snapshot():
+    """Return a tracemalloc snapshot and the memory held by the calendar and slot cache stores."""
+    try:
+        limit = int(request.args.get("limit", 10))
+        return jsonify(get_memory_snapshot(limit)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
@@ -0,0 +1,149 @@
+from datetime import date, timedelta
+from typing import List, Tuple
+
+from app.constans import constants
+from app.models.models import Calendar, calendars, slot_cache_lock
+from app.utils.analytics_utils import get_bucket_starts, get_bucket_totals, get_utilization_ratio, sum_rows_by_bucket
+from app.utils.booking_service_utils import get_rule_slots
+from app.utils.common_utils import get_calendar, get_slot_capacity
+from app.utils.datetime_utils import minutes_between
+from app.utils.tracing_utils import traced
+
+
+def get_available_minutes(day: date, calendar: Calendar) -> int:
+    """
+    Minutes of the rule slots of a day outside blackouts, a multi-seat slot counting once per seat.
+    """
+    return sum(
+        minutes_between(start_time, end_time) * get_slot_capacity(calendar, start_time, end_time)
+        for start_time, end_time in get_rule_slots(day, calendar)
+    )
+
+
+def get_booked_minutes(day: date, calendar: Calendar) -> int:
+    """
+    Minutes of the appointments, recurring occurrences and archived appointments starting on a day.
+    """
+    day_start, day_end = calendar.day_bounds(day)
+    booked = sum(
+        minutes_between(start_time, end_time)
+        for start_time, end_time, _ in calendar.appointments_between(day_start, day_end)
+    )
+    stored_day = day_start.date()
+    while stored_day <= day_end.date():
+        booked += sum(
+            minutes_between(start_time, end_time)
+            for _, start_time, end_time in calendar.archived_appointments.get(stored_day, ())
+            if day_start <= start_time < day_end
+        )
+        stored_day += timedelta(days=1)
+    return booked
+
+
+def fill_utilization_days(calendar: Calendar, start_date: date, end_date: date):
+    """
+    Compute the days of a range missing from the calendar's utilization index. Days computed
+    before are kept, bookings and cancellations keep them current. Must be called with the
+    slot cache lock held.
+    """
+    utilization = calendar.utilization
+    for offset in range((end_date - start_date).days + 1):
+        day = start_date + timedelta(days=offset)
+        if day not in utilization.available:
+            utilization.set_day(day, get_available_minutes(day, calendar), get_booked_minutes(day, calendar))
+
+
+def get_utilization_prefix(calendar: Calendar, start_date: date, end_date: date) -> Tuple[date, List[int], List[int]]:
+    """
+    Compute the missing days of a range and return the running totals covering it.
+
+    The slot cache lock is taken for UTILIZATION_LOCK_DAYS days at a time, so bookings wait
+    for one chunk at most instead of the whole range. The last pass, under the lock, computes
+    again the days a change dropped in between.
+    """
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(chunk_start + timedelta(days=constants.UTILIZATION_LOCK_DAYS - 1), end_date)
+        with slot_cache_lock:
+            fill_utilization_days(calendar, chunk_start, chunk_end)
+        chunk_start = chunk_end + timedelta(days=1)
+    with slot_cache_lock:
+        fill_utilization_days(calendar, start_date, end_date)
+        return calendar.utilization.get_prefix(start_date, end_date)
+
+
+@traced()
+def get_owner_utilization(owner: str, start_date: date, end_date: date, bucket: str = "day") -> dict:
+    """
+    Report an owner's available and booked minutes per day or week from start_date to end_date.
+    Bucket totals are differences of the index's running totals.
+
+    Raises:
+        NoCalenderFoundException: If the owner has no calendar
+        ValueError: If the bucket or the range is invalid
+    """
+    bucket_starts = get_bucket_starts(start_date, end_date, bucket)
+    calendar = get_calendar(owner)
+    first_day, available_prefix, booked_prefix = get_utilization_prefix(calendar, start_date, end_date)
+    boundaries = [(day - first_day).days for day in bucket_starts] + [(end_date - first_day).days + 1]
+    available = get_bucket_totals(available_prefix, boundaries)
+    booked = get_bucket_totals(booked_prefix, boundaries)
+    return {
+        "owner": owner,
+        "bucket": bucket,
+        "utilization": format_utilization_buckets(bucket_starts, available, booked),
+        "total": format_utilization(sum(available), sum(booked))
+    }
+
+
+@traced()
+def get_organization_utilization(start_date: date, end_date: date, bucket: str = "day") -> dict:
+    """
+    Report the available and booked minutes of every owner together per day or week, with
+    each owner's totals over the range.
+
+    Each owner's daily minutes form one row; the rows are totalled per bucket with NumPy when
+    it is installed, and with plain prefix sums otherwise. Owners are computed one at a time.
+
+    Raises:
+        ValueError: If the bucket or the range is invalid
+    """
+    bucket_starts = get_bucket_starts(start_date, end_date, bucket)
+    days = (end_date - start_date).days + 1
+    available_rows, booked_rows, owners = [], [], {}
+    for owner, calendar in list(calendars.items()):
+        first_day, available_prefix, booked_prefix = get_utilization_prefix(calendar, start_date, end_date)
+        first = (start_date - first_day).days
+        available_rows.append(get_daily_values(available_prefix, first, days))
+        booked_rows.append(get_daily_values(booked_prefix, first, days))
+        owners[owner] = format_utilization(
+            available_prefix[first + days] - available_prefix[first], booked_prefix[first + days] - booked_prefix[first]
+        )
+    boundaries = [(day - start_date).days for day in bucket_starts] + [days]
+    available = sum_rows_by_bucket(available_rows, boundaries)
+    booked = sum_rows_by_bucket(booked_rows, boundaries)
+    return {
+        "bucket": bucket,
+        "owners": owners,
+        "utilization": format_utilization_buckets(bucket_starts, available, booked),
+        "total": format_utilization(sum(available), sum(booked))
+    }
+
+
+def get_daily_values(prefix: List[int], first: int, days: int) -> List[int]:
+    return [prefix[index + 1] - prefix[index] for index in range(first, first + days)]
+
+
+def format_utilization(available_minutes: int, booked_minutes: int) -> dict:
+    return {
+        "available_minutes": available_minutes,
+        "booked_minutes": booked_minutes,
+        "utilization": get_utilization_ratio(available_minutes, booked_minutes)
+    }
+
+
+def format_utilization_buckets(bucket_starts: List[date], available: List[int], booked: List[int]) -> list:
+    return [
+        {"start": day.strftime(constants.DATE_FORMAT), **format_utilization(available_minutes, booked_minutes)}
+        for day, available_minutes, booked_minutes in zip(bucket_starts, available, booked)
+    ]
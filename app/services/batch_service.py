@@ -0,0 +1,129 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Callable, Dict, List
+
+from app.constans import constants
+from app.exceptions.exceptions import (
+    InviteeDoubleBookedException,
+    NoCalenderFoundException,
+    NoAvailableSlotsInCacheException
+)
+from app.mappers.book_time_slot_request import map_to_book_time_slot_request
+from app.mappers.search_availability_request import map_to_search_availability_request
+from app.models.models import calendars
+from app.services.booking_service import search_time_slots, book_time_slot
+from app.services.calendar_service import list_upcoming_appointments_for_owner
+from app.utils.tracing_utils import traced
+
+# Shared pool running the operations of different owners concurrently
+batch_executor = ThreadPoolExecutor(max_workers=constants.BATCH_MAX_WORKERS, thread_name_prefix="batch")
+
+
+def _search_slots(params: dict) -> dict:
+    return search_time_slots(map_to_search_availability_request(params))
+
+
+def _book_slot(params: dict) -> dict:
+    return book_time_slot(map_to_book_time_slot_request(params))
+
+
+def _list_upcoming(params: dict) -> dict:
+    owner = params["owner"]
+    if owner not in calendars:
+        raise NoCalenderFoundException(f"Calendar not found for owner: {owner}")
+    return {"upcoming_appointments": list_upcoming_appointments_for_owner(owner)}
+
+
+BATCH_OPERATIONS: Dict[str, Callable[[dict], dict]] = {
+    "search_slots": _search_slots,
+    "book_slot": _book_slot,
+    "list_upcoming": _list_upcoming,
+}
+
+
+def run_operation(operation: Any, check_invitee: bool = False) -> dict:
+    """
+    Run a single batch operation and map its outcome to a status code and body.
+
+    Args:
+        operation (dict): {"op": "search_slots" | "book_slot" | "list_upcoming", "params": {...}}
+        check_invitee (bool): Reject book_slot operations double booking the invitee, as the
+            INVITEE_DOUBLE_BOOKING_CHECK setting does for book_slot requests.
+
+    Returns:
+        dict: {"status": int, "body": dict}
+    """
+    try:
+        if not isinstance(operation, dict):
+            raise ValueError("Operation must be an object.")
+        handler = BATCH_OPERATIONS.get(operation.get("op"))
+        if handler is None:
+            raise ValueError(f"Unknown operation: {operation.get('op')}")
+        params = operation.get("params") or {}
+        if not isinstance(params, dict):
+            raise ValueError("Operation params must be an object.")
+        if check_invitee and handler is _book_slot:
+            params = dict(params, check_invitee=True)
+        return {"status": 200, "body": handler(params)}
+    except KeyError as e:
+        return {"status": 400, "body": {"error": f"Missing required field: {str(e)}"}}
+    except ValueError as e:
+        return {"status": 400, "body": {"error": str(e)}}
+    except NoCalenderFoundException as e:
+        return {"status": 404, "body": {"error": str(e)}}
+    except (NoAvailableSlotsInCacheException, InviteeDoubleBookedException) as e:
+        return {"status": 409, "body": {"error": str(e)}}
+    except Exception as e:
+        print(f"Error in batch operation {operation}: {e}")
+        return {"status": 500, "body": {"error": "An internal server error occurred."}}
+
+
+def _conflict_key(index: int, operation: Any):
+    params = operation.get("params") if isinstance(operation, dict) else None
+    owner = params.get("owner") if isinstance(params, dict) else None
+    # Operations without an owner touch no shared calendar and can run on their own
+    return owner if isinstance(owner, str) else ("", index)
+
+
+@traced()
+def run_batch(operations: List[Any], check_invitee: bool = False) -> List[dict]:
+    """
+    Run batch operations and return their results in request order.
+
+    Operations on the same owner may conflict, e.g. a booking followed by a search, so they run
+    sequentially in request order. Groups of different owners run concurrently.
+
+    Args:
+        operations (list): Sub-operations as accepted by run_operation.
+        check_invitee (bool): Passed on to run_operation.
+
+    Returns:
+        list: One {"status", "body"} result per operation.
+
+    Raises:
+        ValueError: If operations is not a list or holds too many operations.
+    """
+    if not isinstance(operations, list):
+        raise ValueError("'operations' must be a list.")
+    if len(operations) > constants.BATCH_MAX_OPERATIONS:
+        raise ValueError(f"A batch cannot hold more than {constants.BATCH_MAX_OPERATIONS} operations.")
+
+    groups: Dict[Any, List[int]] = {}
+    for index, operation in enumerate(operations):
+        groups.setdefault(_conflict_key(index, operation), []).append(index)
+
+    results: List[dict] = [{}] * len(operations)
+
+    def run_group(indices: List[int]):
+        for i in indices:
+            results[i] = run_operation(operations[i], check_invitee)
+
+    if len(groups) <= 1:
+        for indices in groups.values():
+            run_group(indices)
+        return results
+
+    futures = [batch_executor.submit(copy_context().run, run_group, indices) for indices in groups.values()]
+    for future in futures:
+        future.result()
+    return results
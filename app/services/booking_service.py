@@ -1,76 +1,217 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
 from app.constans import constants
-from app.exceptions.exceptions import NoCalenderFoundException, NoAvailableSlotsInCacheException
+from app.exceptions.exceptions import (
+    AppointmentNotFoundException,
+    HoldNotFoundException,
+    InviteeDoubleBookedException,
+    NoCalenderFoundException,
+    NoAvailableSlotsInCacheException
+)
+from app.models.book_recurring_slot_request import BookRecurringSlotRequest
 from app.models.book_time_slot_request import BookTimeSlotRequest
-from app.models.models import Appointment, available_slots_cache
+from app.models.cancel_appointment_request import CancelAppointmentRequest
+from app.models.hold_time_slot_request import HoldTimeSlotRequest
+from app.models.models import (
+    Appointment,
+    Calendar,
+    Hold,
+    RecurringAppointment,
+    available_slots_cache,
+    record_search,
+    schedule_expiry,
+    schedule_hold_expiry,
+    slot_cache_lock
+)
+from app.models.reschedule_appointment_request import RescheduleAppointmentRequest
 from app.models.search_available_request import SearchAvailabilityRequest
-from app.utils.booking_service_utils import generate_daily_available_slots, get_available_slots
-from app.utils.common_utils import get_slot_in_cache, get_calendar
+from app.utils.booking_service_utils import (
+    generate_daily_available_slots,
+    get_available_slots,
+    get_date_key,
+    get_free_gaps,
+    set_cached_slots,
+    drop_cached_slots,
+    is_rule_slot,
+    release_cached_slots,
+    remove_booked_cached_slots,
+    has_recurring_conflict,
+    remove_recurring_cached_slots,
+    release_recurring_cached_slots
+)
+from app.utils.common_utils import (
+    get_slot_in_cache,
+    get_calendar,
+    get_booking_violation,
+    has_invitee_conflict
+)
+from app.utils.concurrency_utils import SingleFlight
+from app.utils.datetime_utils import parse_date, to_date
+from app.utils.tracing_utils import traced
+
+
+# Coalesces concurrent searches for the same owner and date into one slot generation
+search_single_flight = SingleFlight()
 
 
+@traced()
 def search_time_slots(search_availability_request: SearchAvailabilityRequest):
     """
-    Search available time slots for a specific owner, updating cache only for the requested date.
+    Search available time slots for a specific owner, updating cache only for the requested dates.
+    Dates already in the cache are served from it, and concurrent searches for the same owner
+    and date share a single slot generation. A request with an end date returns the slots of
+    every day in the range, and a request with a duration returns free windows instead.
     """
     try:
         owner = search_availability_request.owner
         requested_date = search_availability_request.request_date
         owner_calender = get_calendar(owner)
-        available_owner_cache = available_slots_cache.get(owner) or {}
-        date_key = requested_date.strftime(constants.DATE_FORMAT)
         if not owner_calender:
             print(f'no availability set for the user {owner}, available calender: {owner_calender}')
             raise NoCalenderFoundException(f"No calendar found for owner: {owner}")
 
-        # Generate new slots for the requested date
-        new_slots = generate_daily_available_slots(requested_date, owner_calender)
-        print(f'new_slots: {new_slots}')
-        if new_slots:
-            available_owner_cache[date_key] = new_slots
-        else:
-            # If no new slots, remove the date from cache if it exists
-            available_owner_cache.pop(date_key, None)
-        slots = available_owner_cache.get(date_key, [])
-        available_slots_cache[owner] = available_owner_cache
-        print(f'available_owner_cache: {available_slots_cache}')
+        record_search(owner)
+        end_date = search_availability_request.end_date
+        if search_availability_request.duration:
+            return {"free_windows": search_free_windows(
+                owner, requested_date, end_date, search_availability_request.duration, owner_calender
+            )}
+        if not end_date or end_date <= requested_date:
+            return {"available_slots": get_daily_slots(owner, requested_date, owner_calender)}
+        slots = []
+        for offset in range((end_date - requested_date).days + 1):
+            slots.extend(get_daily_slots(owner, requested_date + timedelta(days=offset), owner_calender))
         return {"available_slots": slots}
     except NoCalenderFoundException as e:
         print(f"Error: {str(e)}")
         raise e
 
 
+def search_free_windows(owner: str, requested_date, end_date, duration: timedelta, owner_calender) -> list:
+    """
+    List the free windows lasting at least duration on each searched day, earliest first.
+
+    Each day's free-gap index answers whether a long enough gap exists with one bisect, so days
+    without one are skipped without looking at their gaps. Days at their daily cap are skipped,
+    and windows are cut at the minimum notice cutoff.
+    """
+    last_date = end_date if end_date and end_date > requested_date else requested_date
+    cutoff = owner_calender.current_time() + owner_calender.min_notice if owner_calender.min_notice else None
+    windows = []
+    for offset in range((last_date - requested_date).days + 1):
+        day = requested_date + timedelta(days=offset)
+        if owner_calender.is_day_full(to_date(day)):
+            continue
+        free_gaps = get_free_gaps(owner, day, owner_calender)
+        if free_gaps.find(duration) is None:
+            continue
+        for gap_start, gap_end in free_gaps.fitting(duration):
+            if cutoff is not None and gap_start < cutoff:
+                gap_start = cutoff
+                if gap_end - gap_start < duration:
+                    continue
+            windows.append({
+                constants.SLOT_START_KEY: gap_start.strftime(constants.DATETIME_FORMAT),
+                constants.SLOT_END_KEY: gap_end.strftime(constants.DATETIME_FORMAT)
+            })
+    return windows
+
+
+def get_daily_slots(owner: str, requested_date, owner_calender) -> list:
+    """
+    Return the cached slots for the date, generating them once if the date is not cached.
+    With a minimum notice, slots cached earlier that now start too soon are left out.
+    """
+    date_key = requested_date.strftime(constants.DATE_FORMAT)
+    cached_slots = available_slots_cache.get(owner, {}).get(date_key)
+    if cached_slots is None:
+        cached_slots = search_single_flight.do(
+            (owner, date_key),
+            lambda: refresh_slots_cache(owner, date_key, requested_date, owner_calender)
+        )
+    cutoff_key = get_notice_cutoff_key(requested_date, owner_calender)
+    if cutoff_key is not None:
+        return [slot for slot in cached_slots if slot[constants.SLOT_START_KEY] >= cutoff_key]
+    return cached_slots
+
+
+def get_notice_cutoff_key(requested_date, owner_calender) -> Optional[str]:
+    """
+    Return the minimum notice cutoff, formatted like slot starts, when it still reaches into
+    the requested date. Searches of such a day change as the cutoff moves on each minute.
+    """
+    if not owner_calender.min_notice:
+        return None
+    cutoff = owner_calender.current_time() + owner_calender.min_notice
+    if to_date(requested_date) > owner_calender.local_day(cutoff):
+        return None
+    return cutoff.strftime(constants.DATETIME_FORMAT)
+
+
+def refresh_slots_cache(owner: str, date_key: str, requested_date, owner_calender) -> list:
+    """
+    Generate the slots for the requested date and store them in the owner's cache.
+    """
+    # Generate new slots for the requested date
+    new_slots = generate_daily_available_slots(requested_date, owner_calender)
+    if new_slots:
+        if set_cached_slots(owner, date_key, new_slots):
+            schedule_expiry(to_date(requested_date), constants.EXPIRY_KIND_SLOT_CACHE, owner, date_key)
+    else:
+        # If no new slots, remove the date from cache if it exists
+        drop_cached_slots(owner, date_key)
+    return new_slots
+
+
+@traced()
 def book_time_slot(book_time_slot_request: BookTimeSlotRequest) -> dict:
     """
-    Book a time slot for a specific owner if it's available in the cache.
+    Book a time slot for a specific owner if it's available in the cache and still allowed by
+    the owner's booking constraints, such as the minimum notice that moves on after the search.
+    A request with a hold id confirms that hold instead, as long as it has not expired.
+    With check_invitee set, the booking is rejected if the invitee already has an overlapping
+    appointment with any owner.
     """
     try:
         start_datetime = book_time_slot_request.start_time
         end_datetime = book_time_slot_request.end_time
-        date_key = start_datetime.date().strftime(constants.DATE_FORMAT)
         owner = book_time_slot_request.owner
         calendar = get_calendar(owner)
+        date_key = get_date_key(calendar, start_datetime)
 
-        available_slots = get_available_slots(owner, date_key)
-
-        print(f'available_slots: {available_slots}')
         # Find the requested slot in cache
         requested_slot = {
             constants.SLOT_START_KEY: start_datetime.strftime(constants.DATETIME_FORMAT),
             constants.SLOT_END_KEY: end_datetime.strftime(constants.DATETIME_FORMAT)
         }
-        slot_in_cache = get_slot_in_cache(requested_slot, available_slots)
-        print(f'slot_in_cache: {slot_in_cache}')
-        if not slot_in_cache:
-            raise NoAvailableSlotsInCacheException(f"Requested time slot {requested_slot} is not available")
-        appointment = Appointment(
-            start_time=start_datetime,
-            end_time=end_datetime,
-            invitee=book_time_slot_request.invitee,
-        )
-        calendar.add_appointment(appointment)
-        available_slots_cache[owner][date_key].remove(slot_in_cache)
+        with slot_cache_lock:
+            slot_in_cache = None
+            if book_time_slot_request.check_invitee and has_invitee_conflict(
+                    book_time_slot_request.invitee, start_datetime, end_datetime):
+                raise InviteeDoubleBookedException(
+                    f"Invitee {book_time_slot_request.invitee} already has an appointment at {requested_slot}"
+                )
+            if book_time_slot_request.hold_id:
+                confirm_hold(calendar, book_time_slot_request)
+            else:
+                available_slots = get_available_slots(owner, date_key)
+                slot_in_cache = get_slot_in_cache(requested_slot, available_slots)
+                print(f'slot_in_cache: {slot_in_cache}')
+                if not slot_in_cache:
+                    raise NoAvailableSlotsInCacheException(f"Requested time slot {requested_slot} is not available")
+                check_booking_constraints(calendar, start_datetime, end_datetime)
+            appointment = Appointment(
+                start_time=start_datetime,
+                end_time=end_datetime,
+                invitee=book_time_slot_request.invitee,
+            )
+            calendar.add_appointment(appointment)
+            remove_booked_cached_slots(owner, calendar, start_datetime, end_datetime)
         return {
             "message": "Appointment booked successfully",
             "appointment": {
+                "appointment_id": appointment.appointment_id,
                 "start": start_datetime.strftime(constants.DATETIME_FORMAT),
                 "end": end_datetime.strftime(constants.DATETIME_FORMAT),
                 "invitee": book_time_slot_request.invitee,
@@ -80,3 +221,228 @@ def book_time_slot(book_time_slot_request: BookTimeSlotRequest) -> dict:
     except ValueError as e:
         print("Invalid datetime format: {str(e)}")
         raise e
+
+
+def check_booking_constraints(calendar: Calendar, start_datetime: datetime, end_datetime: datetime,
+                              exclude: Optional[Appointment] = None):
+    """
+    Raise NoAvailableSlotsInCacheException if the owner's booking constraints reject the slot.
+    """
+    violation = get_booking_violation(start_datetime, end_datetime, calendar, exclude=exclude)
+    if violation is not None:
+        requested_slot = {
+            constants.SLOT_START_KEY: start_datetime.strftime(constants.DATETIME_FORMAT),
+            constants.SLOT_END_KEY: end_datetime.strftime(constants.DATETIME_FORMAT)
+        }
+        raise NoAvailableSlotsInCacheException(f"Requested time slot {requested_slot} is not available: {violation}")
+
+
+def confirm_hold(calendar: Calendar, book_time_slot_request: BookTimeSlotRequest) -> Hold:
+    """
+    Remove the hold being confirmed by a booking. Must be called with the slot cache lock held.
+
+    Raises:
+        HoldNotFoundException: If the hold does not exist or has expired.
+        ValueError: If the hold is for another slot or invitee.
+    """
+    hold_id = book_time_slot_request.hold_id
+    hold = calendar.holds.get(hold_id)
+    if hold is None or not hold.is_active():
+        raise HoldNotFoundException(f"Hold {hold_id} not found or expired for owner: {calendar.owner}")
+    if (hold.start_time, hold.end_time, hold.invitee) != (
+            book_time_slot_request.start_time, book_time_slot_request.end_time, book_time_slot_request.invitee):
+        raise ValueError(f"Hold {hold_id} does not match the requested slot and invitee.")
+    return calendar.remove_hold(hold_id)
+
+
+@traced()
+def hold_time_slot(hold_time_slot_request: HoldTimeSlotRequest) -> dict:
+    """
+    Reserve a cached slot for an invitee for ttl_seconds, hiding it from searches and bookings.
+    The hold is confirmed by booking the slot with its hold id, or released when it expires.
+    """
+    start_datetime = hold_time_slot_request.start_time
+    end_datetime = hold_time_slot_request.end_time
+    owner = hold_time_slot_request.owner
+    ttl_seconds = hold_time_slot_request.ttl_seconds or constants.HOLD_TTL_SECONDS
+    calendar = get_calendar(owner)
+    date_key = get_date_key(calendar, start_datetime)
+
+    requested_slot = {
+        constants.SLOT_START_KEY: start_datetime.strftime(constants.DATETIME_FORMAT),
+        constants.SLOT_END_KEY: end_datetime.strftime(constants.DATETIME_FORMAT)
+    }
+    with slot_cache_lock:
+        slot_in_cache = get_slot_in_cache(requested_slot, get_available_slots(owner, date_key))
+        if not slot_in_cache:
+            raise NoAvailableSlotsInCacheException(f"Requested time slot {requested_slot} is not available")
+        check_booking_constraints(calendar, start_datetime, end_datetime)
+        hold = Hold(
+            invitee=hold_time_slot_request.invitee,
+            start_time=start_datetime,
+            end_time=end_datetime,
+            expires_at=datetime.now() + timedelta(seconds=ttl_seconds)
+        )
+        calendar.add_hold(hold)
+        remove_booked_cached_slots(owner, calendar, start_datetime, end_datetime)
+    schedule_hold_expiry(hold, owner)
+    return {
+        "message": "Slot held successfully",
+        "hold": hold.to_dict()
+    }
+
+
+def release_hold(owner: str, hold_id: str) -> bool:
+    """
+    Remove a hold and put its slot back into the owner's cached slots.
+
+    Returns:
+        bool: True if the hold existed.
+    """
+    calendar = get_calendar(owner)
+    with slot_cache_lock:
+        hold = calendar.remove_hold(hold_id)
+        if hold is None:
+            return False
+        release_cached_slots(owner, calendar, hold.start_time, hold.end_time)
+        return True
+
+
+@traced()
+def book_recurring_slot(book_recurring_slot_request: BookRecurringSlotRequest) -> dict:
+    """
+    Book a series of appointments repeating every interval_weeks weeks, stored as one record.
+
+    The first occurrence must be an available cached slot, like a single booking. Later
+    occurrences must not overlap existing appointments; they are not checked against the
+    availability rules, which usually end before an open-ended series does.
+    """
+    start_datetime = book_recurring_slot_request.start_time
+    end_datetime = book_recurring_slot_request.end_time
+    owner = book_recurring_slot_request.owner
+    calendar = get_calendar(owner)
+    date_key = get_date_key(calendar, start_datetime)
+
+    requested_slot = {
+        constants.SLOT_START_KEY: start_datetime.strftime(constants.DATETIME_FORMAT),
+        constants.SLOT_END_KEY: end_datetime.strftime(constants.DATETIME_FORMAT)
+    }
+    series = RecurringAppointment(
+        invitee=book_recurring_slot_request.invitee,
+        start_time=start_datetime,
+        end_time=end_datetime,
+        interval_weeks=book_recurring_slot_request.interval_weeks,
+        until=book_recurring_slot_request.until,
+        timezone=calendar.timezone
+    )
+    with slot_cache_lock:
+        if not get_slot_in_cache(requested_slot, get_available_slots(owner, date_key)):
+            raise NoAvailableSlotsInCacheException(f"Requested time slot {requested_slot} is not available")
+        check_booking_constraints(calendar, start_datetime, end_datetime)
+        if has_recurring_conflict(series, calendar):
+            raise NoAvailableSlotsInCacheException(
+                f"Recurring appointment from {requested_slot} overlaps an existing appointment"
+            )
+        calendar.add_recurring_appointment(series)
+        remove_recurring_cached_slots(owner, calendar, series)
+    return {
+        "message": "Recurring appointment booked successfully",
+        "recurring_appointment": series.to_dict()
+    }
+
+
+@traced()
+def cancel_appointment(cancel_appointment_request: CancelAppointmentRequest) -> dict:
+    """
+    Cancel an appointment by id and put its slot back into the owner's cached slots.
+
+    The id can also be a series id, cancelling every occurrence, or an occurrence id
+    "<series_id>@<YYYY-MM-DD>", cancelling that day only.
+    Raises AppointmentNotFoundException if the owner has no appointment with the id.
+    """
+    owner = cancel_appointment_request.owner
+    appointment_id = cancel_appointment_request.appointment_id
+    calendar = get_calendar(owner)
+    with slot_cache_lock:
+        appointment = calendar.remove_appointment(appointment_id)
+        if appointment is not None:
+            release_cached_slots(owner, calendar, appointment.start_time, appointment.end_time)
+            return {
+                "message": "Appointment cancelled successfully",
+                "appointment": appointment.to_dict()
+            }
+
+        series = calendar.remove_recurring_appointment(appointment_id)
+        if series is not None:
+            release_recurring_cached_slots(owner, calendar, series)
+            return {
+                "message": "Recurring appointment cancelled successfully",
+                "recurring_appointment": series.to_dict()
+            }
+
+        series_id, _, day_key = appointment_id.partition(constants.OCCURRENCE_ID_SEPARATOR)
+        series = None
+        if day_key:
+            day = to_date(parse_date(day_key))
+            series = calendar.cancel_occurrence(series_id, day)
+        if series is None:
+            raise AppointmentNotFoundException(f"Appointment {appointment_id} not found for owner: {owner}")
+        occurrence_start, occurrence_end = series.occurrence_on(day)
+        release_cached_slots(owner, calendar, occurrence_start, occurrence_end)
+    occurrence = Appointment(
+        invitee=series.invitee,
+        start_time=occurrence_start,
+        end_time=occurrence_end,
+        appointment_id=appointment_id
+    )
+    return {
+        "message": "Appointment cancelled successfully",
+        "appointment": occurrence.to_dict()
+    }
+
+
+@traced()
+def reschedule_appointment(reschedule_appointment_request: RescheduleAppointmentRequest) -> dict:
+    """
+    Move an appointment to another slot of the owner's availability.
+
+    The appointment is moved in one step under the slot cache lock, so no search or booking
+    can see it in both slots or in neither. The old slot is put back into the cached slots of
+    its day and the new one is removed from its day. With check_invitee set, the move is
+    rejected if the invitee has another appointment with any owner overlapping the new slot.
+
+    Raises:
+        AppointmentNotFoundException: If the owner has no appointment with the id.
+        NoAvailableSlotsInCacheException: If the new slot is not offered or the booking constraints reject it.
+        InviteeDoubleBookedException: If check_invitee is set and the invitee is busy in the new slot.
+    """
+    owner = reschedule_appointment_request.owner
+    start_datetime = reschedule_appointment_request.start_time
+    end_datetime = reschedule_appointment_request.end_time
+    calendar = get_calendar(owner)
+    with slot_cache_lock:
+        appointment = calendar.appointment_index.get(reschedule_appointment_request.appointment_id)
+        if appointment is None:
+            raise AppointmentNotFoundException(
+                f"Appointment {reschedule_appointment_request.appointment_id} not found for owner: {owner}"
+            )
+        if not is_rule_slot(calendar, start_datetime, end_datetime):
+            requested_slot = {
+                constants.SLOT_START_KEY: start_datetime.strftime(constants.DATETIME_FORMAT),
+                constants.SLOT_END_KEY: end_datetime.strftime(constants.DATETIME_FORMAT)
+            }
+            raise NoAvailableSlotsInCacheException(f"Requested time slot {requested_slot} is not available")
+        check_booking_constraints(calendar, start_datetime, end_datetime, exclude=appointment)
+        if reschedule_appointment_request.check_invitee and has_invitee_conflict(
+                appointment.invitee, start_datetime, end_datetime, exclude_id=appointment.appointment_id):
+            raise InviteeDoubleBookedException(
+                f"Invitee {appointment.invitee} already has an appointment from {start_datetime} to {end_datetime}"
+            )
+        old_start, old_end = appointment.start_time, appointment.end_time
+        calendar.move_appointment(appointment.appointment_id, start_datetime, end_datetime)
+        release_cached_slots(owner, calendar, old_start, old_end)
+        remove_booked_cached_slots(owner, calendar, start_datetime, end_datetime)
+    return {
+        "message": "Appointment rescheduled successfully",
+        "appointment": appointment.to_dict()
+    }
@@ -0,0 +1,172 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from app.constans import constants
+from app.exceptions.exceptions import NoCalenderFoundException
+from app.models.models import (
+    available_slots_cache,
+    recent_search_counts,
+    recent_search_counts_lock,
+    stale_cache_owners
+)
+from app.services.booking_service import search_single_flight, refresh_slots_cache
+from app.utils.common_utils import get_calendar
+
+
+class CacheWarmer:
+    """
+    Precomputes slot cache entries for the next days of hot owners on a background thread pool.
+
+    Owners are hot when flagged in the configuration or when they received at least
+    hot_threshold searches since the previous run. Owners whose availability changed are
+    refreshed on the next poll. Warming goes through the same single-flight as foreground
+    searches and backs off while foreground requests are in progress.
+    """
+
+    def __init__(self, days_ahead: int = constants.CACHE_WARMER_DAYS,
+                 workers: int = constants.CACHE_WARMER_WORKERS,
+                 interval_seconds: float = constants.CACHE_WARMER_INTERVAL_SECONDS,
+                 poll_seconds: float = constants.CACHE_WARMER_POLL_SECONDS,
+                 hot_owners: Optional[Iterable[str]] = None,
+                 hot_threshold: int = constants.CACHE_WARMER_HOT_THRESHOLD,
+                 max_cached_days: int = constants.SLOT_CACHE_MAX_DAYS):
+        self.days_ahead = days_ahead
+        self.workers = workers
+        self.interval_seconds = interval_seconds
+        self.poll_seconds = poll_seconds
+        self.hot_owners = set(hot_owners or [])
+        self.hot_threshold = hot_threshold
+        self.max_cached_days = max_cached_days
+        self.foreground_requests = 0
+        self._foreground_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="cache-warmer")
+        self._thread = threading.Thread(target=self._run, name="cache-warmer-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def foreground_started(self):
+        with self._foreground_lock:
+            self.foreground_requests += 1
+
+    def foreground_finished(self):
+        with self._foreground_lock:
+            self.foreground_requests -= 1
+
+    def _run(self):
+        next_warm = time.monotonic()
+        while not self._stop_event.is_set():
+            owners = self.take_stale_owners()
+            if owners:
+                self._submit(owners, refresh=True)
+            if time.monotonic() >= next_warm:
+                self._submit(self.take_hot_owners(), refresh=False)
+                next_warm = time.monotonic() + self.interval_seconds
+            self._stop_event.wait(self.poll_seconds)
+
+    def _submit(self, owners: List[str], refresh: bool):
+        for owner in owners:
+            self._executor.submit(self.warm_owner, owner, refresh)
+
+    def take_hot_owners(self) -> List[str]:
+        """
+        Return the flagged owners plus those searched often since the last call, and reset the counts.
+        """
+        with recent_search_counts_lock:
+            counts = dict(recent_search_counts)
+            recent_search_counts.clear()
+        detected = {owner for owner, hits in counts.items() if hits >= self.hot_threshold}
+        return sorted(self.hot_owners | detected)
+
+    @staticmethod
+    def take_stale_owners() -> List[str]:
+        owners = []
+        while stale_cache_owners:
+            try:
+                owners.append(stale_cache_owners.pop())
+            except KeyError:
+                break
+        return owners
+
+    def warm_owner(self, owner: str, refresh: bool = False) -> int:
+        """
+        Fill the slot cache for the owner's next days_ahead days.
+
+        Args:
+            owner (str): The calendar owner.
+            refresh (bool): Regenerate days that are already cached, e.g. after availability changes.
+
+        Returns:
+            int: Number of days generated.
+        """
+        try:
+            owner_calendar = get_calendar(owner)
+        except NoCalenderFoundException:
+            return 0
+        today = datetime.combine(datetime.now().date(), datetime.min.time())
+        cached_days = sum(len(owner_cache) for owner_cache in list(available_slots_cache.values()))
+        warmed = 0
+        for offset in range(self.days_ahead):
+            if self._stop_event.is_set():
+                break
+            requested_date = today + timedelta(days=offset)
+            date_key = requested_date.strftime(constants.DATE_FORMAT)
+            cached = date_key in available_slots_cache.get(owner, {})
+            if cached and not refresh:
+                continue
+            if not cached and cached_days >= self.max_cached_days:
+                print(f"slot cache is full, skipping warm-up for {owner} on {date_key}")
+                break
+            self._yield_to_foreground()
+            search_single_flight.do(
+                (owner, date_key),
+                lambda: refresh_slots_cache(owner, date_key, requested_date, owner_calendar)
+            )
+            if not cached:
+                cached_days += 1
+            warmed += 1
+        return warmed
+
+    def _yield_to_foreground(self):
+        for _ in range(constants.CACHE_WARMER_MAX_YIELDS):
+            if self.foreground_requests <= 0 or self._stop_event.is_set():
+                return
+            time.sleep(constants.CACHE_WARMER_YIELD_SECONDS)
+
+
+# Process-wide warmer, started from create_app when enabled
+cache_warmer: Optional[CacheWarmer] = None
+
+
+def start_cache_warmer(**settings) -> CacheWarmer:
+    global cache_warmer
+    if cache_warmer is not None:
+        cache_warmer.stop()
+    cache_warmer = CacheWarmer(**settings)
+    cache_warmer.start()
+    return cache_warmer
+
+
+def stop_cache_warmer():
+    global cache_warmer
+    if cache_warmer is not None:
+        cache_warmer.stop()
+        cache_warmer = None
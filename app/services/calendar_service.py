@@ -1,17 +1,37 @@
-from datetime import datetime
+from datetime import date, datetime
+from typing import Optional
 
 from app.constans import constants
-from app.models.models import calendars, Calendar, AvailabilityRule
+from app.models.models import (
+    calendars,
+    holiday_calendars,
+    Calendar,
+    AvailabilityRule,
+    HolidayCalendar,
+    RuleTemplate,
+    intern_rule,
+    rule_templates,
+    slot_cache_lock,
+    stale_cache_owners
+)
 import json
 
+from app.exceptions.exceptions import NoCalenderFoundException
+from app.models.blackout_request import BlackoutRequest
+from app.models.booking_constraints_request import BookingConstraintsRequest
 from app.models.set_availability_request import SetAvailabilityRequest
-from app.utils.calendar_service_utils import is_rules_overlapping
+from app.utils.booking_service_utils import drop_cached_slots, remove_blacked_out_cached_slots
+from app.utils.calendar_service_utils import check_rules_not_overlapping, coalesce_rules, get_calendar_rules
+from app.utils.timezone_utils import get_zone
+from app.utils.tracing_utils import traced
 
 
+@traced()
 def set_availability(owner: str, set_availability_request: SetAvailabilityRequest):
     """
     Set availability for a specific Calendar Owner with a date range.
-    Checks for overlapping availability rules before setting.
+    Checks for overlapping availability rules before setting, then merges rules with the same
+    hours whose date ranges touch, keeping the rule list minimal.
 
     Args:
         owner (str): The calendar owner
@@ -28,29 +48,8 @@ def set_availability(owner: str, set_availability_request: SetAvailabilityReques
         calendar = Calendar(owner=owner)
         calendars[owner] = calendar
 
-    # Check each new rule against existing rules and other new rules
-    for new_rule in set_availability_request.availability_rules:
-        # Check against existing rules
-        if calendar.availability_rules:
-            for existing_rule in calendar.availability_rules:
-                if is_rules_overlapping(new_rule, existing_rule):
-                    raise ValueError(
-                        f"New availability rule ({new_rule.start_date} to {new_rule.end_date}, "
-                        f"{new_rule.start_time} - {new_rule.end_time}) overlaps with existing rule "
-                        f"({existing_rule.start_date.date()} to {existing_rule.end_date.date()}, "
-                        f"{existing_rule.start_time} - {existing_rule.end_time})"
-                    )
-
-        # Check against other new rules
-        for other_rule in set_availability_request.availability_rules:
-            if new_rule != other_rule and is_rules_overlapping(new_rule, other_rule):
-                raise ValueError(
-                    f"Overlapping rules in request: "
-                    f"({new_rule.start_date} to {new_rule.end_date}, "
-                    f"{new_rule.start_time} - {new_rule.end_time}) overlaps with "
-                    f"({other_rule.start_date} to {other_rule.end_date}, "
-                    f"{other_rule.start_time} - {other_rule.end_time})"
-                )
+    # Check each new rule against existing rules, including those of rule templates, and other new rules
+    check_rules_not_overlapping(set_availability_request.availability_rules, get_calendar_rules(calendar))
 
     # If no overlaps found, add all new rules
     for availability_rule in set_availability_request.availability_rules:
@@ -58,9 +57,16 @@ def set_availability(owner: str, set_availability_request: SetAvailabilityReques
             start_time=availability_rule.start_time,
             end_time=availability_rule.end_time,
             start_date=availability_rule.start_date,
-            end_date=availability_rule.end_date
+            end_date=availability_rule.end_date,
+            weekday_mask=availability_rule.weekday_mask,
+            interval_weeks=availability_rule.interval_weeks,
+            exception_dates=availability_rule.exception_dates,
+            capacity=availability_rule.capacity
         )
         calendar.availability_rules.append(availability)
+    calendar.availability_rules[:] = coalesce_rules(calendar.availability_rules)
+    # Cached slots no longer reflect the rules, the cache warmer regenerates them for hot owners
+    refresh_owner_availability(owner)
 
     return {
         "message": f"Availability set for {owner}",
@@ -70,12 +76,14 @@ def set_availability(owner: str, set_availability_request: SetAvailabilityReques
     }
 
 
-def list_upcoming_appointments_for_owner(owner: str):
+@traced()
+def list_upcoming_appointments_for_owner(owner: str, until: Optional[date] = None):
     """
     Retrieve all upcoming appointments for a calendar owner.
 
     Args:
         owner (str): The calendar owner
+        until (date, optional): Last day to list, recurring appointments are only expanded up to it
 
     Returns:
         list: List of upcoming appointments
@@ -83,7 +91,224 @@ def list_upcoming_appointments_for_owner(owner: str):
     owner_calendar = calendars.get(owner)
     if not owner_calendar:
         return []
-    upcoming_appointments = owner_calendar.get_upcoming_appointments()
+    upcoming_appointments = owner_calendar.get_upcoming_appointments(until)
     upcoming_appointments.sort(key=lambda x: datetime.strptime(x['start_time'], constants.DATETIME_FORMAT))
 
     return upcoming_appointments
+
+
+@traced()
+def add_blackouts(owner: str, blackout_request: BlackoutRequest):
+    """
+    Block intervals inside an owner's availability, such as a holiday or one afternoon.
+
+    Args:
+        owner (str): The calendar owner
+        blackout_request (BlackoutRequest): The intervals to block
+
+    Returns:
+        dict: Response containing success message and the owner's blackouts
+
+    Raises:
+        NoCalenderFoundException: If the owner has no calendar
+    """
+    calendar = calendars.get(owner)
+    if not calendar:
+        raise NoCalenderFoundException(f"Calendar not found for owner: {owner}")
+    with slot_cache_lock:
+        for start_time, end_time in blackout_request.blackouts:
+            calendar.blackouts.add(start_time, end_time)
+            remove_blacked_out_cached_slots(owner, start_time, end_time)
+        calendar.utilization.clear()
+        calendar.bump_version()
+    return {
+        "message": f"Blackouts set for {owner}",
+        "blackouts": format_blackouts(calendar.blackouts.intervals)
+    }
+
+
+@traced()
+def set_booking_constraints(owner: str, booking_constraints_request: BookingConstraintsRequest):
+    """
+    Set the buffer times, minimum notice and daily appointment limit of an owner's calendar.
+    Cached slots were filtered with the old constraints, so they are dropped.
+
+    Raises:
+        NoCalenderFoundException: If the owner has no calendar
+    """
+    calendar = calendars.get(owner)
+    if not calendar:
+        raise NoCalenderFoundException(f"Calendar not found for owner: {owner}")
+    with slot_cache_lock:
+        calendar.buffer_before = booking_constraints_request.buffer_before
+        calendar.buffer_after = booking_constraints_request.buffer_after
+        calendar.min_notice = booking_constraints_request.min_notice
+        calendar.max_per_day = booking_constraints_request.max_per_day
+        refresh_owner_availability(owner)
+    return {
+        "message": f"Booking constraints set for {owner}",
+        "constraints": format_booking_constraints(calendar)
+    }
+
+
+@traced()
+def set_timezone(owner: str, zone_name: Optional[str]):
+    """
+    Set the IANA timezone an owner's availability rules are evaluated in, or clear it with None.
+    Appointments, holds and blackouts keep their stored times, which are read as UTC once a
+    timezone is set. Recurring series repeat at the wall time of their first occurrence in the
+    new timezone. Cached slots were generated for the old timezone, so they are dropped.
+
+    Raises:
+        NoCalenderFoundException: If the owner has no calendar
+        ValueError: If the timezone is unknown
+    """
+    calendar = calendars.get(owner)
+    if not calendar:
+        raise NoCalenderFoundException(f"Calendar not found for owner: {owner}")
+    if zone_name is not None:
+        get_zone(zone_name)
+    with slot_cache_lock:
+        calendar.timezone = zone_name
+        for series in calendar.recurring_appointments.values():
+            series.timezone = zone_name
+        refresh_owner_availability(owner)
+    return {"message": f"Timezone set for {owner}", "timezone": calendar.timezone}
+
+
+@traced()
+def add_holiday_blackouts(name: str, blackout_request: BlackoutRequest):
+    """
+    Add blackouts to a shared holiday calendar, creating it if needed. Every owner referencing
+    the holiday calendar sees them without a copy being made.
+    """
+    holiday_calendar = holiday_calendars.setdefault(name, HolidayCalendar(name=name))
+    with slot_cache_lock:
+        for start_time, end_time in blackout_request.blackouts:
+            holiday_calendar.blackouts.add(start_time, end_time)
+            for owner in holiday_calendar.subscribers:
+                remove_blacked_out_cached_slots(owner, start_time, end_time)
+        for owner in holiday_calendar.subscribers:
+            if owner in calendars:
+                calendars[owner].utilization.clear()
+                calendars[owner].bump_version()
+    return {
+        "message": f"Blackouts set for holiday calendar {name}",
+        "blackouts": format_blackouts(holiday_calendar.blackouts.intervals)
+    }
+
+
+@traced()
+def subscribe_holiday_calendar(owner: str, name: str):
+    """
+    Make an owner's calendar reference a shared holiday calendar.
+
+    Raises:
+        NoCalenderFoundException: If the owner or the holiday calendar does not exist
+    """
+    calendar = calendars.get(owner)
+    holiday_calendar = holiday_calendars.get(name)
+    if not calendar or not holiday_calendar:
+        raise NoCalenderFoundException(f"Calendar not found for owner {owner} or holiday calendar {name}")
+    with slot_cache_lock:
+        if name not in calendar.holiday_calendar_names:
+            calendar.holiday_calendar_names.append(name)
+            holiday_calendar.subscribers.add(owner)
+            for start_time, end_time in holiday_calendar.blackouts.intervals:
+                remove_blacked_out_cached_slots(owner, start_time, end_time)
+            calendar.utilization.clear()
+            calendar.bump_version()
+    return {"message": f"{owner} uses holiday calendar {name}"}
+
+
+@traced()
+def set_rule_template(name: str, set_availability_request: SetAvailabilityRequest):
+    """
+    Create or replace a named rule template shared by calendars.
+
+    Rules equal to a rule of another template are stored once. Replacing the rules changes
+    the template version, so slots cached for the old rules are no longer used, and the cached
+    slots of every owner using the template are dropped.
+
+    Raises:
+        ValueError: If the template's rules overlap each other or the rules of a calendar using it
+    """
+    new_rules = set_availability_request.availability_rules
+    check_rules_not_overlapping(new_rules, [])
+    template = rule_templates.get(name)
+    if template is not None:
+        for owner in template.subscribers:
+            calendar = calendars.get(owner)
+            if calendar:
+                other_rules = [
+                    rule for rule in get_calendar_rules(calendar)
+                    if not any(rule is template_rule for template_rule in template.availability_rules)
+                ]
+                check_rules_not_overlapping(new_rules, other_rules)
+    else:
+        template = rule_templates.setdefault(name, RuleTemplate(name=name))
+
+    template.availability_rules = [intern_rule(rule) for rule in coalesce_rules(new_rules)]
+    template.version += 1
+    for owner in template.subscribers:
+        refresh_owner_availability(owner)
+    return {
+        "message": f"Rule template {name} set",
+        "availability_rules": [rule.to_dict() for rule in template.availability_rules]
+    }
+
+
+@traced()
+def subscribe_rule_template(owner: str, name: str):
+    """
+    Make an owner's calendar use a rule template, creating the calendar if needed.
+
+    Raises:
+        NoCalenderFoundException: If the template does not exist
+        ValueError: If the template's rules overlap the calendar's rules
+    """
+    template = rule_templates.get(name)
+    if template is None:
+        raise NoCalenderFoundException(f"Rule template not found: {name}")
+    calendar = calendars.get(owner)
+    if not calendar:
+        calendar = Calendar(owner=owner)
+        calendars[owner] = calendar
+    if name not in calendar.rule_template_names:
+        check_rules_not_overlapping(template.availability_rules, get_calendar_rules(calendar))
+        calendar.rule_template_names.append(name)
+        template.subscribers.add(owner)
+        refresh_owner_availability(owner)
+    return {"message": f"{owner} uses rule template {name}"}
+
+
+def refresh_owner_availability(owner: str):
+    """
+    Drop an owner's cached slots and utilization after their rules changed and let the cache
+    warmer rebuild the slots.
+    """
+    calendar = calendars.get(owner)
+    if calendar:
+        calendar.utilization.clear()
+        calendar.bump_version()
+    drop_cached_slots(owner)
+    stale_cache_owners.add(owner)
+
+
+def format_blackouts(intervals) -> list:
+    return [
+        {
+            "start_time": start_time.strftime(constants.DATETIME_FORMAT),
+            "end_time": end_time.strftime(constants.DATETIME_FORMAT)
+        }
+        for start_time, end_time in intervals
+    ]
+
+
+def format_booking_constraints(calendar: Calendar) -> dict:
+    return {
+        "buffer_before": int(calendar.buffer_before.total_seconds() // 60),
+        "buffer_after": int(calendar.buffer_after.total_seconds() // 60),
+        "min_notice": int(calendar.min_notice.total_seconds() // 60),
+        "max_per_day": calendar.max_per_day
+    }
@@ -0,0 +1,105 @@
+import heapq
+import threading
+from datetime import date, datetime
+from typing import Dict, Optional
+
+from app.constans import constants
+from app.models.models import calendars, expiry_heap, expiry_heap_lock, slot_cache_lock
+from app.utils.booking_service_utils import drop_cached_slots
+
+
+def sweep_expired(today: Optional[date] = None) -> Dict[str, int]:
+    """
+    Drop slot cache entries and ended recurring appointments, and archive appointment days
+    dated before today.
+
+    Pops entries off the expiry heap in date order and stops at the first one that is not
+    past yet, so each run only touches what actually expired.
+
+    Args:
+        today (date, optional): Current date. Defaults to today.
+
+    Returns:
+        dict: Number of cache entries dropped, appointments archived and recurring appointments ended.
+    """
+    today = today or datetime.now().date()
+    expired_cache_entries = 0
+    archived_appointments = 0
+    ended_recurring_appointments = 0
+    while True:
+        with expiry_heap_lock:
+            if not expiry_heap or expiry_heap[0][0] >= today:
+                break
+            expiry_date, kind, owner, key = heapq.heappop(expiry_heap)
+
+        if kind == constants.EXPIRY_KIND_SLOT_CACHE:
+            expired_cache_entries += drop_cached_slots(owner, key)
+        elif kind == constants.EXPIRY_KIND_APPOINTMENTS:
+            calendar = calendars.get(owner)
+            if calendar:
+                # Bookings change the same per-day lists, seat counts and indexes under the lock
+                with slot_cache_lock:
+                    archived_appointments += calendar.archive_day(expiry_date)
+        elif kind == constants.EXPIRY_KIND_RECURRING_APPOINTMENT:
+            calendar = calendars.get(owner)
+            if not calendar:
+                continue
+            with slot_cache_lock:
+                series = calendar.recurring_appointments.get(key)
+                # The series may have been cancelled already
+                if series is not None and series.until is not None and series.until < today:
+                    calendar.remove_recurring_appointment(key, archive_before=calendar.day_bounds(today)[0])
+                    ended_recurring_appointments += 1
+
+    return {
+        "expired_cache_entries": expired_cache_entries,
+        "archived_appointments": archived_appointments,
+        "ended_recurring_appointments": ended_recurring_appointments
+    }
+
+
+class ExpirySweeper:
+    """Runs sweep_expired periodically on a daemon thread."""
+
+    def __init__(self, interval_seconds: float = constants.EXPIRY_SWEEP_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="expiry-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            result = sweep_expired()
+            print(f"expiry sweep: {result}")
+
+
+# Process-wide sweeper, started from create_app when enabled
+expiry_sweeper: Optional[ExpirySweeper] = None
+
+
+def start_expiry_sweeper(interval_seconds: float) -> ExpirySweeper:
+    global expiry_sweeper
+    if expiry_sweeper is not None:
+        expiry_sweeper.stop()
+    expiry_sweeper = ExpirySweeper(interval_seconds)
+    expiry_sweeper.start()
+    return expiry_sweeper
+
+
+def stop_expiry_sweeper():
+    global expiry_sweeper
+    if expiry_sweeper is not None:
+        expiry_sweeper.stop()
+        expiry_sweeper = None
@@ -0,0 +1,91 @@
+import heapq
+import threading
+from datetime import datetime
+from typing import Optional
+
+from app.constans import constants
+from app.models.models import calendars, hold_heap, hold_heap_lock, slot_cache_lock
+from app.utils.booking_service_utils import release_cached_slots
+
+
+def reap_expired_holds(now: Optional[datetime] = None) -> int:
+    """
+    Release holds that expired and put their slots back into the slot cache.
+
+    Pops entries off the hold heap in expiry order and stops at the first one that has not
+    expired, so each run costs O(log n) per expired hold. Entries of holds that were already
+    confirmed or released are skipped.
+
+    Args:
+        now (datetime, optional): Current time. Defaults to now.
+
+    Returns:
+        int: Number of holds released.
+    """
+    now = now or datetime.now()
+    released = 0
+    while True:
+        with hold_heap_lock:
+            if not hold_heap or hold_heap[0][0] > now:
+                break
+            _, owner, hold_id = heapq.heappop(hold_heap)
+
+        calendar = calendars.get(owner)
+        if not calendar:
+            continue
+        with slot_cache_lock:
+            hold = calendar.holds.get(hold_id)
+            if hold is None or hold.is_active(now):
+                continue
+            calendar.remove_hold(hold_id)
+            release_cached_slots(owner, calendar, hold.start_time, hold.end_time)
+        released += 1
+    return released
+
+
+class HoldReaper:
+    """Runs reap_expired_holds periodically on a daemon thread."""
+
+    def __init__(self, interval_seconds: float = constants.HOLD_REAP_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="hold-reaper", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            released = reap_expired_holds()
+            if released:
+                print(f"hold reaper released {released} holds")
+
+
+# Process-wide reaper, started from create_app when enabled
+hold_reaper: Optional[HoldReaper] = None
+
+
+def start_hold_reaper(interval_seconds: float) -> HoldReaper:
+    global hold_reaper
+    if hold_reaper is not None:
+        hold_reaper.stop()
+    hold_reaper = HoldReaper(interval_seconds)
+    hold_reaper.start()
+    return hold_reaper
+
+
+def stop_hold_reaper():
+    global hold_reaper
+    if hold_reaper is not None:
+        hold_reaper.stop()
+        hold_reaper = None
@@ -0,0 +1,48 @@
+from datetime import datetime
+from typing import List
+
+from app.constans import constants
+from app.models.models import calendars, invitee_index, invitee_series_index, invitee_index_lock
+from app.utils.tracing_utils import traced
+
+
+@traced()
+def list_invitee_appointments(invitee: str, start_datetime: datetime, end_datetime: datetime) -> List[dict]:
+    """
+    List the appointments of an invitee with every owner starting in [start_datetime, end_datetime).
+
+    One-off appointments are read from the invitee index with a binary search, recurring
+    series of the invitee are expanded only within the range.
+
+    Args:
+        invitee (str): The invitee name.
+        start_datetime (datetime): Start of the range.
+        end_datetime (datetime): End of the range, exclusive.
+
+    Returns:
+        list: Appointments sorted by start time, each with its owner.
+    """
+    with invitee_index_lock:
+        invitee_appointments = invitee_index.get(invitee)
+        found = invitee_appointments.starting_between(start_datetime, end_datetime) if invitee_appointments else []
+        series_keys = list(invitee_series_index.get(invitee, ()))
+
+    for owner, series_id in series_keys:
+        calendar = calendars.get(owner)
+        series = calendar.recurring_appointments.get(series_id) if calendar else None
+        if series is None:
+            continue
+        for occurrence in series.occurrences_between(calendar.local_day(start_datetime), calendar.local_day(end_datetime)):
+            if start_datetime <= occurrence.start_time < end_datetime:
+                found.append((occurrence.start_time, occurrence.end_time, owner, occurrence.appointment_id))
+
+    return [
+        {
+            "appointment_id": appointment_id,
+            "owner": owner,
+            "invitee": invitee,
+            "start_time": start_time.strftime(constants.DATETIME_FORMAT),
+            "end_time": end_time.strftime(constants.DATETIME_FORMAT)
+        }
+        for start_time, end_time, owner, appointment_id in sorted(found)
+    ]
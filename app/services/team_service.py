@@ -0,0 +1,126 @@
+import heapq
+from datetime import datetime, timedelta
+from typing import List
+
+from app.constans import constants
+from app.exceptions.exceptions import NoAvailableSlotsInCacheException, NoCalenderFoundException
+from app.models.book_team_slot_request import BookTeamSlotRequest
+from app.models.book_time_slot_request import BookTimeSlotRequest
+from app.models.models import Calendar, Team, calendars, slot_cache_lock, teams
+from app.services.booking_service import book_time_slot, get_daily_slots
+from app.utils.booking_service_utils import find_cached_slot
+from app.utils.common_utils import get_booking_violation
+from app.utils.tracing_utils import traced
+
+
+@traced()
+def set_team(name: str, members: List[str]) -> dict:
+    """
+    Create or replace a team pooling the availability of its members.
+
+    Raises:
+        ValueError: If members is not a non-empty list of owner names.
+    """
+    if not isinstance(members, list) or not members or not all(isinstance(m, str) and m for m in members):
+        raise ValueError("members must be a non-empty list of owner names.")
+    with slot_cache_lock:
+        # Keep the given order without duplicates, it breaks ties between equally loaded members
+        teams[name] = Team(name=name, members=list(dict.fromkeys(members)))
+    return {"message": f"Team {name} set", "members": teams[name].members}
+
+
+def get_team_calendars(name: str) -> List[Calendar]:
+    """
+    Return the calendars of a team's members, skipping members without a calendar.
+
+    Raises:
+        NoCalenderFoundException: If the team does not exist.
+    """
+    team = teams.get(name)
+    if team is None:
+        raise NoCalenderFoundException(f"Team not found: {name}")
+    return [calendars[member] for member in team.members if member in calendars]
+
+
+@traced()
+def search_team_slots(name: str, requested_date) -> dict:
+    """
+    Search the slots at least one team member is free for, with the number of free members.
+
+    Each member's cached slot list is already sorted, so the lists are combined with a k-way
+    merge and equal slots of different members are counted in one pass.
+    """
+    member_calendars = get_team_calendars(name)
+    # Generate uncached days before taking the lock, slot generation takes it itself
+    member_slots = [get_daily_slots(calendar.owner, requested_date, calendar) for calendar in member_calendars]
+    with slot_cache_lock:
+        # Copy under the lock so a booking cannot change a list while it is merged
+        member_slots = [list(slots) for slots in member_slots]
+    team_slots = []
+    merged = heapq.merge(*member_slots, key=lambda slot: (slot[constants.SLOT_START_KEY], slot[constants.SLOT_END_KEY]))
+    for slot in merged:
+        if (team_slots and team_slots[-1][constants.SLOT_START_KEY] == slot[constants.SLOT_START_KEY]
+                and team_slots[-1][constants.SLOT_END_KEY] == slot[constants.SLOT_END_KEY]):
+            team_slots[-1][constants.TEAM_FREE_MEMBERS_KEY] += 1
+            continue
+        team_slots.append({
+            constants.SLOT_START_KEY: slot[constants.SLOT_START_KEY],
+            constants.SLOT_END_KEY: slot[constants.SLOT_END_KEY],
+            constants.TEAM_FREE_MEMBERS_KEY: 1
+        })
+    return {"available_slots": team_slots}
+
+
+@traced()
+def book_team_slot(book_team_slot_request: BookTeamSlotRequest) -> dict:
+    """
+    Book a slot with the least-loaded team member who is free for it.
+
+    A member's load is the number of appointments and recurring occurrences in the days around
+    the slot, see get_member_load. Ties go to the member listed first. Choosing the member and
+    booking happen under the slot cache lock, so concurrent team bookings never give the same
+    member's slot to two invitees.
+
+    Raises:
+        NoCalenderFoundException: If the team does not exist.
+        NoAvailableSlotsInCacheException: If no member is free for the slot.
+    """
+    start_datetime = book_team_slot_request.start_time
+    end_datetime = book_team_slot_request.end_time
+    member_calendars = get_team_calendars(book_team_slot_request.team)
+    for calendar in member_calendars:
+        get_daily_slots(calendar.owner, start_datetime, calendar)
+    with slot_cache_lock:
+        now = datetime.now()
+        free_members = [
+            calendar for calendar in member_calendars
+            if find_cached_slot(calendar, start_datetime, end_datetime) is not None
+            and get_booking_violation(start_datetime, end_datetime, calendar, now) is None
+        ]
+        if not free_members:
+            raise NoAvailableSlotsInCacheException(
+                f"No member of team {book_team_slot_request.team} is free from {start_datetime} to {end_datetime}"
+            )
+        member = min(free_members, key=lambda calendar: get_member_load(calendar, start_datetime))
+        result = book_time_slot(BookTimeSlotRequest(
+            owner=member.owner,
+            invitee=book_team_slot_request.invitee,
+            start_time=start_datetime,
+            end_time=end_datetime,
+            check_invitee=book_team_slot_request.check_invitee
+        ))
+    result["team"] = book_team_slot_request.team
+    return result
+
+
+def get_member_load(calendar: Calendar, start_datetime: datetime) -> int:
+    """
+    Count a member's appointments and recurring occurrences starting within TEAM_LOAD_DAYS days
+    either side of the owner's day of start_datetime. Only the per-day lists of those days and
+    the occurrences falling on them are looked at, so bookings far in the past or future and
+    ended series do not weigh on the choice.
+    """
+    day = calendar.local_day(start_datetime)
+    window_start, _ = calendar.day_bounds(day - timedelta(days=constants.TEAM_LOAD_DAYS))
+    _, window_end = calendar.day_bounds(day + timedelta(days=constants.TEAM_LOAD_DAYS))
+    return len(calendar.appointments_between(window_start, window_end))
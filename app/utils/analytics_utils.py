@@ -0,0 +1,65 @@
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import List, Optional, Sequence
+
+from app.constans import constants
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, organization reports fall back to pure Python prefix sums
+    numpy = None
+
+
+def get_bucket_starts(start_date: date, end_date: date, bucket: str) -> List[date]:
+    """
+    List the first day of every report bucket from start_date to end_date. Weeks start on
+    Monday, the first and last ones are cut at the range ends.
+
+    Raises:
+        ValueError: If the bucket is unknown or the range is reversed or too long.
+    """
+    if bucket not in constants.UTILIZATION_BUCKETS:
+        raise ValueError(f"Invalid bucket: '{bucket}', expected one of {', '.join(constants.UTILIZATION_BUCKETS)}.")
+    days = (end_date - start_date).days + 1
+    if days <= 0:
+        raise ValueError("end must not be before start.")
+    if days > constants.UTILIZATION_MAX_DAYS:
+        raise ValueError(f"Utilization reports cover at most {constants.UTILIZATION_MAX_DAYS} days.")
+    if bucket == "day":
+        return [start_date + timedelta(days=offset) for offset in range(days)]
+    starts = [start_date]
+    monday = start_date + timedelta(days=7 - start_date.weekday())
+    while monday <= end_date:
+        starts.append(monday)
+        monday += timedelta(days=7)
+    return starts
+
+
+def get_bucket_totals(prefix: Sequence[int], boundaries: Sequence[int]) -> List[int]:
+    """
+    Total of each bucket from running totals, bucket i covering the days from boundaries[i]
+    up to boundaries[i + 1].
+    """
+    return [prefix[end] - prefix[start] for start, end in zip(boundaries, boundaries[1:])]
+
+
+def sum_rows_by_bucket(rows: List[List[int]], boundaries: List[int]) -> List[int]:
+    """
+    Total the daily values of many rows, one per owner, per bucket.
+
+    With NumPy the rows are stacked into one matrix and their running totals are taken along
+    the days in a single cumsum, otherwise the rows are added up day by day first.
+    """
+    if not rows:
+        return [0] * (len(boundaries) - 1)
+    if numpy is not None:
+        matrix = numpy.asarray(rows, dtype=numpy.int64)
+        prefix = numpy.zeros((matrix.shape[0], matrix.shape[1] + 1), dtype=numpy.int64)
+        numpy.cumsum(matrix, axis=1, out=prefix[:, 1:])
+        totals = prefix[:, boundaries[1:]] - prefix[:, boundaries[:-1]]
+        return [int(total) for total in totals.sum(axis=0)]
+    return get_bucket_totals(list(accumulate(map(sum, zip(*rows)), initial=0)), boundaries)
+
+
+def get_utilization_ratio(available_minutes: int, booked_minutes: int) -> Optional[float]:
+    return round(booked_minutes / available_minutes, 4) if available_minutes else None
@@ -1,15 +1,39 @@
+import heapq
+from bisect import bisect_left
+from math import gcd
 from datetime import date, datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 
 from app.constans import constants
 from app.exceptions.exceptions import NoAvailableSlotsInCacheException
-from app.models.models import Calendar, available_slots_cache
-from app.utils.common_utils import is_slot_booked
+from app.models.models import (
+    Calendar,
+    FreeGapIndex,
+    RecurringAppointment,
+    AvailabilityRule,
+    available_slots_cache,
+    calendars,
+    holiday_calendars,
+    rule_templates,
+    template_slots_cache,
+    template_slots_lock,
+    encoded_slots_cache,
+    free_gaps_cache,
+    schedule_expiry,
+    slot_cache_lock
+)
+from app.utils.common_utils import get_booking_violation, get_slot_capacity
+from app.utils.datetime_utils import to_date
+from app.utils.timezone_utils import local_to_utc
+from app.utils.tracing_utils import traced
+from app.utils.wire_format_utils import compact_slots, encode_payload
 
 
+@traced()
 def generate_daily_available_slots(current_date: date, calendar: Calendar) -> List[Dict[str, str]]:
     """
-    Generate 60-minute slots for a single day based on availability rules.
+    Generate 60-minute slots for a single day based on availability rules, keeping the ones the
+    calendar's booking constraints allow.
 
     Args:
         current_date (date): The date for which to generate slots.
@@ -20,30 +44,133 @@ def generate_daily_available_slots(current_date: date, calendar: Calendar) -> Li
     """
     print(f"generating available slots for user : {calendar.owner}")
     daily_slots = []
+    now = datetime.now()
 
-    for rule in calendar.availability_rules:
-        # Check if the rule applies to the current date
-        if rule.start_date <= current_date <= rule.end_date:
-            start_time = datetime.combine(current_date, rule.start_time)
-            end_time = datetime.combine(current_date, rule.end_time)
+    for start_time, slot_end_time in get_rule_slots(current_date, calendar):
+        # Check the slot against the notice, daily cap, seats, buffered appointments and holds before adding it
+        if get_booking_violation(start_time, slot_end_time, calendar, now) is None:
+            daily_slots.append(format_cached_slot(calendar, start_time, slot_end_time, now))
+    print(f"available slots for user : {calendar.owner} : {daily_slots}")
+    return daily_slots
 
-            while start_time + timedelta(hours=1) <= end_time:
-                slot_end_time = start_time + timedelta(hours=1)
 
-                # Format slot start and end times
-                slot = {
-                    constants.SLOT_START_KEY: start_time.strftime(constants.DATETIME_FORMAT),
-                    constants.SLOT_END_KEY: slot_end_time.strftime(constants.DATETIME_FORMAT)
-                }
+def format_cached_slot(calendar: Calendar, start: datetime, end: datetime,
+                       now: Optional[datetime] = None) -> Dict[str, object]:
+    """
+    Format a slot for the cache. Slots of multi-seat rules also carry their remaining seats,
+    computed from the seat counter rather than from the attendee list.
+    """
+    slot = {
+        constants.SLOT_START_KEY: start.strftime(constants.DATETIME_FORMAT),
+        constants.SLOT_END_KEY: end.strftime(constants.DATETIME_FORMAT)
+    }
+    capacity = get_slot_capacity(calendar, start, end)
+    if capacity > 1:
+        slot[constants.SLOT_SEATS_LEFT_KEY] = capacity - calendar.seats_taken(start, end, now)
+    return slot
 
-                # Check if the slot is available before adding it
-                if not is_slot_booked(start_time, slot_end_time, calendar):
-                    daily_slots.append(slot)
 
-                # Move to the next 60-minute slot
-                start_time = slot_end_time
-    print(f"available slots for user : {calendar.owner} : {daily_slots}")
-    return daily_slots
+def get_day_blackouts(current_date: date, calendar: Calendar) -> List[Tuple[datetime, datetime]]:
+    """
+    Return the blackout intervals touching a day, from the calendar and its holiday calendars,
+    sorted by start time.
+    """
+    day_start, day_end = calendar.day_bounds(current_date)
+    sources = [calendar.blackouts.overlapping(day_start, day_end)]
+    for name in calendar.holiday_calendar_names:
+        holiday_calendar = holiday_calendars.get(name)
+        if holiday_calendar is not None:
+            sources.append(holiday_calendar.blackouts.overlapping(day_start, day_end))
+    return list(heapq.merge(*sources))
+
+
+def get_rule_slots(current_date: date, calendar: Calendar, start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> List[Tuple[datetime, datetime]]:
+    """
+    List the 60-minute slots the availability rules and rule templates define on a day, booked or not.
+    Slots inside a blackout of the calendar or of its holiday calendars are left out. For a calendar
+    with a timezone the day is the owner's day and the slots are in UTC.
+
+    Args:
+        current_date (date): The day to list slots for.
+        calendar (Calendar): The calendar containing the availability rules.
+        start (datetime, optional): Only list slots ending after this time.
+        end (datetime, optional): Only list slots starting before this time.
+
+    Returns:
+        List[Tuple[datetime, datetime]]: Slot start and end times in order.
+    """
+    current_date = to_date(current_date)
+    sources = [get_rules_grid(current_date, calendar.availability_rules, calendar.timezone)]
+    sources.extend(get_template_slots(name, current_date, calendar.timezone) for name in calendar.rule_template_names)
+    blackouts = get_day_blackouts(current_date, calendar)
+    blackout_index = 0
+    rule_slots = []
+    for slot_start, slot_end in heapq.merge(*sources):
+        # Merge pass: skip blackouts ending before this slot, then test the next one for overlap
+        while blackout_index < len(blackouts) and blackouts[blackout_index][1] <= slot_start:
+            blackout_index += 1
+        blacked_out = blackout_index < len(blackouts) and blackouts[blackout_index][0] < slot_end
+        if not blacked_out and (start is None or slot_end > start) and (end is None or slot_start < end):
+            rule_slots.append((slot_start, slot_end))
+    return rule_slots
+
+
+def get_rules_grid(current_date: date, availability_rules: List[AvailabilityRule],
+                   zone_name: Optional[str] = None) -> List[Tuple[datetime, datetime]]:
+    """
+    List the 60-minute slots a list of rules defines on a day, in order.
+
+    With a zone, each rule window is evaluated in the zone's wall time and converted to UTC once,
+    then stepped through in UTC. On a day the clocks change the window is an hour shorter or
+    longer and yields one slot less or more, and no slot starts at a skipped wall time.
+    """
+    grid = []
+    # Rules of one day never overlap, so walking them by start time keeps the slots sorted
+    for rule in sorted(availability_rules, key=lambda r: r.start_time):
+        # Check if the rule applies to the current date, including its weekdays and exceptions
+        if not rule.applies_on(current_date):
+            continue
+        slot_start = datetime.combine(current_date, rule.start_time)
+        rule_end = datetime.combine(current_date, rule.end_time)
+        if zone_name is not None:
+            slot_start, rule_end = local_to_utc(slot_start, zone_name), local_to_utc(rule_end, zone_name)
+        while slot_start + timedelta(hours=1) <= rule_end:
+            slot_end = slot_start + timedelta(hours=1)
+            grid.append((slot_start, slot_end))
+            slot_start = slot_end
+    return grid
+
+
+def get_template_slots(name: str, current_date: date,
+                       zone_name: Optional[str] = None) -> Tuple[Tuple[datetime, datetime], ...]:
+    """
+    Return the slots a rule template defines on a day, computed once per template version,
+    date and timezone for all the owners referencing the template.
+    """
+    template = rule_templates.get(name)
+    if template is None:
+        return ()
+    key = (name, template.version, current_date.strftime(constants.DATE_FORMAT), zone_name)
+    with template_slots_lock:
+        slots = template_slots_cache.get(key)
+        if slots is not None:
+            return slots
+    slots = tuple(get_rules_grid(current_date, template.availability_rules, zone_name))
+    with template_slots_lock:
+        template_slots_cache[key] = slots
+        while len(template_slots_cache) > constants.TEMPLATE_SLOT_CACHE_MAX_ENTRIES:
+            # Dicts keep insertion order, so this evicts the oldest entry
+            template_slots_cache.pop(next(iter(template_slots_cache)))
+    return slots
+
+
+def is_rule_slot(calendar: Calendar, start: datetime, end: datetime) -> bool:
+    """
+    Check if start and end match one of the slots defined by the calendar's availability rules.
+    """
+    return (start, end) in get_rule_slots(calendar.local_day(start), calendar, start, end)
+
 
 def check_slots_in_cache(owner: str, date_key: str) -> list:
     """
@@ -54,6 +181,7 @@ def check_slots_in_cache(owner: str, date_key: str) -> list:
         raise NoAvailableSlotsInCacheException(f"No previous slot fetched for owner: {owner} on date {date_key}")
     return available_slots_cache[owner][date_key]
 
+@traced()
 def get_available_slots(owner: str, date_key: str) -> List[Dict[str, str]]:
     """
     Get available slots for a specific owner and date from the cache.
@@ -62,3 +190,372 @@ def get_available_slots(owner: str, date_key: str) -> List[Dict[str, str]]:
         raise NoAvailableSlotsInCacheException(f"No previous slot fetched for owner: {owner} on date {date_key}")
     return available_slots_cache[owner][date_key]
 
+
+def get_date_key(calendar: Calendar, start: datetime) -> str:
+    """
+    Return the cache key of the day a slot starting at start belongs to, the owner's day.
+    """
+    return calendar.local_day(start).strftime(constants.DATE_FORMAT)
+
+
+def find_cached_slot(calendar: Calendar, start: datetime, end: datetime) -> Optional[Dict[str, str]]:
+    """
+    Find a slot in the cached slots of its day with a binary search on the start time.
+    """
+    cached_slots = available_slots_cache.get(calendar.owner, {}).get(get_date_key(calendar, start))
+    if not cached_slots:
+        return None
+    start_key = start.strftime(constants.DATETIME_FORMAT)
+    index = bisect_left(cached_slots, start_key, key=lambda slot: slot[constants.SLOT_START_KEY])
+    if (index < len(cached_slots) and cached_slots[index][constants.SLOT_START_KEY] == start_key and
+            cached_slots[index][constants.SLOT_END_KEY] == end.strftime(constants.DATETIME_FORMAT)):
+        return cached_slots[index]
+    return None
+
+
+def set_cached_slots(owner: str, date_key: str, slots: List[Dict[str, str]]) -> bool:
+    """
+    Store the slots for an owner and date, replacing the entry and its encoded response.
+
+    Returns:
+        bool: True if the date was not cached before.
+    """
+    with slot_cache_lock:
+        available_owner_cache = available_slots_cache.setdefault(owner, {})
+        is_new = date_key not in available_owner_cache
+        available_owner_cache[date_key] = slots
+        encoded_slots_cache.pop((owner, date_key), None)
+        return is_new
+
+
+def drop_cached_slots(owner: str, date_key: Optional[str] = None) -> int:
+    """
+    Remove the cached slots and free gaps of one date, or of every date when date_key is None, for an owner.
+
+    Returns:
+        int: Number of dates removed.
+    """
+    with slot_cache_lock:
+        available_owner_cache = available_slots_cache.get(owner, {})
+        date_keys = get_cached_date_keys(owner) if date_key is None else [date_key]
+        dropped = 0
+        for key in date_keys:
+            encoded_slots_cache.pop((owner, key), None)
+            free_gaps_cache.get(owner, {}).pop(key, None)
+            if available_owner_cache.pop(key, None) is not None:
+                dropped += 1
+        return dropped
+
+
+def remove_cached_slot(owner: str, date_key: str, slot: Dict[str, str]):
+    """
+    Remove a booked slot from the cached slots and free gaps of an owner and date.
+    """
+    with slot_cache_lock:
+        available_slots_cache[owner][date_key].remove(slot)
+        encoded_slots_cache.pop((owner, date_key), None)
+        free_gaps = free_gaps_cache.get(owner, {}).get(date_key)
+        if free_gaps is not None:
+            free_gaps.occupy(
+                datetime.strptime(slot[constants.SLOT_START_KEY], constants.DATETIME_FORMAT),
+                datetime.strptime(slot[constants.SLOT_END_KEY], constants.DATETIME_FORMAT)
+            )
+
+
+def remove_booked_cached_slots(owner: str, calendar: Calendar, start: datetime, end: datetime) -> int:
+    """
+    Remove the cached slots a new appointment or hold makes unbookable: the ones overlapping it
+    or its buffers, or every slot of the day once the daily cap is reached. A multi-seat slot
+    with seats left is kept, with its seat count updated.
+
+    Returns:
+        int: Number of slots removed.
+    """
+    day = calendar.local_day(start)
+    date_key = day.strftime(constants.DATE_FORMAT)
+    day_start, day_end = calendar.day_bounds(day)
+    if calendar.is_day_full(day):
+        return remove_overlapping_cached_slots(owner, day_start, day_end, date_key)
+    with slot_cache_lock:
+        removed = remove_overlapping_cached_slots(
+            owner, max(start - calendar.buffer_before, day_start), min(end + calendar.buffer_after, day_end), date_key
+        )
+        # A multi-seat slot stays offered with one seat less until its counter reaches the capacity
+        if get_slot_capacity(calendar, start, end) > 1 and get_booking_violation(start, end, calendar) is None:
+            removed -= put_cached_slot(owner, calendar, start, end)
+        return removed
+
+
+def release_cached_slots(owner: str, calendar: Calendar, start: datetime, end: datetime) -> int:
+    """
+    Put the rule slots overlapping a freed interval or its buffers back into the cached slots of its day.
+
+    Only slots the booking constraints allow again are inserted, at their sorted position. When
+    the release takes the day back under its daily cap, the day's slots are generated again in
+    full. Days that are not cached are left alone, they are generated in full on the next search. The free gaps of
+    the day are dropped and rebuilt by the next gap search, since the freed time has to be merged
+    with the availability windows and the remaining busy intervals.
+
+    Returns:
+        int: Number of slots put back.
+    """
+    day = calendar.local_day(start)
+    date_key = day.strftime(constants.DATE_FORMAT)
+    with slot_cache_lock:
+        free_gaps_cache.get(owner, {}).pop(date_key, None)
+        cached_slots = available_slots_cache.get(owner, {}).get(date_key)
+        if cached_slots is None:
+            return 0
+        if calendar.max_per_day is not None and calendar.count_on(day) == calendar.max_per_day - 1:
+            previous_count = len(cached_slots)
+            cached_slots[:] = generate_daily_available_slots(day, calendar)
+            encoded_slots_cache.pop((owner, date_key), None)
+            return len(cached_slots) - previous_count
+        released = 0
+        now = datetime.now()
+        rule_slots = get_rule_slots(day, calendar, start - calendar.buffer_before, end + calendar.buffer_after)
+        for slot_start, slot_end in rule_slots:
+            if get_booking_violation(slot_start, slot_end, calendar, now) is not None:
+                continue
+            released += put_cached_slot(owner, calendar, slot_start, slot_end, now)
+        encoded_slots_cache.pop((owner, date_key), None)
+        return released
+
+
+def put_cached_slot(owner: str, calendar: Calendar, start: datetime, end: datetime,
+                    now: Optional[datetime] = None) -> int:
+    """
+    Insert a slot into the cached slots of its day at its sorted position, or refresh the seat
+    count of the cached entry. Must be called with the slot cache lock held.
+
+    Returns:
+        int: 1 if the slot was inserted, 0 if it was already cached or the day is not cached.
+    """
+    date_key = get_date_key(calendar, start)
+    cached_slots = available_slots_cache.get(owner, {}).get(date_key)
+    if cached_slots is None:
+        return 0
+    slot = format_cached_slot(calendar, start, end, now)
+    encoded_slots_cache.pop((owner, date_key), None)
+    index = bisect_left(cached_slots, slot[constants.SLOT_START_KEY], key=lambda s: s[constants.SLOT_START_KEY])
+    if index < len(cached_slots) and cached_slots[index][constants.SLOT_START_KEY] == slot[constants.SLOT_START_KEY]:
+        cached_slots[index].update(slot)
+        return 0
+    cached_slots.insert(index, slot)
+    return 1
+
+
+def remove_overlapping_cached_slots(owner: str, start: datetime, end: datetime, date_key: Optional[str] = None) -> int:
+    """
+    Remove the cached slots of a day that overlap a newly booked interval, and cut the interval
+    out of the day's free gaps. The day defaults to the date of start.
+
+    Returns:
+        int: Number of slots removed.
+    """
+    date_key = date_key or start.strftime(constants.DATE_FORMAT)
+    start_key = start.strftime(constants.DATETIME_FORMAT)
+    end_key = end.strftime(constants.DATETIME_FORMAT)
+    with slot_cache_lock:
+        free_gaps = free_gaps_cache.get(owner, {}).get(date_key)
+        if free_gaps is not None:
+            free_gaps.occupy(start, end)
+        cached_slots = available_slots_cache.get(owner, {}).get(date_key)
+        if cached_slots is None:
+            return 0
+        # Slot strings share one format, so they compare in time order
+        remaining = [
+            slot for slot in cached_slots
+            if slot[constants.SLOT_END_KEY] <= start_key or slot[constants.SLOT_START_KEY] >= end_key
+        ]
+        removed = len(cached_slots) - len(remaining)
+        cached_slots[:] = remaining
+        encoded_slots_cache.pop((owner, date_key), None)
+        return removed
+
+
+def remove_blacked_out_cached_slots(owner: str, start: datetime, end: datetime) -> int:
+    """
+    Remove the cached slots overlapping a new blackout, which may span several days.
+    Only days already in the cache are visited.
+
+    Returns:
+        int: Number of slots removed.
+    """
+    removed = 0
+    calendar = calendars.get(owner)
+    with slot_cache_lock:
+        for date_key in get_cached_date_keys(owner):
+            day = datetime.strptime(date_key, constants.DATE_FORMAT)
+            day_start, day_end = calendar.day_bounds(day) if calendar else (day, day + timedelta(days=1))
+            if start < day_end and day_start < end:
+                removed += remove_overlapping_cached_slots(owner, max(start, day_start), min(end, day_end), date_key)
+    return removed
+
+
+def get_cached_date_keys(owner: str) -> List[str]:
+    """
+    List the dates of an owner that have cached slots or free gaps.
+    """
+    return sorted(set(available_slots_cache.get(owner, {})) | set(free_gaps_cache.get(owner, {})))
+
+
+def build_free_gap_index(current_date: date, calendar: Calendar) -> FreeGapIndex:
+    """
+    Build the free gaps of a day: the windows covered by consecutive rule slots, minus
+    appointments, recurring occurrences and active holds inflated by the calendar's buffers.
+    """
+    current_date = to_date(current_date)
+    free_gaps = FreeGapIndex()
+    window_start = window_end = None
+    for slot_start, slot_end in get_rule_slots(current_date, calendar):
+        if slot_start != window_end:
+            if window_start is not None:
+                free_gaps.add(window_start, window_end)
+            window_start = slot_start
+        window_end = slot_end
+    if window_start is not None:
+        free_gaps.add(window_start, window_end)
+
+    day_start, day_end = calendar.day_bounds(current_date)
+    busy = [(start_time, end_time) for start_time, end_time, _ in calendar.appointments_between(day_start, day_end)]
+    now = datetime.now()
+    busy.extend(
+        (hold.start_time, hold.end_time)
+        for hold in calendar.holds.values() if hold.is_active(now) and day_start <= hold.start_time < day_end
+    )
+    for busy_start, busy_end in busy:
+        free_gaps.occupy(busy_start - calendar.buffer_before, busy_end + calendar.buffer_after)
+    return free_gaps
+
+
+def get_free_gaps(owner: str, current_date: date, calendar: Calendar) -> FreeGapIndex:
+    """
+    Return the free-gap index of a day, building and caching it on first use. Bookings and holds
+    then update it in place under the slot cache lock.
+    """
+    date_key = current_date.strftime(constants.DATE_FORMAT)
+    with slot_cache_lock:
+        free_gaps = free_gaps_cache.get(owner, {}).get(date_key)
+        if free_gaps is None:
+            free_gaps = build_free_gap_index(current_date, calendar)
+            free_gaps_cache.setdefault(owner, {})[date_key] = free_gaps
+            schedule_expiry(to_date(current_date), constants.EXPIRY_KIND_SLOT_CACHE, owner, date_key)
+        return free_gaps
+
+
+def has_recurring_conflict(series: RecurringAppointment, calendar: Calendar) -> bool:
+    """
+    Check if any occurrence of a new series overlaps an appointment or another series of the calendar.
+
+    One-off appointments are checked on the owner's days the series falls on. Another series can only
+    meet it on days that are on both cycles, which repeat every lcm of their steps, so only the first
+    step2 / gcd(step1, step2) cycle days of the new series need checking. Both repeat at a wall time
+    of the owner, so their times of day are compared in wall time. Cancelled occurrences are
+    ignored, so a series conflicting only on cancelled days is still rejected.
+    """
+    series_local_start = series.local_start_time
+    occurrence_length = series.local_end_time - series_local_start
+    for appointments in calendar.appointments.values():
+        for day in {calendar.local_day(a.start_time) for a in appointments}:
+            if series.occurs_on(day):
+                occurrence_start, occurrence_end = series.occurrence_on(day)
+                if any(a.start_time < occurrence_end and occurrence_start < a.end_time for a in appointments):
+                    return True
+
+    for other in calendar.recurring_appointments.values():
+        other_local_start = other.local_start_time
+        other_start = other_local_start.time()
+        other_end = (datetime.combine(date.min, other_start) + (other.local_end_time - other_local_start)).time()
+        series_start = series_local_start.time()
+        series_end = (datetime.combine(date.min, series_start) + occurrence_length).time()
+        if not (series_start < other_end and other_start < series_end):
+            continue
+        day = max(series.first_day, other.first_day)
+        day += timedelta(days=-(day - series.first_day).days % series.step_days)
+        for _ in range(other.step_days // gcd(series.step_days, other.step_days)):
+            if (series.until is not None and day > series.until) or (other.until is not None and day > other.until):
+                break
+            if other.is_on_cycle(day):
+                return True
+            day += timedelta(days=series.step_days)
+    return False
+
+
+def remove_recurring_cached_slots(owner: str, calendar: Calendar, series: RecurringAppointment) -> int:
+    """
+    Remove the slots taken by a new series from the cached days it falls on.
+
+    Returns:
+        int: Number of slots removed.
+    """
+    removed = 0
+    with slot_cache_lock:
+        for date_key in get_cached_date_keys(owner):
+            for start_time, end_time in get_series_occurrences(series, date_key):
+                removed += remove_booked_cached_slots(owner, calendar, start_time, end_time)
+    return removed
+
+
+def release_recurring_cached_slots(owner: str, calendar: Calendar, series: RecurringAppointment) -> int:
+    """
+    Put the slots of a cancelled series back into the cached days it fell on.
+
+    Returns:
+        int: Number of slots put back.
+    """
+    released = 0
+    with slot_cache_lock:
+        for date_key in get_cached_date_keys(owner):
+            for start_time, end_time in get_series_occurrences(series, date_key):
+                released += release_cached_slots(owner, calendar, start_time, end_time)
+    return released
+
+
+def get_series_occurrences(series: RecurringAppointment, date_key: str) -> List[Tuple[datetime, datetime]]:
+    """
+    List the occurrences of a series on an owner's day, at most one.
+    """
+    day = datetime.strptime(date_key, constants.DATE_FORMAT).date()
+    return [series.occurrence_on(day)] if series.occurs_on(day) else []
+
+
+@traced()
+def get_encoded_slots_response(owner: str, date_key: str, response: dict,
+                               media_type: str = constants.JSON_MIMETYPE) -> bytes:
+    """
+    Return the search response serialized for the media type, reusing the encoding stored
+    with the cache entry.
+
+    The encoding is only stored and reused when the response holds the owner's current cached
+    slot list for the date, so it is discarded together with that entry. Range, free-window and
+    notice-filtered responses are built per request and always encoded afresh.
+
+    Args:
+        owner (str): The calendar owner.
+        date_key (str): The searched date in DATE_FORMAT.
+        response (dict): The search response containing "available_slots".
+        media_type (str): JSON, compact JSON or MessagePack media type.
+
+    Returns:
+        bytes: The serialized response.
+    """
+    key = (owner, date_key)
+    slots = response.get("available_slots")
+    is_cached_list = slots is not None and available_slots_cache.get(owner, {}).get(date_key) is slots
+    if is_cached_list:
+        encoded = encoded_slots_cache.get(key, {}).get(media_type)
+        if encoded is not None:
+            return encoded
+    payload = response
+    if media_type == constants.COMPACT_JSON_MIMETYPE and slots is not None:
+        base = datetime.strptime(date_key, constants.DATE_FORMAT)
+        payload = {
+            "base": base.strftime(constants.DATETIME_FORMAT),
+            "available_slots": compact_slots(slots or [], base)
+        }
+    with slot_cache_lock:
+        encoded = encode_payload(payload, media_type)
+        if is_cached_list and available_slots_cache.get(owner, {}).get(date_key) is slots:
+            encoded_slots_cache.setdefault(key, {})[media_type] = encoded
+        return encoded
@@ -1,10 +1,19 @@
-from app.models.models import AvailabilityRule
+from datetime import date, timedelta
+from math import gcd
+from typing import List
+
+from app.models.models import AvailabilityRule, Calendar, rule_templates
+from app.utils.datetime_utils import to_date, week_index, weekdays_between
 
 
 def is_rules_overlapping(rule1: AvailabilityRule, rule2: AvailabilityRule) -> bool:
     """
     Check if two availability rules overlap in both date and time ranges.
 
+    Recurring rules are compared with weekday masks and week arithmetic, without expanding
+    their dates. Exception dates are not considered, so rules that would only meet on
+    excluded days still count as overlapping.
+
     Args:
         rule1 (AvailabilityRule): First rule to compare
         rule2 (AvailabilityRule): Second rule to compare
@@ -27,4 +36,144 @@ def is_rules_overlapping(rule1: AvailabilityRule, rule2: AvailabilityRule) -> bo
             rule2.start_time < rule1.end_time
     )
 
-    return times_overlap
\ No newline at end of file
+    if not times_overlap:
+        return False
+
+    return has_common_day(rule1, rule2)
+
+
+def has_common_day(rule1: AvailabilityRule, rule2: AvailabilityRule) -> bool:
+    """
+    Check if two rules with overlapping date ranges apply on at least one common day.
+    """
+    weekday_mask = rule1.weekday_mask & rule2.weekday_mask
+    if not weekday_mask:
+        return False
+
+    first_day = max(to_date(rule1.start_date), to_date(rule2.start_date))
+    last_day = min(to_date(rule1.end_date), to_date(rule2.end_date))
+    first_week = week_index(first_day)
+    last_week = week_index(last_day)
+
+    # Weeks both rules are active in satisfy w = offset1 (mod interval1) and w = offset2 (mod interval2)
+    interval1, interval2 = rule1.interval_weeks, rule2.interval_weeks
+    offset1, offset2 = week_index(rule1.start_date) % interval1, week_index(rule2.start_date) % interval2
+    step = gcd(interval1, interval2)
+    if (offset1 - offset2) % step:
+        return False
+    week = first_week + (offset1 - first_week) % interval1
+    for _ in range(interval2 // step):
+        if (week - offset2) % interval2 == 0:
+            break
+        week += interval1
+    common_interval = interval1 * interval2 // step
+
+    # Only the first and last weeks can be partial, so a hit comes within a few common weeks
+    while week <= last_week:
+        week_start = first_day + timedelta(days=(week - first_week) * 7 - first_day.weekday())
+        week_days = weekdays_between(max(week_start, first_day), min(week_start + timedelta(days=6), last_day))
+        if week_days & weekday_mask:
+            return True
+        week += common_interval
+    return False
+
+
+def get_calendar_rules(calendar: Calendar) -> List[AvailabilityRule]:
+    """
+    Return the calendar's own availability rules followed by those of its rule templates.
+    """
+    rules = list(calendar.availability_rules)
+    for name in calendar.rule_template_names:
+        template = rule_templates.get(name)
+        if template is not None:
+            rules.extend(template.availability_rules)
+    return rules
+
+
+def check_rules_not_overlapping(new_rules: List[AvailabilityRule], existing_rules: List[AvailabilityRule]):
+    """
+    Check new rules against existing rules and against each other.
+
+    Raises:
+        ValueError: If two rules overlap
+    """
+    for new_rule in new_rules:
+        # Check against existing rules
+        for existing_rule in existing_rules:
+            if is_rules_overlapping(new_rule, existing_rule):
+                raise ValueError(
+                    f"New availability rule ({new_rule.start_date} to {new_rule.end_date}, "
+                    f"{new_rule.start_time} - {new_rule.end_time}) overlaps with existing rule "
+                    f"({existing_rule.start_date.date()} to {existing_rule.end_date.date()}, "
+                    f"{existing_rule.start_time} - {existing_rule.end_time})"
+                )
+
+        # Check against other new rules
+        for other_rule in new_rules:
+            if new_rule != other_rule and is_rules_overlapping(new_rule, other_rule):
+                raise ValueError(
+                    f"Overlapping rules in request: "
+                    f"({new_rule.start_date} to {new_rule.end_date}, "
+                    f"{new_rule.start_time} - {new_rule.end_time}) overlaps with "
+                    f"({other_rule.start_date} to {other_rule.end_date}, "
+                    f"{other_rule.start_time} - {other_rule.end_time})"
+                )
+
+
+def coalesce_rules(rules: List[AvailabilityRule]) -> List[AvailabilityRule]:
+    """
+    Merge rules with the same time window, recurrence and capacity whose date ranges touch or overlap,
+    so the rule list stays minimal.
+
+    Rules repeating every few weeks are only merged when both count their weeks from the same
+    phase, and exception dates are only kept where no other merged rule covers the day, which
+    keeps the days they apply on unchanged. Merged rules are new objects, the given rules are
+    not modified.
+
+    Args:
+        rules (List[AvailabilityRule]): Rules to normalize
+
+    Returns:
+        List[AvailabilityRule]: The canonical rules, ordered by start date and start time
+    """
+    def window(rule: AvailabilityRule) -> tuple:
+        return rule.start_time, rule.end_time, rule.weekday_mask, rule.interval_weeks, rule.capacity
+
+    coalesced = []
+    for rule in sorted(rules, key=lambda r: (window(r), to_date(r.start_date))):
+        last = coalesced[-1] if coalesced else None
+        if (
+                last is not None and window(last) == window(rule) and
+                to_date(rule.start_date) <= to_date(last.end_date) + timedelta(days=1) and
+                (week_index(rule.start_date) - week_index(last.start_date)) % rule.interval_weeks == 0
+        ):
+            coalesced[-1] = AvailabilityRule(
+                start_time=last.start_time,
+                end_time=last.end_time,
+                start_date=last.start_date,
+                end_date=max(last.end_date, rule.end_date, key=to_date),
+                weekday_mask=last.weekday_mask,
+                interval_weeks=last.interval_weeks,
+                exception_dates=merge_exception_dates(last, rule),
+                capacity=last.capacity
+            )
+        else:
+            coalesced.append(rule)
+    coalesced.sort(key=lambda r: (to_date(r.start_date), r.start_time))
+    return coalesced
+
+
+def merge_exception_dates(first: AvailabilityRule, second: AvailabilityRule) -> frozenset:
+    """
+    Exception dates of two merged rules. A day excepted by one rule stays excepted only if it
+    lies in that rule's own date range and the other rule does not cover it, or excepts it too.
+    """
+    def covers(rule: AvailabilityRule, day: date) -> bool:
+        return to_date(rule.start_date) <= day <= to_date(rule.end_date)
+
+    return frozenset(
+        day
+        for rule, other in ((first, second), (second, first))
+        for day in rule.exception_dates
+        if covers(rule, day) and (not covers(other, day) or day in other.exception_dates)
+    )
@@ -1,9 +1,11 @@
-from datetime import datetime
-from typing import List
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
 
 from app.constans import constants
 from app.exceptions.exceptions import NoCalenderFoundException
-from app.models.models import Calendar, calendars
+from app.models.models import Appointment, Calendar, calendars, invitee_index, invitee_index_lock, invitee_series_index
+from app.utils.calendar_service_utils import get_calendar_rules
+from app.utils.tracing_utils import traced
 
 
 def get_calendar(owner: str) -> Calendar:
@@ -17,27 +19,35 @@ def get_calendar(owner: str) -> Calendar:
     return calendar
 
 
-def is_slot_booked(start_datetime: datetime, end_datetime: datetime, calendar: Calendar):
+@traced()
+def is_slot_booked(start_datetime: datetime, end_datetime: datetime, calendar: Calendar,
+                   exclude: Optional[Appointment] = None, shared: bool = False):
     """
-    Check if a specific time slot is booked for a given owner.
+    Check if a specific time slot is booked for a given owner, counting the calendar's buffer
+    times around every appointment as booked.
 
     Args:
         start_datetime : datetime object representing the start time of the slot
         end_datetime : datetime object representing the end time of the slot
         calendar: Calendar object containing the appointments
+        exclude: Appointment to ignore, used when checking where an appointment can be moved
+        shared: Ignore appointments on exactly this slot, they take seats of a multi-seat slot
 
     Returns:
         bool: True if the slot is booked, False otherwise
 
     """
+    slot = (start_datetime, end_datetime)
+    # Padding the slot equals inflating every appointment by buffer_before ahead of its start
+    # and buffer_after behind its end
+    start_datetime, end_datetime = pad_slot(start_datetime, end_datetime, calendar)
 
-    # Get the date to check in the appointments dictionary
-    check_date = start_datetime.date()
-
-    # If the date exists in appointments
-    if check_date in calendar.appointments:
+    # Get the dates to check in the appointments dictionary, padding can reach the next day
+    for check_date in sorted({start_datetime.date(), end_datetime.date()}):
         # Check all appointments for that date for any overlap
-        for appointment in calendar.appointments[check_date]:
+        for appointment in calendar.appointments.get(check_date, []):
+            if appointment is exclude or (shared and (appointment.start_time, appointment.end_time) == slot):
+                continue
             # Check for any type of overlap:
             # 1. New slot starts during an existing appointment
             # 2. New slot ends during an existing appointment
@@ -52,8 +62,120 @@ def is_slot_booked(start_datetime: datetime, end_datetime: datetime, calendar: C
                      end_datetime <= appointment.end_time)
             ):
                 return True
+
+    # Recurring series are checked for an occurrence on the owner's days instead of being expanded
+    for check_date in sorted({calendar.local_day(start_datetime), calendar.local_day(end_datetime)}):
+        for series in calendar.recurring_appointments.values():
+            if series.occurs_on(check_date):
+                occurrence_start, occurrence_end = series.occurrence_on(check_date)
+                if occurrence_start < end_datetime and start_datetime < occurrence_end:
+                    return True
+    return False
+
+def is_slot_held(start_datetime: datetime, end_datetime: datetime, calendar: Calendar,
+                 now: Optional[datetime] = None, shared: bool = False) -> bool:
+    """
+    Check if a time slot overlaps a hold that has not expired yet, with the calendar's buffer times.
+    Expired holds no longer block the slot, even before the reaper removes them. With shared set,
+    holds on exactly this slot are seats of a multi-seat slot and do not block it.
+    """
+    now = now or datetime.now()
+    slot = (start_datetime, end_datetime)
+    start_datetime, end_datetime = pad_slot(start_datetime, end_datetime, calendar)
+    for hold in calendar.holds.values():
+        if shared and (hold.start_time, hold.end_time) == slot:
+            continue
+        if hold.start_time < end_datetime and start_datetime < hold.end_time and hold.is_active(now):
+            return True
+    return False
+
+
+def pad_slot(start_datetime: datetime, end_datetime: datetime, calendar: Calendar) -> Tuple[datetime, datetime]:
+    """
+    Widen a slot so that overlap with a plain busy interval means overlap with its buffers.
+    """
+    return start_datetime - calendar.buffer_after, end_datetime + calendar.buffer_before
+
+
+def get_slot_capacity(calendar: Calendar, start_datetime: datetime, end_datetime: datetime) -> int:
+    """
+    Return the capacity of the availability rule, own or from a rule template, the slot lies in.
+    Slots outside every rule have a capacity of 1.
+    """
+    # Rules are in the owner's wall time
+    start_datetime, end_datetime = calendar.to_local(start_datetime), calendar.to_local(end_datetime)
+    for rule in get_calendar_rules(calendar):
+        if (rule.capacity > 1 and rule.applies_on(start_datetime) and start_datetime.date() == end_datetime.date()
+                and rule.start_time <= start_datetime.time() and end_datetime.time() <= rule.end_time):
+            return rule.capacity
+    return 1
+
+
+def get_booking_violation(start_datetime: datetime, end_datetime: datetime, calendar: Calendar,
+                          now: Optional[datetime] = None, exclude: Optional[Appointment] = None) -> Optional[str]:
+    """
+    Evaluate the owner's booking constraints for a slot. Slot generation and booking validation
+    both go through here, so a searched slot is bookable by the same rules. A slot of a rule with
+    a capacity above 1 is bookable until its seat counter reaches the capacity.
+
+    Args:
+        start_datetime (datetime): Start of the slot
+        end_datetime (datetime): End of the slot
+        calendar (Calendar): The owner's calendar
+        now (datetime, optional): Current server time for the notice cutoff and hold expiry
+        exclude (Appointment, optional): Appointment being moved, ignored for overlaps and the daily cap
+
+    Returns:
+        str: Why the slot cannot be booked, or None if it can
+    """
+    now = now or datetime.now()
+    if calendar.min_notice and start_datetime < calendar.current_time(now) + calendar.min_notice:
+        return "it starts within the minimum notice"
+    if calendar.is_day_full(calendar.local_day(start_datetime), exclude):
+        return "the daily appointment limit is reached"
+    capacity = get_slot_capacity(calendar, start_datetime, end_datetime)
+    shared = capacity > 1
+    if shared and calendar.seats_taken(start_datetime, end_datetime, now, exclude) >= capacity:
+        return "all seats are taken"
+    if is_slot_booked(start_datetime, end_datetime, calendar, exclude=exclude, shared=shared):
+        return "it overlaps an appointment or its buffer"
+    if is_slot_held(start_datetime, end_datetime, calendar, now, shared=shared):
+        return "it is held"
+    return None
+
+
+def has_invitee_conflict(invitee: str, start_datetime: datetime, end_datetime: datetime,
+                         exclude_id: Optional[str] = None) -> bool:
+    """
+    Check if an invitee already has an appointment with any owner overlapping the interval,
+    leaving out the appointment exclude_id, e.g. the one being rescheduled.
+
+    One-off appointments are checked with one binary search on the invitee's entries and their
+    running latest end, which stays correct when the invitee's appointments overlap each other.
+    The invitee's recurring series are expanded on the days the interval touches.
+    """
+    with invitee_index_lock:
+        invitee_appointments = invitee_index.get(invitee)
+        if invitee_appointments is not None and invitee_appointments.overlaps(start_datetime, end_datetime, exclude_id):
+            return True
+        series_keys = list(invitee_series_index.get(invitee, ()))
+
+    for owner, series_id in series_keys:
+        calendar = calendars.get(owner)
+        series = calendar.recurring_appointments.get(series_id) if calendar else None
+        if series is None:
+            continue
+        # Occurrences start and end on the same day of the owner, so only the interval's own days can hold one
+        day = calendar.local_day(start_datetime)
+        while day <= calendar.local_day(end_datetime):
+            if series.occurs_on(day):
+                occurrence_start, occurrence_end = series.occurrence_on(day)
+                if occurrence_start < end_datetime and start_datetime < occurrence_end:
+                    return True
+            day += timedelta(days=1)
     return False
 
+@traced()
 def get_slot_in_cache(requested_slot: dict, cached_slots: List[dict]) -> dict:
     """
     Check if the requested slot exists within the cached slots.
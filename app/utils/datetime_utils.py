@@ -1,4 +1,7 @@
-from datetime import datetime, time
+from datetime import datetime, date, time, timedelta
+from typing import Iterable
+
+from app.constans import constants
 
 
 def parse_date(date_str: str, date_format: str = "%Y-%m-%d") -> datetime:
@@ -52,4 +55,70 @@ def parse_time(time_str: str) -> time:
     if parsed_time.minute < 0 or parsed_time.minute > 59:
         raise ValueError(f"Invalid minute value: {parsed_time.minute}. Minute must be between 00 and 59.")
 
-    return parsed_time
\ No newline at end of file
+    return parsed_time
+
+def to_date(value) -> date:
+    """
+    Normalize a date or datetime to a date.
+
+    Args:
+        value (date | datetime): Value to normalize.
+
+    Returns:
+        date: The calendar date of the value.
+    """
+    return value.date() if isinstance(value, datetime) else value
+
+
+def minutes_between(start: datetime, end: datetime) -> int:
+    """
+    Whole minutes from start to end.
+    """
+    return int((end - start) // timedelta(minutes=1))
+
+
+def week_index(value) -> int:
+    """
+    Number of the Monday-based week a date falls in, counted from date.min.
+    """
+    return (to_date(value).toordinal() - 1) // 7
+
+
+def weekdays_between(start, end) -> int:
+    """
+    Weekday mask of the days from start to end inclusive, computed without walking the days.
+
+    Args:
+        start (date | datetime): First day.
+        end (date | datetime): Last day.
+
+    Returns:
+        int: Mask with bit date.weekday() set for every day in the range, 0 if end is before start.
+    """
+    start, end = to_date(start), to_date(end)
+    days = (end - start).days + 1
+    if days <= 0:
+        return 0
+    if days >= 7:
+        return constants.ALL_WEEKDAYS_MASK
+    # Set `days` bits from the start weekday, wrapping Sunday back to Monday
+    mask = ((1 << days) - 1) << start.weekday()
+    return (mask | mask >> 7) & constants.ALL_WEEKDAYS_MASK
+
+
+def parse_weekdays(names: Iterable[str]) -> int:
+    """
+    Parse weekday names such as ["MON", "WED", "FRI"] into a weekday mask.
+
+    Raises:
+        ValueError: If a name is not a weekday or the list is empty.
+    """
+    mask = 0
+    for name in names:
+        day = str(name).strip().upper()[:3]
+        if day not in constants.WEEKDAY_NAMES:
+            raise ValueError(f"Invalid weekday: '{name}', expected one of {', '.join(constants.WEEKDAY_NAMES)}.")
+        mask |= 1 << constants.WEEKDAY_NAMES.index(day)
+    if not mask:
+        raise ValueError("At least one weekday is required.")
+    return mask
@@ -0,0 +1,31 @@
+import hashlib
+from typing import Optional
+
+from flask import current_app, Response
+
+from app.constans import constants
+from app.models.models import calendars
+
+
+def get_calendar_etag(owner: str, *parts: str) -> Optional[str]:
+    """
+    Build an ETag for a read of an owner's calendar from its version counter.
+
+    Args:
+        owner (str): The calendar owner.
+        *parts (str): Further values the response depends on, e.g. the searched date.
+
+    Returns:
+        str: The ETag value, or None if the owner has no calendar.
+    """
+    calendar = calendars.get(owner)
+    if not calendar:
+        return None
+    key = "|".join((owner, str(calendar.version)) + parts)
+    return hashlib.sha1(key.encode()).hexdigest()[:constants.ETAG_LENGTH]
+
+
+def not_modified_response(etag: str) -> Response:
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    return response
@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Tuple
+
+from app.constans import constants
+from app.exceptions.exceptions import IdempotencyKeyConflictException
+from app.utils.concurrency_utils import SingleFlight
+
+
+class IdempotencyStore:
+    """
+    Bounded store of results by idempotency key, expiring entries after a TTL.
+
+    Entries are kept in insertion order, which is also expiry order since every entry has the
+    same TTL, so expired entries are always at the front and the oldest entry is evicted first
+    when the store is full.
+    """
+
+    def __init__(self, ttl_seconds: float = constants.IDEMPOTENCY_TTL_SECONDS,
+                 max_keys: int = constants.IDEMPOTENCY_MAX_KEYS):
+        self.ttl_seconds = ttl_seconds
+        self.max_keys = max_keys
+        # Key: idempotency key, Value: (expires_at, fingerprint, result)
+        self._entries: "OrderedDict[str, Tuple[float, str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._single_flight = SingleFlight()
+
+    def configure(self, ttl_seconds: float, max_keys: int):
+        with self._lock:
+            self.ttl_seconds = ttl_seconds
+            self.max_keys = max_keys
+            self._evict(time.monotonic())
+
+    def _evict(self, now: float):
+        while self._entries:
+            key, (expires_at, _, _) = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.max_keys:
+                break
+            self._entries.popitem(last=False)
+
+    def _lookup(self, key: str, fingerprint: str):
+        with self._lock:
+            self._evict(time.monotonic())
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        _, stored_fingerprint, _ = entry
+        if stored_fingerprint != fingerprint:
+            raise IdempotencyKeyConflictException(
+                f"Idempotency key '{key}' was already used with a different request"
+            )
+        return entry
+
+    def run(self, key: str, fingerprint: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Return the stored result for the key, or run fn once and store its result.
+
+        Concurrent calls with the same key share one execution. Results are only stored when fn
+        returns, so failed attempts can be retried.
+
+        Args:
+            key (str): The client supplied idempotency key.
+            fingerprint (str): Identifies the request payload the key was first used with.
+            fn (Callable): Zero-argument function performing the operation.
+
+        Returns:
+            tuple: The result and whether it was replayed from the store.
+
+        Raises:
+            IdempotencyKeyConflictException: If the key was used with a different payload.
+        """
+        entry = self._lookup(key, fingerprint)
+        if entry is not None:
+            return entry[2], True
+
+        def execute():
+            stored = self._lookup(key, fingerprint)
+            if stored is not None:
+                return fingerprint, stored[2], None
+            result = fn()
+            with self._lock:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, fingerprint, result)
+                self._entries.move_to_end(key)
+                self._evict(time.monotonic())
+            return fingerprint, result, threading.get_ident()
+
+        # Callers arriving while the first one is still running wait for it instead of repeating it
+        leader_fingerprint, result, runner = self._single_flight.do(key, execute)
+        if leader_fingerprint != fingerprint:
+            raise IdempotencyKeyConflictException(
+                f"Idempotency key '{key}' was already used with a different request"
+            )
+        return result, runner != threading.get_ident()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+# Results of book_slot requests sent with an Idempotency-Key header
+booking_idempotency_store = IdempotencyStore()
@@ -0,0 +1,178 @@
+import cProfile
+import io
+import pstats
+import random
+import sys
+import threading
+import tracemalloc
+from typing import Dict, Optional
+
+from app.constans import constants
+from app.models.models import calendars, available_slots_cache
+
+# Profiling state shared by the whole process, configured from create_app
+profiling_config = {"enabled": False, "sample_rate": constants.PROFILE_SAMPLE_RATE}
+
+# Key: route endpoint, Value: pstats.Stats aggregated over every profiled request
+route_profile_stats: Dict[str, pstats.Stats] = {}
+route_profile_counts: Dict[str, int] = {}
+_stats_lock = threading.Lock()
+
+# cProfile can only have one active profiler per process, so at most one request is profiled at a time
+_profiler_lock = threading.Lock()
+
+
+def configure_profiling(enabled: bool, sample_rate: float, trace_memory: bool = False):
+    """
+    Configure request profiling for the process.
+
+    Args:
+        enabled (bool): Whether requests may be profiled at all.
+        sample_rate (float): Fraction of requests to profile, between 0 and 1.
+        trace_memory (bool): Start tracemalloc so memory snapshots include allocation sites.
+    """
+    if not 0 <= sample_rate <= 1:
+        raise ValueError(f"Invalid profile sample rate: {sample_rate}. Must be between 0 and 1.")
+    profiling_config["enabled"] = enabled
+    profiling_config["sample_rate"] = sample_rate
+    if enabled and trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def start_profile(force: bool = False) -> Optional[cProfile.Profile]:
+    """
+    Start profiling the current request if profiling is enabled and the request is sampled.
+
+    Returns:
+        The running profiler, or None when the request is not profiled.
+    """
+    if not profiling_config["enabled"]:
+        return None
+    if not force and random.random() >= profiling_config["sample_rate"]:
+        return None
+    if not _profiler_lock.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # Another profiling tool is already active
+        print(f"Could not start profiler: {e}")
+        _profiler_lock.release()
+        return None
+    return profiler
+
+
+def stop_profile(profiler: Optional[cProfile.Profile], route: str):
+    """
+    Stop the profiler started by start_profile and merge its stats into the route aggregate.
+    """
+    if profiler is None:
+        return
+    try:
+        profiler.disable()
+    finally:
+        _profiler_lock.release()
+    with _stats_lock:
+        if route in route_profile_stats:
+            route_profile_stats[route].add(profiler)
+        else:
+            route_profile_stats[route] = pstats.Stats(profiler)
+        route_profile_counts[route] = route_profile_counts.get(route, 0) + 1
+
+
+def get_profile_report(route: Optional[str] = None, limit: int = 20, sort_by: str = "cumulative") -> Dict[str, dict]:
+    """
+    Render the aggregated stats of each profiled route as text.
+
+    Args:
+        route (str, optional): Only report this route.
+        limit (int): Number of functions listed per route.
+        sort_by (str): pstats sort key.
+
+    Returns:
+        dict: Route to the number of profiled requests and the formatted stats.
+    """
+    report = {}
+    with _stats_lock:
+        for route_name, stats in route_profile_stats.items():
+            if route and route_name != route:
+                continue
+            stream = io.StringIO()
+            stats.stream = stream
+            stats.sort_stats(sort_by).print_stats(limit)
+            report[route_name] = {
+                "requests": route_profile_counts[route_name],
+                "stats": stream.getvalue()
+            }
+    return report
+
+
+def reset_profiles():
+    with _stats_lock:
+        route_profile_stats.clear()
+        route_profile_counts.clear()
+
+
+def deep_sizeof(obj, seen: Optional[set] = None) -> int:
+    """
+    Approximate the memory held by an object and everything reachable from it.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+def get_structure_sizes(limit: int = 10) -> dict:
+    """
+    Report the approximate bytes held by the in-memory stores and their largest per-day lists.
+    """
+    appointment_days = []
+    for owner, calendar in list(calendars.items()):
+        for appointment_date, appointments in list(calendar.appointments.items()):
+            appointment_days.append({
+                "owner": owner,
+                "date": appointment_date.strftime(constants.DATE_FORMAT),
+                "bytes": deep_sizeof(appointments)
+            })
+    cached_slot_days = []
+    for owner, owner_cache in list(available_slots_cache.items()):
+        for date_key, slots in list(owner_cache.items()):
+            cached_slot_days.append({"owner": owner, "date": date_key, "bytes": deep_sizeof(slots)})
+
+    return {
+        "calendars": deep_sizeof(calendars),
+        "available_slots_cache": deep_sizeof(available_slots_cache),
+        "largest_appointment_days": sorted(appointment_days, key=lambda x: x["bytes"], reverse=True)[:limit],
+        "largest_cached_slot_days": sorted(cached_slot_days, key=lambda x: x["bytes"], reverse=True)[:limit]
+    }
+
+
+def get_memory_snapshot(limit: int = 10) -> dict:
+    """
+    Take a tracemalloc snapshot and report the top allocation sites together with the structure sizes.
+    """
+    snapshot = {"structures": get_structure_sizes(limit), "tracing": tracemalloc.is_tracing()}
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        top_stats = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        )).statistics("lineno")
+        snapshot["traced_bytes"] = current
+        snapshot["peak_traced_bytes"] = peak
+        snapshot["top_allocations"] = [
+            {"location": str(stat.traceback), "bytes": stat.size, "count": stat.count}
+            for stat in top_stats[:limit]
+        ]
+    return snapshot
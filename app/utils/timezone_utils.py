@@ -0,0 +1,109 @@
+import threading
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Key: (zone name, year), Value: UTC instants at which an offset starts and the offsets, in order.
+# Built once per zone and year so conversions are a binary search instead of a zoneinfo call.
+offset_transitions_cache: Dict[Tuple[str, int], Tuple[List[datetime], List[timedelta]]] = {}
+_transitions_lock = threading.Lock()
+
+
+def get_zone(name: str) -> ZoneInfo:
+    """
+    Load an IANA timezone.
+
+    Raises:
+        ValueError: If the name is not a known timezone.
+    """
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: '{name}'")
+
+
+def get_offset_transitions(zone_name: str, year: int) -> Tuple[List[datetime], List[timedelta]]:
+    """
+    Return the UTC offset transitions of a zone covering a year, from the last day of the
+    previous year to the first day of the next one.
+
+    The offset is sampled once per day, and the minute of each change is then found by
+    bisection, so a year costs a few hundred zoneinfo calls however many slots use it.
+
+    Returns:
+        Tuple[List[datetime], List[timedelta]]: Naive UTC instants and the offset in effect from each.
+    """
+    key = (zone_name, year)
+    transitions = offset_transitions_cache.get(key)
+    if transitions is not None:
+        return transitions
+    zone = get_zone(zone_name)
+
+    def utc_offset(instant: datetime) -> timedelta:
+        return instant.replace(tzinfo=timezone.utc).astimezone(zone).utcoffset()
+
+    day = datetime(year, 1, 1) - timedelta(days=1)
+    instants, offsets = [day], [utc_offset(day)]
+    while day < datetime(year + 1, 1, 2):
+        day += timedelta(days=1)
+        offset = utc_offset(day)
+        if offset == offsets[-1]:
+            continue
+        # The offset changed during the past day, narrow it down to the minute
+        low, high = 0, 24 * 60
+        while high - low > 1:
+            middle = (low + high) // 2
+            if utc_offset(day - timedelta(minutes=middle)) == offset:
+                low = middle
+            else:
+                high = middle
+        instants.append(day - timedelta(minutes=low))
+        offsets.append(offset)
+    with _transitions_lock:
+        return offset_transitions_cache.setdefault(key, (instants, offsets))
+
+
+def server_time_to_utc(now: datetime) -> datetime:
+    """
+    Convert a naive datetime in the server's local time, such as datetime.now(), to naive UTC.
+    """
+    return now.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def utc_to_local(instant: datetime, zone_name: str) -> datetime:
+    """
+    Convert a naive UTC datetime to the zone's naive wall time.
+    """
+    instants, offsets = get_offset_transitions(zone_name, instant.year)
+    return instant + offsets[bisect_right(instants, instant) - 1]
+
+
+def local_to_utc(wall_time: datetime, zone_name: str) -> datetime:
+    """
+    Convert a naive wall time of the zone to naive UTC.
+
+    A wall time repeated when clocks go back resolves to its first occurrence. A wall time
+    skipped when clocks go forward is shifted forward by the length of the gap, the same as
+    zoneinfo with fold=0.
+    """
+    instants, offsets = get_offset_transitions(zone_name, wall_time.year)
+    for index, offset in enumerate(offsets):
+        period_end = instants[index + 1] + offset if index + 1 < len(instants) else None
+        if period_end is None or wall_time < period_end:
+            # Before the end of this period: either inside it, or in the gap after the previous one
+            if wall_time >= instants[index] + offset or index == 0:
+                return wall_time - offset
+            return wall_time - offsets[index - 1]
+    return wall_time - offsets[-1]
+
+
+def get_day_bounds(day: date, zone_name: Optional[str] = None) -> Tuple[datetime, datetime]:
+    """
+    Return the start and end of a day, in naive UTC when a zone is given.
+    """
+    day_start = datetime.combine(day, time.min)
+    day_end = day_start + timedelta(days=1)
+    if zone_name is None:
+        return day_start, day_end
+    return local_to_utc(day_start, zone_name), local_to_utc(day_end, zone_name)
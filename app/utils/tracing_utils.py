@@ -0,0 +1,205 @@
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Dict, List, Optional
+
+from app.constans import constants
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_time: float
+    end_time: float = 0.0
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_time - self.start_time) * 1000
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes
+        }
+
+
+class RingBufferExporter:
+    """Keeps the most recent finished spans in memory for the debug endpoint."""
+
+    def __init__(self, max_spans: int = constants.TRACE_BUFFER_SIZE):
+        self._spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]):
+        with self._lock:
+            self._spans.extend(spans)
+
+    def get_spans(self, trace_id: Optional[str] = None) -> List[Span]:
+        with self._lock:
+            spans = list(self._spans)
+        if trace_id:
+            spans = [span for span in spans if span.trace_id == trace_id]
+        return spans
+
+    def resize(self, max_spans: int):
+        with self._lock:
+            self._spans = deque(self._spans, maxlen=max_spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+
+class FileExporter:
+    """Appends finished spans to a file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]):
+        lines = "".join(json.dumps(span.to_dict()) + "\n" for span in spans)
+        with self._lock:
+            with open(self.path, "a") as trace_file:
+                trace_file.write(lines)
+
+
+# Tracing state shared by the whole process, configured from create_app
+tracing_config = {"sample_rate": constants.TRACE_SAMPLE_RATE}
+ring_buffer_exporter = RingBufferExporter()
+exporters = [ring_buffer_exporter]
+
+# Request-scoped context: the innermost open span and every span finished so far in the trace
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_finished_spans: ContextVar[Optional[List[Span]]] = ContextVar("finished_spans", default=None)
+
+
+def configure_tracing(sample_rate: float, buffer_size: int, export_file: Optional[str] = None):
+    """
+    Configure sampling and exporters for the process.
+
+    Args:
+        sample_rate (float): Fraction of requests to trace, between 0 and 1.
+        buffer_size (int): Number of spans kept in the in-memory ring buffer.
+        export_file (str, optional): File to append finished spans to as JSON lines.
+    """
+    if not 0 <= sample_rate <= 1:
+        raise ValueError(f"Invalid trace sample rate: {sample_rate}. Must be between 0 and 1.")
+    tracing_config["sample_rate"] = sample_rate
+    ring_buffer_exporter.resize(buffer_size)
+    exporters[:] = [ring_buffer_exporter]
+    if export_file:
+        exporters.append(FileExporter(export_file))
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def start_trace(name: str, force: bool = False, **attributes):
+    """
+    Start a new trace with a root span if the request is sampled.
+
+    Args:
+        name (str): Name of the root span.
+        force (bool): Trace regardless of the sample rate.
+
+    Returns:
+        The context token to pass to end_trace, or None when the request is not sampled.
+    """
+    if not force and random.random() >= tracing_config["sample_rate"]:
+        return None
+    root = Span(
+        name=name,
+        trace_id=uuid.uuid4().hex,
+        span_id=_new_id(),
+        parent_id=None,
+        start_time=time.time(),
+        attributes=attributes
+    )
+    return _current_span.set(root), _finished_spans.set([])
+
+
+def end_trace(token, **attributes) -> Optional[Span]:
+    """
+    Close the root span opened by start_trace and export every span of the trace.
+    """
+    if token is None:
+        return None
+    span_token, spans_token = token
+    root = _current_span.get()
+    spans = _finished_spans.get()
+    root.end_time = time.time()
+    root.attributes.update(attributes)
+    spans.append(root)
+    _current_span.reset(span_token)
+    _finished_spans.reset(spans_token)
+    for exporter in exporters:
+        try:
+            exporter.export(spans)
+        except OSError as e:
+            print(f"Error exporting spans: {e}")
+    return root
+
+
+def get_current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Open a child span of the current span. Does nothing when the request is not traced.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(
+        name=name,
+        trace_id=parent.trace_id,
+        span_id=_new_id(),
+        parent_id=parent.span_id,
+        start_time=time.time(),
+        attributes=attributes
+    )
+    token = _current_span.set(child)
+    try:
+        yield child
+    finally:
+        child.end_time = time.time()
+        _current_span.reset(token)
+        _finished_spans.get().append(child)
+
+
+def traced(name: Optional[str] = None):
+    """
+    Decorator wrapping every call of the function in a span named after it.
+    """
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
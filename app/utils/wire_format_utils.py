@@ -0,0 +1,75 @@
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from werkzeug.datastructures import MIMEAccept
+
+from app.constans import constants
+
+try:
+    import msgpack
+except ImportError:  # MessagePack is optional, JSON formats are always available
+    msgpack = None
+
+
+def get_supported_media_types() -> List[str]:
+    media_types = [constants.JSON_MIMETYPE, constants.COMPACT_JSON_MIMETYPE]
+    if msgpack is not None:
+        media_types.append(constants.MSGPACK_MIMETYPE)
+    return media_types
+
+
+def negotiate_media_type(accept_mimetypes: MIMEAccept) -> str:
+    """
+    Pick the response format from the Accept header, preferring plain JSON.
+
+    Args:
+        accept_mimetypes (MIMEAccept): The parsed Accept header of the request.
+
+    Returns:
+        str: The media type to respond with.
+    """
+    return accept_mimetypes.best_match(get_supported_media_types(), default=constants.JSON_MIMETYPE)
+
+
+def to_minute_offset(value: str, base: datetime) -> int:
+    return int((datetime.strptime(value, constants.DATETIME_FORMAT) - base) / timedelta(minutes=1))
+
+
+def compact_slots(slots: List[Dict[str, Any]], base: datetime) -> List[List[int]]:
+    """
+    Convert slots to [start, end] pairs of minutes since base, followed by the remaining seats
+    for slots of multi-seat rules.
+    """
+    compacted = []
+    for slot in slots:
+        entry = [to_minute_offset(slot[constants.SLOT_START_KEY], base), to_minute_offset(slot[constants.SLOT_END_KEY], base)]
+        if constants.SLOT_SEATS_LEFT_KEY in slot:
+            entry.append(slot[constants.SLOT_SEATS_LEFT_KEY])
+        compacted.append(entry)
+    return compacted
+
+
+def compact_appointments(appointments: List[Dict[str, str]], base: datetime) -> List[List[Any]]:
+    """
+    Convert appointments to [invitee, start, end, appointment_id] entries with minutes since base.
+    The id is what cancel_slot and reschedule_slot take.
+    """
+    return [
+        [
+            appointment["invitee"],
+            to_minute_offset(appointment["start_time"], base),
+            to_minute_offset(appointment["end_time"], base),
+            appointment["appointment_id"]
+        ]
+        for appointment in appointments
+    ]
+
+
+def encode_payload(payload: Any, media_type: str) -> bytes:
+    """
+    Serialize a payload for the negotiated media type.
+    """
+    if media_type == constants.MSGPACK_MIMETYPE:
+        return msgpack.packb(payload)
+    return json.dumps(payload, separators=(",", ":"), sort_keys=True).encode() + b"\n"
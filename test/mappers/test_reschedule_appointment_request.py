@@ -0,0 +1,52 @@
+import unittest
+from datetime import datetime
+
+from app.mappers.cancel_appointment_request import map_to_cancel_appointment_request
+from app.mappers.reschedule_appointment_request import map_to_reschedule_appointment_request
+from app.models.cancel_appointment_request import CancelAppointmentRequest
+from app.models.reschedule_appointment_request import RescheduleAppointmentRequest
+
+
+class TestRescheduleAppointmentRequestMapper(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.valid_data = {
+            "owner": "test_owner",
+            "appointment_id": "abc",
+            "start_time": "2024-01-15T09:00",
+            "end_time": "2024-01-15T10:00"
+        }
+
+    def test_valid_mapping(self):
+        """Test mapping with valid data"""
+        result = map_to_reschedule_appointment_request(self.valid_data)
+
+        self.assertIsInstance(result, RescheduleAppointmentRequest)
+        self.assertEqual(result.appointment_id, "abc")
+        self.assertEqual(result.start_time, datetime(2024, 1, 15, 9, 0))
+        self.assertEqual(result.end_time, datetime(2024, 1, 15, 10, 0))
+
+    def test_missing_appointment_id(self):
+        """Test mapping with missing appointment_id field"""
+        invalid_data = self.valid_data.copy()
+        invalid_data.pop("appointment_id")
+
+        with self.assertRaises(ValueError) as context:
+            map_to_reschedule_appointment_request(invalid_data)
+        self.assertIn("Missing required field", str(context.exception))
+
+    def test_end_before_start(self):
+        """Test mapping with end time before start time"""
+        invalid_data = dict(self.valid_data, end_time="2024-01-15T08:00")
+
+        with self.assertRaises(ValueError):
+            map_to_reschedule_appointment_request(invalid_data)
+
+    def test_cancel_mapping(self):
+        """Test mapping a cancellation and rejecting an empty id"""
+        result = map_to_cancel_appointment_request({"owner": "test_owner", "appointment_id": "abc"})
+
+        self.assertIsInstance(result, CancelAppointmentRequest)
+        self.assertEqual(result.appointment_id, "abc")
+        with self.assertRaises(ValueError):
+            map_to_cancel_appointment_request({"owner": "test_owner", "appointment_id": ""})
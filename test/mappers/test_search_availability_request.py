@@ -1,4 +1,5 @@
 import unittest
+from datetime import timedelta
 
 from app.mappers.search_availability_request import map_to_search_availability_request
 from app.models.search_available_request import SearchAvailabilityRequest
@@ -138,4 +139,41 @@ class TestSearchAvailabilityRequestMapper(unittest.TestCase):
                 self.assertIsInstance(result, SearchAvailabilityRequest)
             else:
                 with self.assertRaises((ValueError, KeyError)):
-                    map_to_search_availability_request(test_case["data"])
\ No newline at end of file
+                    map_to_search_availability_request(test_case["data"])
+
+    def test_valid_range_mapping(self):
+        """Test mapping with an end date"""
+        data = dict(self.valid_data, end_date="2024-01-20")
+
+        result = map_to_search_availability_request(data)
+
+        self.assertEqual(result.end_date, parse_date("2024-01-20"))
+
+    def test_end_date_before_request_date(self):
+        """Test mapping with an end date before the request date"""
+        data = dict(self.valid_data, end_date="2024-01-14")
+
+        with self.assertRaises(ValueError):
+            map_to_search_availability_request(data)
+
+    def test_range_too_long(self):
+        """Test mapping with a range longer than the maximum"""
+        data = dict(self.valid_data, end_date="2024-03-15")
+
+        with self.assertRaises(ValueError) as context:
+            map_to_search_availability_request(data)
+
+        self.assertIn("Search range cannot exceed", str(context.exception))
+
+    def test_duration_mapping(self):
+        """Test mapping a duration in minutes for a free window search"""
+        result = map_to_search_availability_request(dict(self.valid_data, duration="150"))
+
+        self.assertEqual(result.duration, timedelta(minutes=150))
+        self.assertIsNone(map_to_search_availability_request(self.valid_data).duration)
+
+    def test_non_positive_duration(self):
+        """Test mapping with a duration that is not a positive number of minutes"""
+        for duration in ("-20", "abc"):
+            with self.assertRaises(ValueError):
+                map_to_search_availability_request(dict(self.valid_data, duration=duration))
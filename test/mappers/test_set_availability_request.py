@@ -1,5 +1,5 @@
 import unittest
-from datetime import datetime, time
+from datetime import date, datetime, time
 
 from app.mappers.set_availability_request import map_to_set_availability_request
 from app.models.models import AvailabilityRule
@@ -189,3 +189,37 @@ class TestSetAvailabilityRequestMapper(unittest.TestCase):
             result = map_to_set_availability_request(case)
             self.assertIsInstance(result, SetAvailabilityRequest)
             self.assertEqual(len(result.availability_rules), 1)
+
+    def test_recurring_rule_mapping(self):
+        """Test mapping weekdays, interval and exception dates of a recurring rule"""
+        rule_data = dict(
+            self.valid_data["availability_rules"][0],
+            weekdays=["MON", "WED", "FRI"],
+            interval_weeks=2,
+            exception_dates=["2024-01-17"]
+        )
+
+        rule = map_to_set_availability_request({"availability_rules": [rule_data]}).availability_rules[0]
+
+        self.assertEqual(rule.weekday_mask, 0b0010101)
+        self.assertEqual(rule.interval_weeks, 2)
+        self.assertEqual(rule.exception_dates, frozenset({date(2024, 1, 17)}))
+        self.assertEqual(rule.to_dict()["weekdays"], ["MON", "WED", "FRI"])
+
+    def test_invalid_recurrence(self):
+        """Test mapping with an invalid weekday or interval"""
+        for invalid in ({"weekdays": ["XYZ"]}, {"interval_weeks": -1}, {"interval_weeks": 0}):
+            rule_data = dict(self.valid_data["availability_rules"][0], **invalid)
+            with self.assertRaises(ValueError):
+                map_to_set_availability_request({"availability_rules": [rule_data]})
+
+    def test_capacity_mapping(self):
+        """Test mapping the seat capacity of a group booking rule"""
+        rule_data = dict(self.valid_data["availability_rules"][0], capacity=10)
+
+        rule = map_to_set_availability_request({"availability_rules": [rule_data]}).availability_rules[0]
+
+        self.assertEqual(rule.capacity, 10)
+        self.assertEqual(rule.to_dict()["capacity"], 10)
+        with self.assertRaises(ValueError):
+            map_to_set_availability_request({"availability_rules": [dict(rule_data, capacity=0)]})
@@ -1,12 +1,23 @@
 import json
 import unittest
 from unittest.mock import patch, MagicMock
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from flask import Flask
 
 from app.constans import constants
 from app.routes.appointments import bp
-from app.models.models import calendars, Calendar
+from app.utils.idempotency_utils import booking_idempotency_store
+from app.models.models import (
+    calendars,
+    Calendar,
+    AvailabilityRule,
+    available_slots_cache,
+    encoded_slots_cache,
+    invitee_index,
+    invitee_series_index,
+    teams,
+    Team
+)
 
 
 class TestAppointmentsRoutes(unittest.TestCase):
@@ -18,6 +29,9 @@ class TestAppointmentsRoutes(unittest.TestCase):
 
         # Clear calendars before each test
         calendars.clear()
+        invitee_index.clear()
+        invitee_series_index.clear()
+        booking_idempotency_store.clear()
 
         # Set up test data
         self.test_owner = "test_owner"
@@ -37,6 +51,7 @@ class TestAppointmentsRoutes(unittest.TestCase):
     def tearDown(self):
         """Clean up after each test method."""
         calendars.clear()
+        teams.clear()
 
     @patch('app.routes.appointments.search_time_slots')
     def test_search_available_slots_success(self, mock_search):
@@ -176,4 +191,418 @@ class TestAppointmentsRoutes(unittest.TestCase):
 
         self.assertEqual(response.status_code, 500)
         data = json.loads(response.data)
-        self.assertIn("error", data)
\ No newline at end of file
+        self.assertIn("error", data)
+
+    def _set_up_calendar(self):
+        calendar = Calendar(owner=self.test_owner)
+        calendar.availability_rules.append(AvailabilityRule(
+            start_date=datetime(2024, 1, 15),
+            end_date=datetime(2024, 1, 15),
+            start_time=time(9, 0),
+            end_time=time(12, 0)
+        ))
+        calendars[self.test_owner] = calendar
+        available_slots_cache.clear()
+        encoded_slots_cache.clear()
+        return calendar
+
+    def test_search_available_slots_not_modified(self):
+        """Test that a search with a matching If-None-Match returns 304"""
+        self._set_up_calendar()
+        payload = {"owner": self.test_owner, "request_date": "2024-01-15"}
+
+        first = self.client.get('/search_slots', json=payload)
+        etag = first.headers["ETag"]
+        second = self.client.get('/search_slots', json=payload, headers={"If-None-Match": etag})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(len(json.loads(first.data)["available_slots"]), 3)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.headers["ETag"], etag)
+
+    def test_search_available_slots_etag_changes_after_booking(self):
+        """Test that booking a slot changes the search ETag"""
+        self._set_up_calendar()
+        payload = {"owner": self.test_owner, "request_date": "2024-01-15"}
+        etag = self.client.get('/search_slots', json=payload).headers["ETag"]
+
+        self.client.post('/book_slot', json={
+            "owner": self.test_owner,
+            "invitee": "invitee",
+            "start_time": "2024-01-15T09:00",
+            "end_time": "2024-01-15T10:00"
+        })
+        response = self.client.get('/search_slots', json=payload, headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(len(json.loads(response.data)["available_slots"]), 2)
+
+    def test_search_available_slots_etag_depends_on_date(self):
+        """Test that searches for different dates do not share an ETag"""
+        self._set_up_calendar()
+
+        first = self.client.get('/search_slots', json={"owner": self.test_owner, "request_date": "2024-01-15"})
+        second = self.client.get('/search_slots', json={"owner": self.test_owner, "request_date": "2024-01-16"},
+                                 headers={"If-None-Match": first.headers["ETag"]})
+
+        self.assertEqual(second.status_code, 200)
+
+    def test_search_available_slots_etag_moves_with_notice_cutoff(self):
+        """Test that slots passing the minimum notice cutoff change the search ETag"""
+        calendar = self._set_up_calendar()
+        calendar.min_notice = timedelta(minutes=30)
+        payload = {"owner": self.test_owner, "request_date": "2024-01-15"}
+
+        with patch.object(Calendar, "current_time", return_value=datetime(2024, 1, 15, 8, 0)):
+            first = self.client.get('/search_slots', json=payload)
+        with patch.object(Calendar, "current_time", return_value=datetime(2024, 1, 15, 9, 30)):
+            second = self.client.get('/search_slots', json=payload, headers={"If-None-Match": first.headers["ETag"]})
+
+        self.assertEqual(len(json.loads(first.data)["available_slots"]), 3)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(json.loads(second.data)["available_slots"], [
+            {"start": "2024-01-15T10:00", "end": "2024-01-15T11:00"},
+            {"start": "2024-01-15T11:00", "end": "2024-01-15T12:00"}
+        ])
+
+    def test_search_available_slots_query_parameters(self):
+        """Test that a search can be sent as query parameters and is publicly cacheable"""
+        self._set_up_calendar()
+
+        response = self.client.get('/search_slots', query_string={
+            "owner": self.test_owner,
+            "request_date": "2024-01-15"
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)["available_slots"]), 3)
+        self.assertTrue(response.cache_control.public)
+        self.assertEqual(response.cache_control.max_age, constants.SEARCH_CACHE_MAX_AGE)
+        self.assertIn("Accept", response.headers["Vary"])
+
+    def test_search_available_slots_query_range(self):
+        """Test a range search sent as query parameters"""
+        self._set_up_calendar()
+
+        response = self.client.get('/search_slots', query_string={
+            "owner": self.test_owner,
+            "request_date": "2024-01-14",
+            "end_date": "2024-01-16"
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)["available_slots"]), 3)
+
+    def test_duration_search_after_single_day_search(self):
+        """Test that a duration search of a day with a cached slot body returns free windows"""
+        self._set_up_calendar()
+        self.client.get('/search_slots', query_string={"owner": self.test_owner, "request_date": "2024-01-15"})
+
+        response = self.client.get('/search_slots', query_string={
+            "owner": self.test_owner,
+            "request_date": "2024-01-15",
+            "duration": "120"
+        })
+
+        self.assertEqual(json.loads(response.data), {
+            "free_windows": [{"start": "2024-01-15T09:00", "end": "2024-01-15T12:00"}]
+        })
+
+    def test_range_search_after_single_day_search(self):
+        """Test that a range search starting on a day with a cached slot body returns every day"""
+        calendar = self._set_up_calendar()
+        calendar.availability_rules[0].start_date = datetime(2024, 1, 14)
+        calendar.availability_rules[0].end_date = datetime(2024, 1, 16)
+        self.client.get('/search_slots', query_string={"owner": self.test_owner, "request_date": "2024-01-14"})
+
+        response = self.client.get('/search_slots', query_string={
+            "owner": self.test_owner,
+            "request_date": "2024-01-14",
+            "end_date": "2024-01-16"
+        })
+
+        self.assertEqual(len(json.loads(response.data)["available_slots"]), 9)
+
+    def test_body_search_with_unrelated_query_parameter(self):
+        """Test that a body search is read from the body when the query string has no search fields"""
+        self._set_up_calendar()
+
+        response = self.client.get('/search_slots', query_string={"cache_buster": "1"},
+                                   json={"owner": self.test_owner, "request_date": "2024-01-15"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)["available_slots"]), 3)
+        self.assertTrue(response.cache_control.no_cache)
+
+    def test_search_available_slots_query_missing_owner(self):
+        """Test a query parameter search without an owner"""
+        response = self.client.get('/search_slots', query_string={"request_date": "2024-01-15"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Missing required field", json.loads(response.data)["error"])
+
+    def test_search_available_slots_body_not_publicly_cacheable(self):
+        """Test that searches sent with a body must be revalidated"""
+        self._set_up_calendar()
+
+        response = self.client.get('/search_slots', json={"owner": self.test_owner, "request_date": "2024-01-15"})
+
+        self.assertTrue(response.cache_control.no_cache)
+        self.assertFalse(response.cache_control.public)
+
+    def test_book_time_slot_idempotent_retry(self):
+        """Test that a retry with the same Idempotency-Key returns the original booking"""
+        self._set_up_calendar()
+        self.client.get('/search_slots', json={"owner": self.test_owner, "request_date": "2024-01-15"})
+        payload = {
+            "owner": self.test_owner,
+            "invitee": "invitee",
+            "start_time": "2024-01-15T09:00",
+            "end_time": "2024-01-15T10:00"
+        }
+        headers = {constants.IDEMPOTENCY_KEY_HEADER: "retry-key"}
+
+        first = self.client.post('/book_slot', json=payload, headers=headers)
+        retry = self.client.post('/book_slot', json=payload, headers=headers)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(json.loads(retry.data), json.loads(first.data))
+        self.assertEqual(retry.headers[constants.IDEMPOTENT_REPLAYED_HEADER], "true")
+        self.assertEqual(len(calendars[self.test_owner].appointments[datetime(2024, 1, 15).date()]), 1)
+
+    def test_book_time_slot_idempotency_key_conflict(self):
+        """Test that reusing an Idempotency-Key with another payload is rejected"""
+        self._set_up_calendar()
+        self.client.get('/search_slots', json={"owner": self.test_owner, "request_date": "2024-01-15"})
+        headers = {constants.IDEMPOTENCY_KEY_HEADER: "reused-key"}
+        payload = {
+            "owner": self.test_owner,
+            "invitee": "invitee",
+            "start_time": "2024-01-15T09:00",
+            "end_time": "2024-01-15T10:00"
+        }
+
+        self.client.post('/book_slot', json=payload, headers=headers)
+        response = self.client.post('/book_slot', json=dict(payload, invitee="other"), headers=headers)
+
+        self.assertEqual(response.status_code, 422)
+
+    def _book_slot(self, start_time: str, end_time: str) -> str:
+        self.client.get('/search_slots', json={"owner": self.test_owner, "request_date": "2024-01-15"})
+        response = self.client.post('/book_slot', json={
+            "owner": self.test_owner,
+            "invitee": "invitee",
+            "start_time": start_time,
+            "end_time": end_time
+        })
+        return json.loads(response.data)["appointment"]["appointment_id"]
+
+    def test_team_slot_endpoints(self):
+        """Test searching and booking a team slot, and an unknown team"""
+        self._set_up_calendar()
+        teams["sales"] = Team(name="sales", members=[self.test_owner])
+
+        search = self.client.get('/search_team_slots?team=sales&request_date=2024-01-15')
+        booked = self.client.post('/book_team_slot', json={
+            "team": "sales",
+            "invitee": "invitee",
+            "start_time": "2024-01-15T09:00",
+            "end_time": "2024-01-15T10:00"
+        })
+        taken = self.client.post('/book_team_slot', json={
+            "team": "sales",
+            "invitee": "other",
+            "start_time": "2024-01-15T09:00",
+            "end_time": "2024-01-15T10:00"
+        })
+        unknown = self.client.get('/search_team_slots?team=support&request_date=2024-01-15')
+
+        self.assertEqual(json.loads(search.data)["available_slots"][0]["free_members"], 1)
+        self.assertEqual(booked.status_code, 200)
+        self.assertEqual(json.loads(booked.data)["appointment"]["owner"], self.test_owner)
+        self.assertEqual(taken.status_code, 409)
+        self.assertEqual(unknown.status_code, 404)
+
+    def test_cancel_slot(self):
+        """Test that a cancelled slot can be booked again"""
+        self._set_up_calendar()
+        appointment_id = self._book_slot("2024-01-15T09:00", "2024-01-15T10:00")
+
+        response = self.client.post('/cancel_slot', json={"owner": self.test_owner, "appointment_id": appointment_id})
+        search = self.client.get('/search_slots', json={"owner": self.test_owner, "request_date": "2024-01-15"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(search.data)["available_slots"]), 3)
+
+    def test_cancel_slot_unknown_appointment(self):
+        """Test that cancelling an unknown appointment returns 404"""
+        self._set_up_calendar()
+
+        response = self.client.post('/cancel_slot', json={"owner": self.test_owner, "appointment_id": "missing"})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_reschedule_slot(self):
+        """Test rescheduling to a free slot and to a taken slot"""
+        self._set_up_calendar()
+        appointment_id = self._book_slot("2024-01-15T09:00", "2024-01-15T10:00")
+        self._book_slot("2024-01-15T11:00", "2024-01-15T12:00")
+        payload = {"owner": self.test_owner, "appointment_id": appointment_id}
+
+        moved = self.client.post('/reschedule_slot', json=dict(
+            payload, start_time="2024-01-15T10:00", end_time="2024-01-15T11:00"
+        ))
+        taken = self.client.post('/reschedule_slot', json=dict(
+            payload, start_time="2024-01-15T11:00", end_time="2024-01-15T12:00"
+        ))
+        search = self.client.get('/search_slots', json={"owner": self.test_owner, "request_date": "2024-01-15"})
+
+        self.assertEqual(moved.status_code, 200)
+        self.assertEqual(taken.status_code, 409)
+        self.assertEqual(
+            json.loads(search.data)["available_slots"],
+            [{"start": "2024-01-15T09:00", "end": "2024-01-15T10:00"}]
+        )
+
+    def test_reschedule_slot_missing_fields(self):
+        """Test that rescheduling without times returns 400"""
+        self._set_up_calendar()
+
+        response = self.client.post('/reschedule_slot', json={"owner": self.test_owner, "appointment_id": "id"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_hold_slot_then_book(self):
+        """Test that a held slot cannot be held again and is booked with its hold id"""
+        self._set_up_calendar()
+        self.client.get('/search_slots', json={"owner": self.test_owner, "request_date": "2024-01-15"})
+        payload = {
+            "owner": self.test_owner,
+            "invitee": "invitee",
+            "start_time": "2024-01-15T09:00",
+            "end_time": "2024-01-15T10:00"
+        }
+
+        held = self.client.post('/hold_slot', json=payload)
+        again = self.client.post('/hold_slot', json=dict(payload, invitee="other"))
+        hold_id = json.loads(held.data)["hold"]["hold_id"]
+        booked = self.client.post('/book_slot', json=dict(payload, hold_id=hold_id))
+        replay = self.client.post('/book_slot', json=dict(payload, hold_id=hold_id))
+
+        self.assertEqual(held.status_code, 200)
+        self.assertEqual(again.status_code, 409)
+        self.assertEqual(booked.status_code, 200)
+        self.assertEqual(replay.status_code, 404)
+        self.assertFalse(calendars[self.test_owner].holds)
+
+    def test_release_hold(self):
+        """Test that a released hold makes the slot searchable again"""
+        self._set_up_calendar()
+        self.client.get('/search_slots', json={"owner": self.test_owner, "request_date": "2024-01-15"})
+        held = self.client.post('/hold_slot', json={
+            "owner": self.test_owner,
+            "invitee": "invitee",
+            "start_time": "2024-01-15T10:00",
+            "end_time": "2024-01-15T11:00",
+            "ttl_seconds": 60
+        })
+        hold_id = json.loads(held.data)["hold"]["hold_id"]
+
+        released = self.client.post('/release_hold', json={"owner": self.test_owner, "hold_id": hold_id})
+        missing = self.client.post('/release_hold', json={"owner": self.test_owner, "hold_id": hold_id})
+        search = self.client.get('/search_slots', json={"owner": self.test_owner, "request_date": "2024-01-15"})
+
+        self.assertEqual(released.status_code, 200)
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(len(json.loads(search.data)["available_slots"]), 3)
+
+    def test_hold_slot_invalid_ttl(self):
+        """Test that a ttl above the maximum returns 400"""
+        self._set_up_calendar()
+
+        response = self.client.post('/hold_slot', json={
+            "owner": self.test_owner,
+            "invitee": "invitee",
+            "start_time": "2024-01-15T10:00",
+            "end_time": "2024-01-15T11:00",
+            "ttl_seconds": constants.HOLD_MAX_TTL_SECONDS + 1
+        })
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_book_recurring_slot(self):
+        """Test booking weekly and biweekly series and cancelling one occurrence"""
+        calendar = self._set_up_calendar()
+        calendar.availability_rules[0].end_date = datetime(2024, 2, 29)
+        for request_date in ("2024-01-15", "2024-01-22"):
+            self.client.get('/search_slots', json={"owner": self.test_owner, "request_date": request_date})
+        payload = {
+            "owner": self.test_owner,
+            "invitee": "invitee",
+            "start_time": "2024-01-15T09:00",
+            "end_time": "2024-01-15T10:00",
+            "until": "2024-02-29"
+        }
+
+        booked = self.client.post('/book_recurring_slot', json=payload)
+        biweekly = self.client.post('/book_recurring_slot', json=dict(
+            payload, start_time="2024-01-15T10:00", end_time="2024-01-15T11:00", interval_weeks=2
+        ))
+        series_id = json.loads(booked.data)["recurring_appointment"]["series_id"]
+        next_week = self.client.get('/search_slots', json={"owner": self.test_owner, "request_date": "2024-01-22"})
+        cancelled = self.client.post('/cancel_slot', json={
+            "owner": self.test_owner,
+            "appointment_id": f"{series_id}@2024-01-22"
+        })
+        after_cancel = self.client.get('/search_slots', json={"owner": self.test_owner, "request_date": "2024-01-22"})
+
+        self.assertEqual(booked.status_code, 200)
+        self.assertEqual(biweekly.status_code, 200)
+        self.assertEqual(len(calendar.recurring_appointments), 2)
+        self.assertEqual(
+            [slot["start"] for slot in json.loads(next_week.data)["available_slots"]],
+            ["2024-01-22T10:00", "2024-01-22T11:00"]
+        )
+        self.assertEqual(cancelled.status_code, 200)
+        self.assertEqual(json.loads(after_cancel.data)["available_slots"][0]["start"], "2024-01-22T09:00")
+        self.assertEqual(len(calendar.appointments), 0)
+
+    def test_book_recurring_slot_zero_interval(self):
+        """Test that a series repeating every 0 weeks is rejected"""
+        self._set_up_calendar()
+
+        response = self.client.post('/book_recurring_slot', json={
+            "owner": self.test_owner,
+            "invitee": "invitee",
+            "start_time": "2024-01-15T09:00",
+            "end_time": "2024-01-15T10:00",
+            "interval_weeks": 0
+        })
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.data)["error"], "interval_weeks must be at least 1.")
+
+    def test_double_booking_check_across_owners(self):
+        """Test that check_invitee rejects an overlapping booking with another owner"""
+        self._set_up_calendar()
+        other = Calendar(owner="other_owner", availability_rules=list(calendars[self.test_owner].availability_rules))
+        calendars["other_owner"] = other
+        self._book_slot("2024-01-15T09:00", "2024-01-15T10:00")
+        self.client.get('/search_slots', json={"owner": "other_owner", "request_date": "2024-01-15"})
+        payload = {
+            "owner": "other_owner",
+            "invitee": "invitee",
+            "start_time": "2024-01-15T09:00",
+            "end_time": "2024-01-15T10:00",
+            "check_invitee": True
+        }
+
+        rejected = self.client.post('/book_slot', json=payload)
+        listed = self.client.get('/by_invitee', query_string={
+            "invitee": "invitee", "start": "2024-01-15T00:00", "end": "2024-01-16T00:00"
+        })
+
+        self.assertEqual(rejected.status_code, 409)
+        self.assertEqual([a["owner"] for a in json.loads(listed.data)["appointments"]], [self.test_owner])
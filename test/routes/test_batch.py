@@ -0,0 +1,57 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from flask import Flask
+
+from app.routes.batch import bp
+
+
+class TestBatchRoutes(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.app = Flask(__name__)
+        self.app.register_blueprint(bp)
+        self.client = self.app.test_client()
+
+    @patch('app.routes.batch.run_batch')
+    def test_batch_success(self, mock_run_batch):
+        """Test that batch results are returned in order"""
+        mock_run_batch.return_value = [{"status": 200, "body": {}}, {"status": 404, "body": {"error": "x"}}]
+
+        response = self.client.post('/batch', json={"operations": [{}, {}]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)["results"][1]["status"], 404)
+
+    @patch('app.routes.batch.run_batch')
+    def test_batch_passes_invitee_check_setting(self, mock_run_batch):
+        """Test that the invitee double booking setting reaches the batch operations"""
+        mock_run_batch.return_value = []
+        self.app.config["INVITEE_DOUBLE_BOOKING_CHECK"] = True
+
+        self.client.post('/batch', json={"operations": []})
+
+        mock_run_batch.assert_called_once_with([], check_invitee=True)
+
+    def test_batch_missing_operations(self):
+        """Test a batch without operations"""
+        response = self.client.post('/batch', json={})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("error", json.loads(response.data))
+
+    def test_batch_invalid_json(self):
+        """Test a batch with an invalid JSON payload"""
+        response = self.client.post('/batch', data="invalid json", content_type='application/json')
+
+        self.assertEqual(response.status_code, 400)
+
+    @patch('app.routes.batch.run_batch')
+    def test_batch_too_large(self, mock_run_batch):
+        """Test that batch validation errors are returned as 400"""
+        mock_run_batch.side_effect = ValueError("A batch cannot hold more than 100 operations.")
+
+        response = self.client.post('/batch', json={"operations": []})
+
+        self.assertEqual(response.status_code, 400)
@@ -1,10 +1,20 @@
 import json
 import unittest
+from datetime import datetime, timedelta
 from unittest.mock import patch
 
 from flask import Flask
 
-from app.models.models import Calendar, AvailabilityRule, calendars
+from app.models.models import (
+    Calendar,
+    AvailabilityRule,
+    Appointment,
+    RecurringAppointment,
+    calendars,
+    holiday_calendars,
+    rule_templates,
+    teams
+)
 from app.routes.calendar import bp
 
 class TestCalendarRoutes(unittest.TestCase):
@@ -34,6 +44,9 @@ class TestCalendarRoutes(unittest.TestCase):
     def tearDown(self):
         """Clean up after each test method."""
         calendars.clear()
+        holiday_calendars.clear()
+        rule_templates.clear()
+        teams.clear()
 
     def test_set_calendar_availability_success(self):
         """Test successful availability setting"""
@@ -163,3 +176,137 @@ class TestCalendarRoutes(unittest.TestCase):
             data = json.loads(response.data)
             self.assertIn("error", data)
             self.assertEqual(data["error"], "Service error")
+
+    def test_list_upcoming_appointments_not_modified(self):
+        """Test that polling with a matching If-None-Match returns 304 until the calendar changes"""
+        calendar = Calendar(owner=self.test_owner)
+        calendars[self.test_owner] = calendar
+        start = (datetime.now() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+        calendar.add_appointment(Appointment(invitee="invitee", start_time=start, end_time=start + timedelta(hours=1)))
+
+        with patch('app.routes.calendar.datetime') as mock_datetime:
+            mock_datetime.now.return_value = datetime(2024, 1, 15, 9, 0)
+            first = self.client.get('/appointments/list_upcoming', query_string={'owner': self.test_owner})
+            etag = first.headers["ETag"]
+            second = self.client.get('/appointments/list_upcoming', query_string={'owner': self.test_owner},
+                                     headers={"If-None-Match": etag})
+            calendar.add_appointment(Appointment(invitee="invitee", start_time=start + timedelta(hours=1),
+                                                 end_time=start + timedelta(hours=2)))
+            third = self.client.get('/appointments/list_upcoming', query_string={'owner': self.test_owner},
+                                    headers={"If-None-Match": etag})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(third.status_code, 200)
+        self.assertEqual(len(json.loads(third.data)["upcoming_appointments"]), 2)
+
+    def test_list_upcoming_expands_recurring_appointments(self):
+        """Test that a weekly series is listed once per week up to the until date"""
+        calendar = Calendar(owner=self.test_owner)
+        calendars[self.test_owner] = calendar
+        start = (datetime.now() + timedelta(days=1)).replace(hour=9, minute=0, second=0, microsecond=0)
+        calendar.add_recurring_appointment(RecurringAppointment(
+            invitee="invitee",
+            start_time=start,
+            end_time=start + timedelta(hours=1)
+        ))
+        until = (start + timedelta(weeks=3)).strftime("%Y-%m-%d")
+
+        response = self.client.get('/appointments/list_upcoming', query_string={'owner': self.test_owner, 'until': until})
+
+        upcoming = json.loads(response.data)["upcoming_appointments"]
+        self.assertEqual(len(upcoming), 4)
+        self.assertEqual(upcoming[1]["start_time"], (start + timedelta(weeks=1)).strftime("%Y-%m-%dT%H:%M"))
+
+    def test_set_blackouts_and_holiday_calendar(self):
+        """Test blackout endpoints, including validation and unknown owners"""
+        self.client.post(f'/set_availability/{self.test_owner}', json=self.valid_availability_data)
+
+        blackouts = self.client.post(f'/blackouts/{self.test_owner}', json={"blackouts": [
+            {"date": "2024-12-25"},
+            {"start_time": "2024-12-24T12:00", "end_time": "2024-12-24T17:00"}
+        ]})
+        invalid = self.client.post(f'/blackouts/{self.test_owner}', json={"blackouts": [{"date": "25-12-2024"}]})
+        unknown = self.client.post('/blackouts/nobody', json={"blackouts": [{"date": "2024-12-25"}]})
+        holiday = self.client.post('/holidays/company', json={"blackouts": [{"date": "2024-01-01"}]})
+        subscribed = self.client.post(f'/holidays/company/subscribe/{self.test_owner}')
+
+        self.assertEqual(blackouts.status_code, 200)
+        self.assertEqual(json.loads(blackouts.data)["blackouts"], [
+            {"start_time": "2024-12-24T12:00", "end_time": "2024-12-24T17:00"},
+            {"start_time": "2024-12-25T00:00", "end_time": "2024-12-26T00:00"}
+        ])
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(unknown.status_code, 404)
+        self.assertEqual(holiday.status_code, 200)
+        self.assertEqual(subscribed.status_code, 200)
+        self.assertEqual(calendars[self.test_owner].holiday_calendar_names, ["company"])
+
+    def test_set_booking_constraints(self):
+        """Test setting booking constraints, including validation and unknown owners"""
+        self.client.post(f'/set_availability/{self.test_owner}', json=self.valid_availability_data)
+
+        response = self.client.post(f'/constraints/{self.test_owner}', json={
+            "buffer_before": 15, "buffer_after": 10, "max_per_day": 4
+        })
+        invalid = self.client.post(f'/constraints/{self.test_owner}', json={"buffer_before": -5})
+        unknown = self.client.post('/constraints/nobody', json={"min_notice": 60})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)["constraints"], {
+            "buffer_before": 15, "buffer_after": 10, "min_notice": 0, "max_per_day": 4
+        })
+        self.assertEqual(calendars[self.test_owner].buffer_before, timedelta(minutes=15))
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(unknown.status_code, 404)
+
+    def test_set_timezone(self):
+        """Test setting a calendar timezone, rejecting unknown zones and owners"""
+        self.client.post(f'/set_availability/{self.test_owner}', json=self.valid_availability_data)
+
+        response = self.client.post(f'/timezone/{self.test_owner}', json={"timezone": "Europe/Berlin"})
+        invalid = self.client.post(f'/timezone/{self.test_owner}', json={"timezone": "Europe/Atlantis"})
+        unknown = self.client.post('/timezone/nobody', json={"timezone": "Europe/Berlin"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(calendars[self.test_owner].timezone, "Europe/Berlin")
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(unknown.status_code, 404)
+
+    def test_utilization(self):
+        """Test the utilization report of an owner and of the organization, with invalid parameters"""
+        self.client.post(f'/set_availability/{self.test_owner}', json=self.valid_availability_data)
+
+        response = self.client.get(f'/utilization?owner={self.test_owner}&start=2024-12-01&end=2024-12-07&bucket=week')
+        organization = self.client.get('/utilization?start=2024-12-01&end=2024-12-07')
+        invalid = self.client.get('/utilization?start=2024-12-07&end=2024-12-01')
+        missing = self.client.get('/utilization?start=2024-12-01')
+        unknown = self.client.get('/utilization?owner=nobody&start=2024-12-01&end=2024-12-07')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)["bucket"], "week")
+        self.assertEqual(organization.status_code, 200)
+        self.assertEqual(len(json.loads(organization.data)["utilization"]), 7)
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(missing.status_code, 400)
+        self.assertEqual(unknown.status_code, 404)
+
+    def test_set_team(self):
+        """Test creating a team and rejecting an empty member list"""
+        response = self.client.post('/teams/sales', json={"members": ["rep_a", "rep_b", "rep_a"]})
+        invalid = self.client.post('/teams/support', json={"members": []})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)["members"], ["rep_a", "rep_b"])
+        self.assertEqual(invalid.status_code, 400)
+
+    def test_rule_template_endpoints(self):
+        """Test creating a rule template and subscribing an owner to it"""
+        created = self.client.post('/templates/business_hours', json=self.valid_availability_data)
+        subscribed = self.client.post(f'/templates/business_hours/subscribe/{self.test_owner}')
+        missing = self.client.post(f'/templates/unknown/subscribe/{self.test_owner}')
+
+        self.assertEqual(created.status_code, 200)
+        self.assertEqual(subscribed.status_code, 200)
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(calendars[self.test_owner].rule_template_names, ["business_hours"])
@@ -0,0 +1,116 @@
+import json
+import unittest
+
+from app import create_app
+from app.constans import constants
+from app.models.models import calendars, available_slots_cache
+from app.services.expiry_sweeper_service import stop_expiry_sweeper
+from app.services.hold_reaper_service import stop_hold_reaper
+from app.utils import tracing_utils
+from app.utils.profiling_utils import configure_profiling, reset_profiles
+
+
+class TestDebugRoutes(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.app = create_app({"TESTING": True, "TRACE_SAMPLE_RATE": 0.0, "DEBUG_ENDPOINTS_ENABLED": True})
+        self.client = self.app.test_client()
+        calendars.clear()
+        available_slots_cache.clear()
+        tracing_utils.ring_buffer_exporter.clear()
+
+        self.client.post(
+            '/api/calendar/set_availability/test_owner',
+            json={
+                "availability_rules": [
+                    {
+                        "start_date": "2024-01-15",
+                        "end_date": "2024-01-15",
+                        "start_time": "09:00",
+                        "end_time": "11:00"
+                    }
+                ]
+            }
+        )
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        calendars.clear()
+        available_slots_cache.clear()
+        tracing_utils.ring_buffer_exporter.clear()
+        configure_profiling(enabled=False, sample_rate=0.0)
+        reset_profiles()
+        stop_expiry_sweeper()
+        stop_hold_reaper()
+
+    def test_traced_search_spans_each_layer(self):
+        """Test that a request sent with the trace header records spans for every layer"""
+        response = self.client.get(
+            '/api/appointments/search_slots',
+            json={"owner": "test_owner", "request_date": "2024-01-15"},
+            headers={constants.TRACE_HEADER: "1"}
+        )
+        trace_id = response.headers[constants.TRACE_ID_HEADER]
+
+        traces = self.client.get('/api/debug/traces', query_string={"trace_id": trace_id})
+
+        self.assertEqual(traces.status_code, 200)
+        names = [s["name"] for s in json.loads(traces.data)["spans"]]
+        for name in ("GET /api/appointments/search_slots", "map_to_search_availability_request",
+                     "search_time_slots", "generate_daily_available_slots", "is_slot_booked",
+                     "get_encoded_slots_response"):
+            self.assertIn(name, names)
+
+    def test_unsampled_request_is_not_traced(self):
+        """Test that requests are not traced without the header at a zero sample rate"""
+        response = self.client.get(
+            '/api/appointments/search_slots',
+            json={"owner": "test_owner", "request_date": "2024-01-15"}
+        )
+
+        self.assertNotIn(constants.TRACE_ID_HEADER, response.headers)
+        traces = self.client.get('/api/debug/traces')
+        self.assertEqual(json.loads(traces.data)["spans"], [])
+
+    def test_profile_header_profiles_request(self):
+        """Test that a request sent with the profile header is profiled and aggregated by route"""
+        app = create_app({
+            "TESTING": True,
+            "PROFILING_ENABLED": True,
+            "PROFILE_SAMPLE_RATE": 0.0,
+            "DEBUG_ENDPOINTS_ENABLED": True
+        })
+        client = app.test_client()
+
+        client.get(
+            '/api/appointments/search_slots',
+            json={"owner": "test_owner", "request_date": "2024-01-15"},
+            headers={constants.PROFILE_HEADER: "1"}
+        )
+        response = client.get('/api/debug/profiles', query_string={"limit": 1000})
+
+        self.assertEqual(response.status_code, 200)
+        profiles = json.loads(response.data)["profiles"]
+        self.assertIn("appointments.search_available_slots", profiles)
+        self.assertIn("generate_daily_available_slots", profiles["appointments.search_available_slots"]["stats"])
+
+    def test_profiles_empty_when_disabled(self):
+        """Test that nothing is profiled when profiling is not enabled"""
+        self.client.get(
+            '/api/appointments/search_slots',
+            json={"owner": "test_owner", "request_date": "2024-01-15"},
+            headers={constants.PROFILE_HEADER: "1"}
+        )
+        response = self.client.get('/api/debug/profiles')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)["profiles"], {})
+
+    def test_memory_snapshot(self):
+        """Test that the memory endpoint reports the in-memory stores"""
+        response = self.client.get('/api/debug/memory')
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertIn("calendars", data["structures"])
+        self.assertIn("available_slots_cache", data["structures"])
@@ -0,0 +1,159 @@
+import unittest
+from datetime import date, datetime, time
+from unittest.mock import patch
+
+from app.constans import constants
+from app.models.models import (
+    calendars,
+    available_slots_cache,
+    encoded_slots_cache,
+    expiry_heap,
+    free_gaps_cache,
+    invitee_index,
+    Appointment,
+    AvailabilityRule,
+    Calendar,
+    RecurringAppointment
+)
+from app.services import analytics_service
+from app.services.analytics_service import get_organization_utilization, get_owner_utilization
+from app.services.expiry_sweeper_service import sweep_expired
+
+
+class TestAnalyticsService(unittest.TestCase):
+    def setUp(self):
+        """Set up an owner available from 09:00 to 17:00 on Monday 15 and Tuesday 16 January 2024."""
+        calendars.clear()
+        available_slots_cache.clear()
+        encoded_slots_cache.clear()
+        free_gaps_cache.clear()
+        invitee_index.clear()
+        expiry_heap.clear()
+        self.test_owner = "test_owner"
+        self.calendar = Calendar(owner=self.test_owner, availability_rules=[AvailabilityRule(
+            start_date=datetime(2024, 1, 15),
+            end_date=datetime(2024, 1, 16),
+            start_time=time(9, 0),
+            end_time=time(17, 0)
+        )])
+        calendars[self.test_owner] = self.calendar
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        calendars.clear()
+        available_slots_cache.clear()
+        encoded_slots_cache.clear()
+        free_gaps_cache.clear()
+        invitee_index.clear()
+        expiry_heap.clear()
+
+    def _book(self, calendar: Calendar, hour: int, day: int = 15) -> Appointment:
+        appointment = Appointment(
+            invitee="invitee",
+            start_time=datetime(2024, 1, day, hour, 0),
+            end_time=datetime(2024, 1, day, hour + 1, 0)
+        )
+        calendar.add_appointment(appointment)
+        return appointment
+
+    def test_owner_daily_utilization(self):
+        """Test booked and available minutes per day"""
+        self._book(self.calendar, 9)
+        self._book(self.calendar, 13)
+
+        report = get_owner_utilization(self.test_owner, date(2024, 1, 15), date(2024, 1, 17))
+
+        self.assertEqual(report["utilization"], [
+            {"start": "2024-01-15", "available_minutes": 480, "booked_minutes": 120, "utilization": 0.25},
+            {"start": "2024-01-16", "available_minutes": 480, "booked_minutes": 0, "utilization": 0.0},
+            {"start": "2024-01-17", "available_minutes": 0, "booked_minutes": 0, "utilization": None}
+        ])
+        self.assertEqual(report["total"]["booked_minutes"], 120)
+
+    def test_bookings_update_computed_days(self):
+        """Test that bookings and cancellations update computed days without computing them again"""
+        get_owner_utilization(self.test_owner, date(2024, 1, 15), date(2024, 1, 16))
+        appointment = self._book(self.calendar, 10, day=16)
+        self._book(self.calendar, 11, day=16)
+        self.calendar.remove_appointment(appointment.appointment_id)
+
+        with patch.object(analytics_service, "get_available_minutes") as mock_available:
+            report = get_owner_utilization(self.test_owner, date(2024, 1, 15), date(2024, 1, 16))
+
+        mock_available.assert_not_called()
+        self.assertEqual(report["utilization"][1]["booked_minutes"], 60)
+
+    def test_weekly_buckets_and_series(self):
+        """Test weeks starting on Monday, with a new series counted after the index is dropped"""
+        get_owner_utilization(self.test_owner, date(2024, 1, 10), date(2024, 1, 21))
+        self.calendar.add_recurring_appointment(RecurringAppointment(
+            invitee="invitee",
+            start_time=datetime(2024, 1, 16, 9, 0),
+            end_time=datetime(2024, 1, 16, 9, 30)
+        ))
+
+        report = get_owner_utilization(self.test_owner, date(2024, 1, 10), date(2024, 1, 21), bucket="week")
+
+        self.assertEqual([bucket["start"] for bucket in report["utilization"]], ["2024-01-10", "2024-01-15"])
+        self.assertEqual(report["utilization"][0]["available_minutes"], 0)
+        self.assertEqual(report["utilization"][1]["available_minutes"], 960)
+        self.assertEqual(report["utilization"][1]["booked_minutes"], 30)
+
+    def test_removed_series_keep_past_occurrences(self):
+        """Test that occurrences of ended or cancelled series before their removal are still counted"""
+        ended = RecurringAppointment(
+            invitee="invitee",
+            start_time=datetime(2024, 1, 15, 9, 0),
+            end_time=datetime(2024, 1, 15, 10, 0),
+            until=date(2024, 1, 22)
+        )
+        cancelled = RecurringAppointment(
+            invitee="invitee",
+            start_time=datetime(2024, 1, 16, 9, 0),
+            end_time=datetime(2024, 1, 16, 9, 30)
+        )
+        self.calendar.add_recurring_appointment(ended)
+        self.calendar.add_recurring_appointment(cancelled)
+        get_owner_utilization(self.test_owner, date(2024, 1, 15), date(2024, 1, 31))
+
+        sweep_expired(date(2024, 1, 23))
+        self.calendar.remove_recurring_appointment(cancelled.series_id, archive_before=datetime(2024, 1, 24))
+        report = get_owner_utilization(self.test_owner, date(2024, 1, 15), date(2024, 1, 31), bucket="week")
+
+        self.assertEqual(self.calendar.recurring_appointments, {})
+        self.assertEqual([bucket["booked_minutes"] for bucket in report["utilization"]], [90, 90, 0])
+
+    def test_index_keeps_a_bounded_number_of_days(self):
+        """Test that the days computed first are evicted and reports still cover their range"""
+        self._book(self.calendar, 9)
+
+        with patch.object(constants, "UTILIZATION_INDEX_MAX_DAYS", 20), \
+                patch.object(constants, "UTILIZATION_LOCK_DAYS", 4):
+            get_owner_utilization(self.test_owner, date(2024, 1, 1), date(2024, 1, 15))
+            report = get_owner_utilization(self.test_owner, date(2024, 1, 14), date(2024, 1, 28), bucket="week")
+
+        self.assertEqual(len(self.calendar.utilization.available), 20)
+        self.assertNotIn(date(2024, 1, 1), self.calendar.utilization.available)
+        self.assertEqual(self.calendar.utilization.prefix[0], date(2024, 1, 14))
+        self.assertEqual([bucket["available_minutes"] for bucket in report["utilization"]], [0, 960, 0])
+        self.assertEqual(report["total"]["booked_minutes"], 60)
+
+    def test_organization_utilization(self):
+        """Test that the organization report totals every owner and lists each owner's totals"""
+        other = Calendar(owner="other_owner", availability_rules=[AvailabilityRule(
+            start_date=datetime(2024, 1, 16),
+            end_date=datetime(2024, 1, 16),
+            start_time=time(9, 0),
+            end_time=time(11, 0)
+        )])
+        calendars["other_owner"] = other
+        self._book(self.calendar, 9)
+        self._book(other, 9, day=16)
+
+        report = get_organization_utilization(date(2024, 1, 15), date(2024, 1, 16))
+
+        self.assertEqual([bucket["booked_minutes"] for bucket in report["utilization"]], [60, 60])
+        self.assertEqual([bucket["available_minutes"] for bucket in report["utilization"]], [480, 600])
+        self.assertEqual(report["owners"]["other_owner"],
+                         {"available_minutes": 120, "booked_minutes": 60, "utilization": 0.5})
+        self.assertEqual(report["total"]["booked_minutes"], 120)
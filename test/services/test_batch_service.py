@@ -0,0 +1,115 @@
+import unittest
+from datetime import datetime, time
+
+from app.models.models import (
+    calendars,
+    available_slots_cache,
+    encoded_slots_cache,
+    invitee_index,
+    Calendar,
+    AvailabilityRule
+)
+from app.services.batch_service import run_batch, run_operation
+
+
+class TestBatchService(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        calendars.clear()
+        available_slots_cache.clear()
+        encoded_slots_cache.clear()
+        invitee_index.clear()
+
+        for owner in ("owner_a", "owner_b"):
+            calendar = Calendar(owner=owner)
+            calendar.availability_rules.append(AvailabilityRule(
+                start_date=datetime(2024, 1, 15),
+                end_date=datetime(2024, 1, 15),
+                start_time=time(9, 0),
+                end_time=time(12, 0)
+            ))
+            calendars[owner] = calendar
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        calendars.clear()
+        available_slots_cache.clear()
+        encoded_slots_cache.clear()
+        invitee_index.clear()
+
+    @staticmethod
+    def _search(owner):
+        return {"op": "search_slots", "params": {"owner": owner, "request_date": "2024-01-15"}}
+
+    @staticmethod
+    def _book(owner, invitee="invitee"):
+        return {"op": "book_slot", "params": {
+            "owner": owner,
+            "invitee": invitee,
+            "start_time": "2024-01-15T09:00",
+            "end_time": "2024-01-15T10:00"
+        }}
+
+    def test_operations_of_one_owner_run_in_order(self):
+        """Test that a search, booking and repeated booking of one owner see each other's effects"""
+        results = run_batch([
+            self._search("owner_a"),
+            self._book("owner_a"),
+            self._book("owner_a", "second_invitee"),
+            self._search("owner_a")
+        ])
+
+        self.assertEqual([result["status"] for result in results], [200, 200, 409, 200])
+        self.assertEqual(len(results[3]["body"]["available_slots"]), 2)
+
+    def test_operations_of_different_owners_keep_request_order(self):
+        """Test that results of concurrently run owners are returned in request order"""
+        results = run_batch([
+            self._search("owner_a"),
+            self._search("owner_b"),
+            self._book("owner_b"),
+            {"op": "list_upcoming", "params": {"owner": "owner_a"}}
+        ])
+
+        self.assertEqual([result["status"] for result in results], [200, 200, 200, 200])
+        self.assertEqual(results[2]["body"]["appointment"]["owner"], "owner_b")
+        self.assertEqual(results[3]["body"], {"upcoming_appointments": []})
+
+    def test_invitee_check_applies_to_booked_slots(self):
+        """Test that with the invitee check a booking overlapping another owner's is rejected"""
+        for owner in ("owner_a", "owner_b"):
+            run_operation(self._search(owner))
+
+        first = run_operation(self._book("owner_a"), check_invitee=True)
+        second = run_operation(self._book("owner_b"), check_invitee=True)
+        unchecked = run_operation(self._book("owner_b"))
+
+        self.assertEqual(first["status"], 200)
+        self.assertEqual(second["status"], 409)
+        self.assertEqual(unchecked["status"], 200)
+
+    def test_invalid_operations(self):
+        """Test per-item status codes for invalid operations"""
+        results = run_batch([
+            {"op": "unknown"},
+            "not an operation",
+            {"op": "search_slots", "params": {"request_date": "2024-01-15"}},
+            {"op": "list_upcoming", "params": {"owner": "missing_owner"}},
+            self._search("missing_owner")
+        ])
+
+        self.assertEqual([result["status"] for result in results], [400, 400, 400, 404, 404])
+
+    def test_batch_must_be_a_bounded_list(self):
+        """Test that non-list and oversized batches are rejected"""
+        with self.assertRaises(ValueError):
+            run_batch({"op": "search_slots"})
+        with self.assertRaises(ValueError):
+            run_batch([self._search("owner_a")] * 101)
+
+    def test_run_operation_without_params(self):
+        """Test an operation without params"""
+        result = run_operation({"op": "list_upcoming"})
+
+        self.assertEqual(result["status"], 400)
+        self.assertIn("Missing required field", result["body"]["error"])
@@ -1,16 +1,51 @@
+import json
+import threading
 import unittest
-from datetime import datetime, time
+from datetime import date, datetime, time, timedelta
+from time import monotonic, sleep
 from unittest.mock import patch
-from app.exceptions.exceptions import NoCalenderFoundException, NoAvailableSlotsInCacheException
+from app.exceptions.exceptions import (
+    AppointmentNotFoundException,
+    InviteeDoubleBookedException,
+    NoCalenderFoundException,
+    NoAvailableSlotsInCacheException
+)
 from app.models.book_time_slot_request import BookTimeSlotRequest
-from app.models.models import Calendar, Appointment, available_slots_cache, AvailabilityRule
+from app.models.cancel_appointment_request import CancelAppointmentRequest
+from app.models.models import (
+    Calendar,
+    Appointment,
+    available_slots_cache,
+    AvailabilityRule,
+    encoded_slots_cache,
+    free_gaps_cache,
+    FreeGapIndex,
+    RecurringAppointment,
+    invitee_index
+)
+from app.models.reschedule_appointment_request import RescheduleAppointmentRequest
 from app.models.search_available_request import SearchAvailabilityRequest
-from app.services.booking_service import search_time_slots, book_time_slot
+from app.services.booking_service import (
+    search_time_slots,
+    book_time_slot,
+    search_single_flight,
+    cancel_appointment,
+    reschedule_appointment
+)
+from app.utils.booking_service_utils import (
+    get_encoded_slots_response,
+    drop_cached_slots,
+    generate_daily_available_slots,
+    has_recurring_conflict
+)
 
 
 class TestBookingService(unittest.TestCase):
     def setUp(self):
         available_slots_cache.clear()
+        encoded_slots_cache.clear()
+        free_gaps_cache.clear()
+        invitee_index.clear()
 
         self.test_owner = "test_owner"
         self.test_date = datetime(2024, 1, 15)
@@ -29,6 +64,9 @@ class TestBookingService(unittest.TestCase):
     def tearDown(self):
         """Clean up after each test method."""
         available_slots_cache.clear()
+        encoded_slots_cache.clear()
+        free_gaps_cache.clear()
+        invitee_index.clear()
 
     @patch('app.services.booking_service.get_calendar')
     def test_search_time_slots_success(self, mock_get_calendar):
@@ -141,3 +179,493 @@ class TestBookingService(unittest.TestCase):
         # Try to book the same slot again
         with self.assertRaises(NoAvailableSlotsInCacheException):
             book_time_slot(book_request)
+
+
+    @patch('app.services.booking_service.generate_daily_available_slots')
+    @patch('app.services.booking_service.get_calendar')
+    def test_concurrent_searches_share_one_generation(self, mock_get_calendar, mock_generate):
+        """Test that concurrent identical searches run slot generation once"""
+        mock_get_calendar.return_value = self.test_calendar
+        release = threading.Event()
+        slots = [{"start": "2024-01-15T09:00", "end": "2024-01-15T10:00"}]
+
+        def slow_generate(requested_date, calendar):
+            release.wait(timeout=5)
+            return slots
+
+        mock_generate.side_effect = slow_generate
+        request = SearchAvailabilityRequest(owner=self.test_owner, request_date=self.test_date)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(search_time_slots(request)))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        deadline = monotonic() + 5
+        while search_single_flight.waiting((self.test_owner, "2024-01-15")) < 4 and monotonic() < deadline:
+            sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(mock_generate.call_count, 1)
+        self.assertTrue(all(result["available_slots"] is slots for result in results))
+        self.assertIs(available_slots_cache[self.test_owner]["2024-01-15"], slots)
+
+    @patch('app.services.booking_service.generate_daily_available_slots')
+    @patch('app.services.booking_service.get_calendar')
+    def test_search_serves_cached_slots(self, mock_get_calendar, mock_generate):
+        """Test that a cached date is served without regenerating slots"""
+        mock_get_calendar.return_value = self.test_calendar
+        mock_generate.return_value = [{"start": "2024-01-15T09:00", "end": "2024-01-15T10:00"}]
+        request = SearchAvailabilityRequest(owner=self.test_owner, request_date=self.test_date)
+
+        first = search_time_slots(request)
+        second = search_time_slots(request)
+
+        self.assertEqual(mock_generate.call_count, 1)
+        self.assertIs(first["available_slots"], second["available_slots"])
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_encoded_response_is_reused_until_booking(self, mock_get_calendar):
+        """Test that the encoded response is cached with the entry and dropped on booking"""
+        mock_get_calendar.return_value = self.test_calendar
+        request = SearchAvailabilityRequest(owner=self.test_owner, request_date=self.test_date)
+
+        response = search_time_slots(request)
+        encoded = get_encoded_slots_response(self.test_owner, "2024-01-15", response)
+
+        self.assertEqual(json.loads(encoded), response)
+        self.assertIs(get_encoded_slots_response(self.test_owner, "2024-01-15", response), encoded)
+
+        book_time_slot(BookTimeSlotRequest(
+            owner=self.test_owner,
+            start_time=datetime(2024, 1, 15, 9, 0),
+            end_time=datetime(2024, 1, 15, 10, 0),
+            invitee="test_invitee"
+        ))
+
+        self.assertNotIn((self.test_owner, "2024-01-15"), encoded_slots_cache)
+        response = search_time_slots(request)
+        encoded = get_encoded_slots_response(self.test_owner, "2024-01-15", response)
+        self.assertEqual(len(json.loads(encoded)["available_slots"]), 7)
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_dropping_cache_entry_drops_encoded_response(self, mock_get_calendar):
+        """Test that the encoded response is invalidated together with the slot entry"""
+        mock_get_calendar.return_value = self.test_calendar
+        request = SearchAvailabilityRequest(owner=self.test_owner, request_date=self.test_date)
+        get_encoded_slots_response(self.test_owner, "2024-01-15", search_time_slots(request))
+
+        self.assertEqual(drop_cached_slots(self.test_owner), 1)
+
+        self.assertEqual(encoded_slots_cache, {})
+        self.assertEqual(available_slots_cache[self.test_owner], {})
+
+    def test_encoded_response_not_stored_for_uncached_slots(self):
+        """Test that responses not backed by the cache are encoded but not stored"""
+        response = {"available_slots": [{"start": "2024-01-15T09:00", "end": "2024-01-15T10:00"}]}
+
+        encoded = get_encoded_slots_response(self.test_owner, "2024-01-15", response)
+
+        self.assertEqual(json.loads(encoded), response)
+        self.assertEqual(encoded_slots_cache, {})
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_search_time_slots_range(self, mock_get_calendar):
+        """Test that a range search returns and caches the slots of every day"""
+        self.test_calendar.availability_rules[0].end_date = datetime(2024, 1, 17)
+        mock_get_calendar.return_value = self.test_calendar
+
+        request = SearchAvailabilityRequest(
+            owner=self.test_owner,
+            request_date=self.test_date,
+            end_date=datetime(2024, 1, 17)
+        )
+        result = search_time_slots(request)
+
+        self.assertEqual(len(result["available_slots"]), 24)
+        self.assertEqual(result["available_slots"][-1]["end"], "2024-01-17T17:00")
+        self.assertEqual(sorted(available_slots_cache[self.test_owner]), ["2024-01-15", "2024-01-16", "2024-01-17"])
+
+    def _book(self, start_hour: int) -> str:
+        result = book_time_slot(BookTimeSlotRequest(
+            owner=self.test_owner,
+            invitee="invitee",
+            start_time=datetime(2024, 1, 15, start_hour, 0),
+            end_time=datetime(2024, 1, 15, start_hour + 1, 0)
+        ))
+        return result["appointment"]["appointment_id"]
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_cancel_appointment_releases_slot(self, mock_get_calendar):
+        """Test that cancelling puts the slot back at its sorted position in the cache"""
+        mock_get_calendar.return_value = self.test_calendar
+        search_time_slots(SearchAvailabilityRequest(owner=self.test_owner, request_date=self.test_date))
+        appointment_id = self._book(11)
+
+        result = cancel_appointment(CancelAppointmentRequest(owner=self.test_owner, appointment_id=appointment_id))
+
+        cached = available_slots_cache[self.test_owner]["2024-01-15"]
+        self.assertEqual(result["appointment"]["appointment_id"], appointment_id)
+        self.assertEqual(len(cached), 8)
+        self.assertEqual(cached[2], {"start": "2024-01-15T11:00", "end": "2024-01-15T12:00"})
+        self.assertNotIn(appointment_id, self.test_calendar.appointment_index)
+        self.assertNotIn(self.test_date.date(), self.test_calendar.appointments)
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_cancel_unknown_appointment(self, mock_get_calendar):
+        """Test that cancelling an unknown id raises AppointmentNotFoundException"""
+        mock_get_calendar.return_value = self.test_calendar
+
+        with self.assertRaises(AppointmentNotFoundException):
+            cancel_appointment(CancelAppointmentRequest(owner=self.test_owner, appointment_id="missing"))
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_reschedule_appointment_moves_slot(self, mock_get_calendar):
+        """Test that rescheduling frees the old slot and takes the new one in the cache"""
+        mock_get_calendar.return_value = self.test_calendar
+        search_time_slots(SearchAvailabilityRequest(owner=self.test_owner, request_date=self.test_date))
+        appointment_id = self._book(9)
+
+        result = reschedule_appointment(RescheduleAppointmentRequest(
+            owner=self.test_owner,
+            appointment_id=appointment_id,
+            start_time=datetime(2024, 1, 15, 14, 0),
+            end_time=datetime(2024, 1, 15, 15, 0)
+        ))
+
+        starts = [slot["start"] for slot in available_slots_cache[self.test_owner]["2024-01-15"]]
+        self.assertEqual(result["appointment"]["start_time"], "2024-01-15T14:00")
+        self.assertEqual(starts[0], "2024-01-15T09:00")
+        self.assertNotIn("2024-01-15T14:00", starts)
+        self.assertEqual(starts, sorted(starts))
+        appointments = self.test_calendar.appointments[self.test_date.date()]
+        self.assertEqual([a.appointment_id for a in appointments], [appointment_id])
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_reschedule_checks_invitee_across_owners(self, mock_get_calendar):
+        """Test that with check_invitee a move onto the invitee's appointment with another owner is rejected"""
+        mock_get_calendar.return_value = self.test_calendar
+        search_time_slots(SearchAvailabilityRequest(owner=self.test_owner, request_date=self.test_date))
+        appointment_id = self._book(9)
+        Calendar(owner="other_owner").add_appointment(Appointment(
+            invitee="invitee",
+            start_time=datetime(2024, 1, 15, 14, 0),
+            end_time=datetime(2024, 1, 15, 15, 0)
+        ))
+
+        def reschedule(start_hour: int):
+            return reschedule_appointment(RescheduleAppointmentRequest(
+                owner=self.test_owner,
+                appointment_id=appointment_id,
+                start_time=datetime(2024, 1, 15, start_hour, 0),
+                end_time=datetime(2024, 1, 15, start_hour + 1, 0),
+                check_invitee=True
+            ))
+
+        with self.assertRaises(InviteeDoubleBookedException):
+            reschedule(14)
+        self.assertEqual(self.test_calendar.appointment_index[appointment_id].start_time, datetime(2024, 1, 15, 9, 0))
+        self.assertEqual(reschedule(10)["appointment"]["start_time"], "2024-01-15T10:00")
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_reschedule_to_booked_slot_fails(self, mock_get_calendar):
+        """Test that an appointment cannot be moved onto another booking or outside availability"""
+        mock_get_calendar.return_value = self.test_calendar
+        search_time_slots(SearchAvailabilityRequest(owner=self.test_owner, request_date=self.test_date))
+        appointment_id = self._book(9)
+        self._book(10)
+
+        for start_hour in (10, 18):
+            with self.assertRaises(NoAvailableSlotsInCacheException):
+                reschedule_appointment(RescheduleAppointmentRequest(
+                    owner=self.test_owner,
+                    appointment_id=appointment_id,
+                    start_time=datetime(2024, 1, 15, start_hour, 0),
+                    end_time=datetime(2024, 1, 15, start_hour + 1, 0)
+                ))
+        self.assertEqual(self.test_calendar.appointment_index[appointment_id].start_time, datetime(2024, 1, 15, 9, 0))
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_search_recurring_rule(self, mock_get_calendar):
+        """Test that a Mon/Wed/Fri rule with an exception date only gives slots on its days"""
+        self.test_calendar.availability_rules = [AvailabilityRule(
+            start_date=datetime(2024, 1, 15),
+            end_date=datetime(2024, 1, 28),
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+            weekday_mask=0b0010101,
+            exception_dates=frozenset({datetime(2024, 1, 17).date()})
+        )]
+        mock_get_calendar.return_value = self.test_calendar
+
+        result = search_time_slots(SearchAvailabilityRequest(
+            owner=self.test_owner,
+            request_date=datetime(2024, 1, 15),
+            end_date=datetime(2024, 1, 28)
+        ))
+
+        self.assertEqual(
+            [slot["start"] for slot in result["available_slots"]],
+            ["2024-01-15T09:00", "2024-01-19T09:00", "2024-01-22T09:00", "2024-01-24T09:00", "2024-01-26T09:00"]
+        )
+
+    def _series(self, day: int, hour: int, interval_weeks: int = 1, until=None) -> RecurringAppointment:
+        return RecurringAppointment(
+            invitee="invitee",
+            start_time=datetime(2024, 1, day, hour, 0),
+            end_time=datetime(2024, 1, day, hour + 1, 0),
+            interval_weeks=interval_weeks,
+            until=until
+        )
+
+    def test_recurring_conflicts(self):
+        """Test conflicts of a new series with one-off appointments and other series"""
+        self.test_calendar.add_recurring_appointment(self._series(1, 9, interval_weeks=2))
+        self.test_calendar.add_appointment(Appointment(
+            invitee="invitee",
+            start_time=datetime(2024, 3, 5, 10, 30),
+            end_time=datetime(2024, 3, 5, 11, 0)
+        ))
+
+        # Mondays 9:00 on the off weeks of the biweekly series
+        self.assertFalse(has_recurring_conflict(self._series(8, 9, interval_weeks=2), self.test_calendar))
+        # Every third Monday meets the biweekly series every six weeks
+        self.assertTrue(has_recurring_conflict(self._series(8, 9, interval_weeks=3), self.test_calendar))
+        # Tuesdays 10:00 reach the one-off appointment on 2024-03-05 unless they end before it
+        self.assertTrue(has_recurring_conflict(self._series(2, 10), self.test_calendar))
+        self.assertFalse(has_recurring_conflict(
+            self._series(2, 10, until=datetime(2024, 3, 4).date()), self.test_calendar
+        ))
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_recurring_series_blocks_search(self, mock_get_calendar):
+        """Test that series occurrences are excluded from generated slots without being stored"""
+        self.test_calendar.availability_rules[0].end_date = datetime(2024, 1, 31)
+        self.test_calendar.add_recurring_appointment(self._series(15, 9))
+        mock_get_calendar.return_value = self.test_calendar
+
+        result = search_time_slots(SearchAvailabilityRequest(
+            owner=self.test_owner,
+            request_date=datetime(2024, 1, 21),
+            end_date=datetime(2024, 1, 23)
+        ))
+
+        starts = [slot["start"] for slot in result["available_slots"]]
+        self.assertIn("2024-01-21T09:00", starts)
+        self.assertNotIn("2024-01-22T09:00", starts)
+        self.assertIn("2024-01-23T09:00", starts)
+        self.assertFalse(self.test_calendar.appointments)
+
+    def test_free_gap_index_occupy(self):
+        """Test that occupying an interval splits the gaps it overlaps and keeps both orders"""
+        free_gaps = FreeGapIndex()
+        free_gaps.add(datetime(2024, 1, 15, 9, 0), datetime(2024, 1, 15, 12, 0))
+        free_gaps.add(datetime(2024, 1, 15, 13, 0), datetime(2024, 1, 15, 17, 0))
+
+        free_gaps.occupy(datetime(2024, 1, 15, 11, 30), datetime(2024, 1, 15, 14, 0))
+
+        self.assertEqual(free_gaps.gaps, [
+            (datetime(2024, 1, 15, 9, 0), datetime(2024, 1, 15, 11, 30)),
+            (datetime(2024, 1, 15, 14, 0), datetime(2024, 1, 15, 17, 0))
+        ])
+        self.assertEqual(free_gaps.find(timedelta(hours=2)),
+                         (datetime(2024, 1, 15, 9, 0), datetime(2024, 1, 15, 11, 30)))
+        self.assertIsNone(free_gaps.find(timedelta(hours=4)))
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_search_free_windows(self, mock_get_calendar):
+        """Test that a duration search returns the free windows around appointments"""
+        mock_get_calendar.return_value = self.test_calendar
+        self.test_calendar.add_appointment(Appointment(
+            start_time=datetime(2024, 1, 15, 11, 0),
+            end_time=datetime(2024, 1, 15, 11, 30),
+            invitee="test_invitee"
+        ))
+
+        result = search_time_slots(SearchAvailabilityRequest(
+            owner=self.test_owner,
+            request_date=self.test_date,
+            duration=timedelta(minutes=150)
+        ))
+
+        self.assertEqual(result["free_windows"], [{"start": "2024-01-15T11:30", "end": "2024-01-15T17:00"}])
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_free_windows_follow_bookings_and_cancellations(self, mock_get_calendar):
+        """Test that booking cuts the free gaps in place and cancelling rebuilds them"""
+        mock_get_calendar.return_value = self.test_calendar
+        search_time_slots(SearchAvailabilityRequest(owner=self.test_owner, request_date=self.test_date))
+        gap_search = SearchAvailabilityRequest(
+            owner=self.test_owner,
+            request_date=self.test_date,
+            duration=timedelta(hours=4)
+        )
+        self.assertEqual(len(search_time_slots(gap_search)["free_windows"]), 1)
+        free_gaps = free_gaps_cache[self.test_owner]["2024-01-15"]
+
+        booked = book_time_slot(BookTimeSlotRequest(
+            owner=self.test_owner,
+            start_time=datetime(2024, 1, 15, 12, 0),
+            end_time=datetime(2024, 1, 15, 13, 0),
+            invitee="test_invitee"
+        ))
+
+        self.assertIs(free_gaps_cache[self.test_owner]["2024-01-15"], free_gaps)
+        self.assertEqual(search_time_slots(gap_search)["free_windows"],
+                         [{"start": "2024-01-15T13:00", "end": "2024-01-15T17:00"}])
+
+        cancel_appointment(CancelAppointmentRequest(
+            owner=self.test_owner,
+            appointment_id=booked["appointment"]["appointment_id"]
+        ))
+
+        self.assertEqual(search_time_slots(gap_search)["free_windows"],
+                         [{"start": "2024-01-15T09:00", "end": "2024-01-15T17:00"}])
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_booking_removes_slots_within_buffers(self, mock_get_calendar):
+        """Test that a booking also removes the cached slots its buffers overlap"""
+        mock_get_calendar.return_value = self.test_calendar
+        self.test_calendar.buffer_after = timedelta(minutes=30)
+        search_request = SearchAvailabilityRequest(owner=self.test_owner, request_date=self.test_date)
+        search_time_slots(search_request)
+
+        book_time_slot(BookTimeSlotRequest(
+            owner=self.test_owner,
+            start_time=datetime(2024, 1, 15, 11, 0),
+            end_time=datetime(2024, 1, 15, 12, 0),
+            invitee="test_invitee"
+        ))
+
+        starts = [slot["start"] for slot in search_time_slots(search_request)["available_slots"]]
+        self.assertNotIn("2024-01-15T12:00", starts)
+        self.assertIn("2024-01-15T10:00", starts)
+        self.assertEqual(starts, [slot["start"] for slot in generate_daily_available_slots(
+            self.test_date, self.test_calendar)])
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_daily_cap_empties_and_restores_day(self, mock_get_calendar):
+        """Test that reaching the daily cap removes the day's slots and a cancellation restores them"""
+        mock_get_calendar.return_value = self.test_calendar
+        self.test_calendar.max_per_day = 1
+        search_request = SearchAvailabilityRequest(owner=self.test_owner, request_date=self.test_date)
+        search_time_slots(search_request)
+
+        booked = book_time_slot(BookTimeSlotRequest(
+            owner=self.test_owner,
+            start_time=datetime(2024, 1, 15, 9, 0),
+            end_time=datetime(2024, 1, 15, 10, 0),
+            invitee="test_invitee"
+        ))
+
+        self.assertEqual(available_slots_cache[self.test_owner]["2024-01-15"], [])
+        cancel_appointment(CancelAppointmentRequest(
+            owner=self.test_owner,
+            appointment_id=booked["appointment"]["appointment_id"]
+        ))
+        self.assertEqual(len(available_slots_cache[self.test_owner]["2024-01-15"]), 8)
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_multi_seat_slot_counts_down(self, mock_get_calendar):
+        """Test that a slot of a rule with capacity stays offered until every seat is booked"""
+        mock_get_calendar.return_value = self.test_calendar
+        self.test_calendar.availability_rules[0].capacity = 2
+        search_request = SearchAvailabilityRequest(owner=self.test_owner, request_date=self.test_date)
+        self.assertEqual(search_time_slots(search_request)["available_slots"][0],
+                         {"start": "2024-01-15T09:00", "end": "2024-01-15T10:00", "seats_left": 2})
+
+        def book(invitee):
+            return book_time_slot(BookTimeSlotRequest(
+                owner=self.test_owner,
+                start_time=datetime(2024, 1, 15, 9, 0),
+                end_time=datetime(2024, 1, 15, 10, 0),
+                invitee=invitee
+            ))
+
+        book("first")
+        self.assertEqual(search_time_slots(search_request)["available_slots"][0]["seats_left"], 1)
+        second = book("second")
+        self.assertEqual(search_time_slots(search_request)["available_slots"][0]["start"], "2024-01-15T10:00")
+        self.assertEqual(self.test_calendar.seat_counts[(datetime(2024, 1, 15, 9, 0), datetime(2024, 1, 15, 10, 0))], 2)
+        with self.assertRaises(NoAvailableSlotsInCacheException):
+            book("third")
+
+        cancel_appointment(CancelAppointmentRequest(
+            owner=self.test_owner,
+            appointment_id=second["appointment"]["appointment_id"]
+        ))
+        self.assertEqual(search_time_slots(search_request)["available_slots"][0],
+                         {"start": "2024-01-15T09:00", "end": "2024-01-15T10:00", "seats_left": 1})
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_timezone_slots_follow_daylight_saving(self, mock_get_calendar):
+        """Test that rules are evaluated in the owner's wall time and slots are returned in UTC"""
+        mock_get_calendar.return_value = self.test_calendar
+        self.test_calendar.timezone = "America/New_York"
+        self.test_calendar.availability_rules = [AvailabilityRule(
+            start_date=datetime(2024, 3, 9),
+            end_date=datetime(2024, 3, 10),
+            start_time=time(0, 0),
+            end_time=time(4, 0)
+        )]
+
+        def starts(day):
+            request = SearchAvailabilityRequest(owner=self.test_owner, request_date=day)
+            return [slot["start"] for slot in search_time_slots(request)["available_slots"]]
+
+        self.assertEqual(starts(datetime(2024, 3, 9)),
+                         ["2024-03-09T05:00", "2024-03-09T06:00", "2024-03-09T07:00", "2024-03-09T08:00"])
+        # Clocks skip 02:00 to 03:00, so the window is three hours long
+        self.assertEqual(starts(datetime(2024, 3, 10)),
+                         ["2024-03-10T05:00", "2024-03-10T06:00", "2024-03-10T07:00"])
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_timezone_series_keeps_wall_time(self, mock_get_calendar):
+        """Test that a series in a timezone repeats at the owner's wall time across a clock change"""
+        mock_get_calendar.return_value = self.test_calendar
+        self.test_calendar.timezone = "America/New_York"
+        self.test_calendar.availability_rules = [AvailabilityRule(
+            start_date=datetime(2024, 3, 4),
+            end_date=datetime(2024, 3, 11),
+            start_time=time(8, 0),
+            end_time=time(11, 0)
+        )]
+        # 09:00 EST
+        series = RecurringAppointment(
+            invitee="invitee",
+            start_time=datetime(2024, 3, 4, 14, 0),
+            end_time=datetime(2024, 3, 4, 15, 0)
+        )
+        self.test_calendar.add_recurring_appointment(series)
+
+        result = search_time_slots(SearchAvailabilityRequest(owner=self.test_owner, request_date=datetime(2024, 3, 11)))
+
+        # 09:00 EDT is an hour earlier in UTC
+        self.assertEqual(series.occurrence_on(date(2024, 3, 11)), (datetime(2024, 3, 11, 13, 0), datetime(2024, 3, 11, 14, 0)))
+        self.assertEqual([slot["start"] for slot in result["available_slots"]],
+                         ["2024-03-11T12:00", "2024-03-11T14:00"])
+
+    @patch('app.services.booking_service.get_calendar')
+    def test_timezone_booking_on_next_utc_day(self, mock_get_calendar):
+        """Test that a slot on the next UTC day is booked from the cache of the owner's day"""
+        mock_get_calendar.return_value = self.test_calendar
+        self.test_calendar.timezone = "America/Los_Angeles"
+        self.test_calendar.availability_rules[0].start_time = time(16, 0)
+        self.test_calendar.availability_rules[0].end_time = time(19, 0)
+        self.test_calendar.max_per_day = 2
+        search_request = SearchAvailabilityRequest(owner=self.test_owner, request_date=self.test_date)
+        self.assertEqual(search_time_slots(search_request)["available_slots"][-1],
+                         {"start": "2024-01-16T02:00", "end": "2024-01-16T03:00"})
+
+        for hour in (1, 2):
+            book_time_slot(BookTimeSlotRequest(
+                owner=self.test_owner,
+                start_time=datetime(2024, 1, 16, hour, 0),
+                end_time=datetime(2024, 1, 16, hour + 1, 0),
+                invitee=f"invitee_{hour}"
+            ))
+
+        self.assertEqual(self.test_calendar.count_on(self.test_date.date()), 2)
+        self.assertEqual(available_slots_cache[self.test_owner]["2024-01-15"], [])
@@ -0,0 +1,129 @@
+import threading
+import unittest
+from datetime import datetime, time, timedelta
+from time import sleep
+
+from app.constans import constants
+from app.models.models import (
+    calendars,
+    available_slots_cache,
+    recent_search_counts,
+    record_search,
+    stale_cache_owners,
+    Calendar,
+    AvailabilityRule
+)
+from app.models.search_available_request import SearchAvailabilityRequest
+from app.services.booking_service import search_time_slots
+from app.services.cache_warmer_service import CacheWarmer
+from app.services.calendar_service import set_availability
+from app.models.set_availability_request import SetAvailabilityRequest
+
+
+class TestCacheWarmerService(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        calendars.clear()
+        available_slots_cache.clear()
+        recent_search_counts.clear()
+        stale_cache_owners.clear()
+
+        self.test_owner = "test_owner"
+        self.today = datetime.combine(datetime.now().date(), time.min)
+        self.test_calendar = Calendar(owner=self.test_owner)
+        self.test_calendar.availability_rules.append(AvailabilityRule(
+            start_date=self.today,
+            end_date=self.today + timedelta(days=30),
+            start_time=time(9, 0),
+            end_time=time(12, 0)
+        ))
+        calendars[self.test_owner] = self.test_calendar
+        self.warmer = CacheWarmer(days_ahead=3, hot_threshold=2)
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.warmer.stop()
+        calendars.clear()
+        available_slots_cache.clear()
+        recent_search_counts.clear()
+        stale_cache_owners.clear()
+
+    def _date_key(self, offset):
+        return (self.today + timedelta(days=offset)).strftime(constants.DATE_FORMAT)
+
+    def test_warm_owner_fills_upcoming_days(self):
+        """Test that warming caches slots for the next days"""
+        warmed = self.warmer.warm_owner(self.test_owner)
+
+        self.assertEqual(warmed, 3)
+        self.assertEqual(
+            sorted(available_slots_cache[self.test_owner]),
+            [self._date_key(0), self._date_key(1), self._date_key(2)]
+        )
+        self.assertEqual(len(available_slots_cache[self.test_owner][self._date_key(1)]), 3)
+
+    def test_warm_owner_skips_cached_days_unless_refreshing(self):
+        """Test that cached days are only regenerated on refresh"""
+        self.warmer.warm_owner(self.test_owner)
+
+        self.assertEqual(self.warmer.warm_owner(self.test_owner), 0)
+        self.assertEqual(self.warmer.warm_owner(self.test_owner, refresh=True), 3)
+
+    def test_warm_owner_respects_cache_bound(self):
+        """Test that warming stops adding days once the cache is full"""
+        warmer = CacheWarmer(days_ahead=3, max_cached_days=2)
+
+        self.assertEqual(warmer.warm_owner(self.test_owner), 2)
+        self.assertEqual(len(available_slots_cache[self.test_owner]), 2)
+
+    def test_warm_unknown_owner(self):
+        """Test warming an owner without a calendar"""
+        self.assertEqual(self.warmer.warm_owner("unknown_owner"), 0)
+
+    def test_hot_owners_detected_from_searches(self):
+        """Test that frequently searched and flagged owners are hot"""
+        warmer = CacheWarmer(hot_owners=["flagged_owner"], hot_threshold=2)
+        request = SearchAvailabilityRequest(owner=self.test_owner, request_date=self.today)
+        search_time_slots(request)
+        search_time_slots(request)
+
+        self.assertEqual(warmer.take_hot_owners(), ["flagged_owner", self.test_owner])
+        self.assertEqual(warmer.take_hot_owners(), ["flagged_owner"])
+
+    def test_concurrent_searches_are_all_counted(self):
+        """Test that searches recorded from many threads are not lost"""
+        threads = [threading.Thread(target=lambda: [record_search(self.test_owner) for _ in range(500)])
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(recent_search_counts[self.test_owner], 4000)
+
+    def test_availability_change_marks_owner_stale(self):
+        """Test that setting availability queues the owner for a refresh"""
+        set_availability("other_owner", SetAvailabilityRequest(availability_rules=[
+            AvailabilityRule(
+                start_date=self.today,
+                end_date=self.today,
+                start_time=time(13, 0),
+                end_time=time(14, 0)
+            )
+        ]))
+
+        self.assertEqual(self.warmer.take_stale_owners(), ["other_owner"])
+        self.assertEqual(self.warmer.take_stale_owners(), [])
+
+    def test_background_refresh_after_availability_change(self):
+        """Test that the running warmer refreshes stale owners"""
+        warmer = CacheWarmer(days_ahead=2, poll_seconds=0.01, interval_seconds=3600)
+        stale_cache_owners.add(self.test_owner)
+
+        warmer.start()
+        deadline = datetime.now() + timedelta(seconds=5)
+        while len(available_slots_cache.get(self.test_owner, {})) < 2 and datetime.now() < deadline:
+            sleep(0.01)
+        warmer.stop()
+
+        self.assertEqual(len(available_slots_cache[self.test_owner]), 2)
@@ -2,9 +2,29 @@ import unittest
 from datetime import datetime, time, timedelta
 
 from app.constans import constants
-from app.models.models import calendars, Calendar, AvailabilityRule, Appointment
+from app.models.blackout_request import BlackoutRequest
+from app.models.models import (
+    calendars,
+    holiday_calendars,
+    rule_templates,
+    interned_rules,
+    template_slots_cache,
+    available_slots_cache,
+    Calendar,
+    AvailabilityRule,
+    Appointment
+)
 from app.models.set_availability_request import SetAvailabilityRequest
-from app.services.calendar_service import set_availability, list_upcoming_appointments_for_owner
+from app.services.calendar_service import (
+    set_availability,
+    list_upcoming_appointments_for_owner,
+    add_blackouts,
+    add_holiday_blackouts,
+    subscribe_holiday_calendar,
+    set_rule_template,
+    subscribe_rule_template
+)
+from app.utils.booking_service_utils import generate_daily_available_slots, set_cached_slots, get_template_slots
 from app.utils.datetime_utils import parse_date
 
 
@@ -13,6 +33,7 @@ class TestCalendarService(unittest.TestCase):
         """Set up test fixtures before each test method."""
         # Clear calendars before each test
         calendars.clear()
+        interned_rules.clear()
 
         self.test_owner = "test_owner"
         self.test_date = datetime(2024, 1, 15)
@@ -28,6 +49,11 @@ class TestCalendarService(unittest.TestCase):
     def tearDown(self):
         """Clean up after each test method."""
         calendars.clear()
+        holiday_calendars.clear()
+        rule_templates.clear()
+        interned_rules.clear()
+        template_slots_cache.clear()
+        available_slots_cache.clear()
 
     def test_set_availability_new_calendar(self):
         """Test setting availability for a new calendar"""
@@ -57,6 +83,27 @@ class TestCalendarService(unittest.TestCase):
         self.assertIn("new_slots", result)
         self.assertEqual(len(calendars[self.test_owner].availability_rules), 1)
 
+    def test_set_availability_coalesces_adjacent_rules(self):
+        """Test that a rule continuing an existing rule's dates extends it instead of being added"""
+        set_availability(self.test_owner, SetAvailabilityRequest(availability_rules=[AvailabilityRule(
+            start_date=self.test_date,
+            end_date=datetime(2024, 1, 31),
+            start_time=time(9, 0),
+            end_time=time(17, 0)
+        )]))
+
+        set_availability(self.test_owner, SetAvailabilityRequest(availability_rules=[AvailabilityRule(
+            start_date=datetime(2024, 2, 1),
+            end_date=datetime(2024, 2, 29),
+            start_time=time(9, 0),
+            end_time=time(17, 0)
+        )]))
+
+        rules = calendars[self.test_owner].availability_rules
+        self.assertEqual(len(rules), 1)
+        self.assertEqual(rules[0].start_date, self.test_date)
+        self.assertEqual(rules[0].end_date, datetime(2024, 2, 29))
+
     def test_set_availability_overlapping_rules(self):
         """Test setting availability with overlapping rules"""
         # Create overlapping rules
@@ -130,3 +177,93 @@ class TestCalendarService(unittest.TestCase):
         result = list_upcoming_appointments_for_owner(self.test_owner)
 
         self.assertEqual(len(result), 2)
+
+    def _slot_starts(self, day: datetime):
+        return [slot["start"][11:] for slot in generate_daily_available_slots(day, calendars[self.test_owner])]
+
+    def test_blackouts_are_subtracted_from_slots(self):
+        """Test that a blacked out afternoon and a full day are removed from generated and cached slots"""
+        set_availability(self.test_owner, SetAvailabilityRequest(availability_rules=[self.test_rule]))
+        slots = generate_daily_available_slots(self.test_date, calendars[self.test_owner])
+        set_cached_slots(self.test_owner, "2024-01-15", slots)
+
+        add_blackouts(self.test_owner, BlackoutRequest(blackouts=[
+            (datetime(2024, 1, 15, 13, 30), datetime(2024, 1, 15, 15, 0)),
+            (datetime(2024, 1, 16), datetime(2024, 1, 17))
+        ]))
+
+        expected = ["09:00", "10:00", "11:00", "12:00", "15:00", "16:00"]
+        self.assertEqual(self._slot_starts(self.test_date), expected)
+        cached = available_slots_cache[self.test_owner]["2024-01-15"]
+        self.assertEqual([slot["start"][11:] for slot in cached], expected)
+        self.assertEqual(self._slot_starts(datetime(2024, 1, 16)), [])
+        self.assertEqual(len(self._slot_starts(datetime(2024, 1, 17))), 8)
+
+    def test_holiday_calendar_is_shared(self):
+        """Test that owners referencing a holiday calendar see its blackouts, including later ones"""
+        set_availability(self.test_owner, SetAvailabilityRequest(availability_rules=[self.test_rule]))
+        add_holiday_blackouts("company", BlackoutRequest(blackouts=[(datetime(2024, 1, 15), datetime(2024, 1, 16))]))
+        subscribe_holiday_calendar(self.test_owner, "company")
+        version = calendars[self.test_owner].version
+
+        add_holiday_blackouts("company", BlackoutRequest(
+            blackouts=[(datetime(2024, 1, 17, 9), datetime(2024, 1, 17, 12))]
+        ))
+
+        self.assertEqual(self._slot_starts(self.test_date), [])
+        self.assertEqual(self._slot_starts(datetime(2024, 1, 17))[0], "12:00")
+        self.assertGreater(calendars[self.test_owner].version, version)
+        self.assertEqual(holiday_calendars["company"].subscribers, {self.test_owner})
+
+    def test_rule_template_is_shared(self):
+        """Test that owners of a template share its rules and per-day template slots"""
+        set_rule_template("business_hours", SetAvailabilityRequest(availability_rules=[self.test_rule]))
+        subscribe_rule_template("first_owner", "business_hours")
+        subscribe_rule_template("second_owner", "business_hours")
+
+        first = generate_daily_available_slots(self.test_date, calendars["first_owner"])
+        second = generate_daily_available_slots(self.test_date, calendars["second_owner"])
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(first), 8)
+        self.assertEqual(len(template_slots_cache), 1)
+        self.assertIs(get_template_slots("business_hours", self.test_date.date()),
+                      next(iter(template_slots_cache.values())))
+        self.assertFalse(calendars["first_owner"].availability_rules)
+
+    def test_rule_template_replacement(self):
+        """Test that replacing a template drops owners' cached slots and reuses identical rules"""
+        set_rule_template("business_hours", SetAvailabilityRequest(availability_rules=[self.test_rule]))
+        subscribe_rule_template(self.test_owner, "business_hours")
+        set_cached_slots(self.test_owner, "2024-01-15", [])
+        morning = AvailabilityRule(
+            start_date=self.test_date,
+            end_date=datetime(2024, 12, 31),
+            start_time=time(9, 0),
+            end_time=time(12, 0)
+        )
+        set_rule_template("mornings", SetAvailabilityRequest(availability_rules=[morning]))
+
+        set_rule_template("business_hours", SetAvailabilityRequest(availability_rules=[AvailabilityRule(
+            start_date=self.test_date,
+            end_date=datetime(2024, 12, 31),
+            start_time=time(9, 0),
+            end_time=time(12, 0)
+        )]))
+
+        self.assertNotIn("2024-01-15", available_slots_cache.get(self.test_owner, {}))
+        self.assertIs(rule_templates["business_hours"].availability_rules[0], morning)
+        self.assertEqual(len(generate_daily_available_slots(self.test_date, calendars[self.test_owner])), 3)
+
+    def test_rule_template_overlap_rejected(self):
+        """Test that own rules overlapping a subscribed template are rejected"""
+        set_rule_template("business_hours", SetAvailabilityRequest(availability_rules=[self.test_rule]))
+        subscribe_rule_template(self.test_owner, "business_hours")
+
+        with self.assertRaises(ValueError):
+            set_availability(self.test_owner, SetAvailabilityRequest(availability_rules=[AvailabilityRule(
+                start_date=self.test_date,
+                end_date=self.test_date,
+                start_time=time(16, 0),
+                end_time=time(18, 0)
+            )]))
@@ -0,0 +1,137 @@
+import threading
+import unittest
+from datetime import datetime, date, time
+
+from app.constans import constants
+from app.models.models import (
+    calendars,
+    available_slots_cache,
+    expiry_heap,
+    Calendar,
+    Appointment,
+    AvailabilityRule,
+    RecurringAppointment,
+    slot_cache_lock
+)
+from app.models.search_available_request import SearchAvailabilityRequest
+from app.services.booking_service import search_time_slots
+from app.services.expiry_sweeper_service import sweep_expired, ExpirySweeper
+
+
+class TestExpirySweeperService(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        calendars.clear()
+        available_slots_cache.clear()
+        expiry_heap.clear()
+
+        self.test_owner = "test_owner"
+        self.test_calendar = Calendar(owner=self.test_owner)
+        self.test_calendar.availability_rules.append(AvailabilityRule(
+            start_date=datetime(2024, 1, 14),
+            end_date=datetime(2024, 1, 16),
+            start_time=time(9, 0),
+            end_time=time(11, 0)
+        ))
+        calendars[self.test_owner] = self.test_calendar
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        calendars.clear()
+        available_slots_cache.clear()
+        expiry_heap.clear()
+
+    def _book(self, day):
+        self.test_calendar.add_appointment(Appointment(
+            invitee="test_invitee",
+            start_time=datetime(2024, 1, day, 9, 0),
+            end_time=datetime(2024, 1, day, 10, 0)
+        ))
+
+    def test_sweep_drops_past_cache_entries(self):
+        """Test that cache entries for past dates are dropped and later ones are kept"""
+        for day in (14, 15, 16):
+            search_time_slots(SearchAvailabilityRequest(
+                owner=self.test_owner,
+                request_date=datetime(2024, 1, day)
+            ))
+
+        result = sweep_expired(today=date(2024, 1, 16))
+
+        self.assertEqual(result["expired_cache_entries"], 2)
+        self.assertEqual(list(available_slots_cache[self.test_owner]), ["2024-01-16"])
+        self.assertEqual(len(expiry_heap), 1)
+
+    def test_sweep_archives_past_appointment_days(self):
+        """Test that past appointment days are moved into the archive"""
+        self._book(14)
+        self._book(14)
+        self._book(16)
+
+        result = sweep_expired(today=date(2024, 1, 15))
+
+        self.assertEqual(result["archived_appointments"], 2)
+        self.assertEqual(list(self.test_calendar.appointments), [date(2024, 1, 16)])
+        archived = self.test_calendar.archived_appointments[date(2024, 1, 14)]
+        self.assertEqual(archived[0], ("test_invitee", datetime(2024, 1, 14, 9, 0), datetime(2024, 1, 14, 10, 0)))
+
+    def test_sweep_waits_for_bookings_in_progress(self):
+        """Test that archiving waits for the slot cache lock held by a booking"""
+        self._book(14)
+        sweeper = threading.Thread(target=sweep_expired, args=(date(2024, 1, 15),))
+
+        with slot_cache_lock:
+            sweeper.start()
+            sweeper.join(timeout=0.1)
+            self.assertTrue(sweeper.is_alive())
+            self.assertIn(date(2024, 1, 14), self.test_calendar.appointments)
+        sweeper.join(timeout=5)
+
+        self.assertFalse(sweeper.is_alive())
+        self.assertNotIn(date(2024, 1, 14), self.test_calendar.appointments)
+        self.assertEqual(len(self.test_calendar.archived_appointments[date(2024, 1, 14)]), 1)
+
+    def test_sweep_only_pops_expired_entries(self):
+        """Test that the sweep stops at the first entry that has not expired"""
+        self._book(16)
+
+        result = sweep_expired(today=date(2024, 1, 15))
+
+        self.assertEqual(
+            result,
+            {"expired_cache_entries": 0, "archived_appointments": 0, "ended_recurring_appointments": 0}
+        )
+        self.assertEqual(expiry_heap[0][:2], (date(2024, 1, 16), constants.EXPIRY_KIND_APPOINTMENTS))
+
+    def test_sweep_ignores_removed_calendars(self):
+        """Test that entries for calendars that no longer exist are discarded"""
+        self._book(14)
+        calendars.clear()
+
+        result = sweep_expired(today=date(2024, 1, 15))
+
+        self.assertEqual(result["archived_appointments"], 0)
+        self.assertEqual(expiry_heap, [])
+
+    def test_sweeper_start_and_stop(self):
+        """Test that the background sweeper can be started and stopped"""
+        sweeper = ExpirySweeper(interval_seconds=3600)
+        sweeper.start()
+        sweeper.stop()
+
+    def test_sweep_removes_ended_recurring_appointments(self):
+        """Test that a series is removed the day after its last occurrence"""
+        series = RecurringAppointment(
+            invitee="test_invitee",
+            start_time=datetime(2024, 1, 1, 9, 0),
+            end_time=datetime(2024, 1, 1, 10, 0),
+            until=date(2024, 1, 15)
+        )
+        self.test_calendar.add_recurring_appointment(series)
+
+        kept = sweep_expired(today=date(2024, 1, 15))
+        ended = sweep_expired(today=date(2024, 1, 16))
+
+        self.assertEqual(kept["ended_recurring_appointments"], 0)
+        self.assertEqual(ended["ended_recurring_appointments"], 1)
+        self.assertFalse(self.test_calendar.recurring_appointments)
@@ -0,0 +1,108 @@
+import unittest
+from datetime import datetime, time, timedelta
+from unittest.mock import patch
+
+from app.exceptions.exceptions import HoldNotFoundException
+from app.models.book_time_slot_request import BookTimeSlotRequest
+from app.models.hold_time_slot_request import HoldTimeSlotRequest
+from app.models.models import (
+    calendars,
+    available_slots_cache,
+    hold_heap,
+    Calendar,
+    AvailabilityRule
+)
+from app.models.search_available_request import SearchAvailabilityRequest
+from app.services.booking_service import search_time_slots, book_time_slot, hold_time_slot
+from app.services.hold_reaper_service import reap_expired_holds
+from app.utils.booking_service_utils import generate_daily_available_slots
+
+
+class TestHoldReaperService(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        calendars.clear()
+        available_slots_cache.clear()
+        hold_heap.clear()
+
+        self.test_owner = "test_owner"
+        self.test_date = datetime(2024, 1, 15)
+        self.test_calendar = Calendar(owner=self.test_owner)
+        self.test_calendar.availability_rules.append(AvailabilityRule(
+            start_date=self.test_date,
+            end_date=self.test_date,
+            start_time=time(9, 0),
+            end_time=time(12, 0)
+        ))
+        calendars[self.test_owner] = self.test_calendar
+        search_time_slots(SearchAvailabilityRequest(owner=self.test_owner, request_date=self.test_date))
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        calendars.clear()
+        available_slots_cache.clear()
+        hold_heap.clear()
+
+    def _hold(self, start_hour: int, ttl_seconds: int = 60) -> dict:
+        return hold_time_slot(HoldTimeSlotRequest(
+            owner=self.test_owner,
+            invitee="invitee",
+            start_time=datetime(2024, 1, 15, start_hour, 0),
+            end_time=datetime(2024, 1, 15, start_hour + 1, 0),
+            ttl_seconds=ttl_seconds
+        ))["hold"]
+
+    def _cached_starts(self):
+        return [slot["start"] for slot in available_slots_cache[self.test_owner]["2024-01-15"]]
+
+    def test_held_slot_is_hidden(self):
+        """Test that a held slot leaves the cache and is not generated while the hold is active"""
+        self._hold(10)
+
+        generated = [slot["start"] for slot in generate_daily_available_slots(self.test_date, self.test_calendar)]
+        self.assertNotIn("2024-01-15T10:00", self._cached_starts())
+        self.assertEqual(generated, ["2024-01-15T09:00", "2024-01-15T11:00"])
+
+    def test_reaper_releases_expired_holds_only(self):
+        """Test that the reaper releases expired holds in order and keeps active ones"""
+        self._hold(10, ttl_seconds=60)
+        self._hold(11, ttl_seconds=600)
+
+        released = reap_expired_holds(datetime.now() + timedelta(seconds=120))
+
+        self.assertEqual(released, 1)
+        self.assertEqual(self._cached_starts(), ["2024-01-15T09:00", "2024-01-15T10:00"])
+        self.assertEqual(len(self.test_calendar.holds), 1)
+        self.assertEqual(len(hold_heap), 1)
+
+    def test_reaper_skips_confirmed_holds(self):
+        """Test that a hold confirmed by a booking is not released by the reaper"""
+        hold = self._hold(10)
+        book_time_slot(BookTimeSlotRequest(
+            owner=self.test_owner,
+            invitee="invitee",
+            start_time=datetime(2024, 1, 15, 10, 0),
+            end_time=datetime(2024, 1, 15, 11, 0),
+            hold_id=hold["hold_id"]
+        ))
+
+        released = reap_expired_holds(datetime.now() + timedelta(seconds=120))
+
+        self.assertEqual(released, 0)
+        self.assertNotIn("2024-01-15T10:00", self._cached_starts())
+        self.assertFalse(hold_heap)
+
+    @patch('app.models.models.datetime')
+    def test_expired_hold_cannot_be_confirmed(self, mock_datetime):
+        """Test that booking with an expired hold raises HoldNotFoundException"""
+        mock_datetime.now.return_value = datetime.now() + timedelta(seconds=120)
+        hold = self._hold(10)
+
+        with self.assertRaises(HoldNotFoundException):
+            book_time_slot(BookTimeSlotRequest(
+                owner=self.test_owner,
+                invitee="invitee",
+                start_time=datetime(2024, 1, 15, 10, 0),
+                end_time=datetime(2024, 1, 15, 11, 0),
+                hold_id=hold["hold_id"]
+            ))
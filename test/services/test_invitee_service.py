@@ -0,0 +1,83 @@
+import unittest
+from datetime import datetime, time
+
+from app.models.models import (
+    calendars,
+    invitee_index,
+    invitee_series_index,
+    Appointment,
+    AvailabilityRule,
+    Calendar,
+    RecurringAppointment
+)
+from app.services.invitee_service import list_invitee_appointments
+from app.utils.common_utils import has_invitee_conflict
+
+
+class TestInviteeService(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        calendars.clear()
+        invitee_index.clear()
+        invitee_series_index.clear()
+        self.first = Calendar(owner="first_owner")
+        self.second = Calendar(owner="second_owner")
+        calendars["first_owner"] = self.first
+        calendars["second_owner"] = self.second
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        calendars.clear()
+        invitee_index.clear()
+        invitee_series_index.clear()
+
+    def _appointment(self, calendar: Calendar, day: int, hour: int, invitee: str = "invitee") -> Appointment:
+        appointment = Appointment(
+            invitee=invitee,
+            start_time=datetime(2024, 1, day, hour, 0),
+            end_time=datetime(2024, 1, day, hour + 1, 0)
+        )
+        calendar.add_appointment(appointment)
+        return appointment
+
+    def test_list_across_owners(self):
+        """Test that appointments of every owner starting in the range are listed in order"""
+        self._appointment(self.second, 15, 11)
+        self._appointment(self.first, 15, 9)
+        self._appointment(self.first, 16, 9)
+        self._appointment(self.first, 15, 10, invitee="someone_else")
+
+        result = list_invitee_appointments("invitee", datetime(2024, 1, 15), datetime(2024, 1, 16))
+
+        self.assertEqual([(a["owner"], a["start_time"]) for a in result], [
+            ("first_owner", "2024-01-15T09:00"),
+            ("second_owner", "2024-01-15T11:00")
+        ])
+
+    def test_index_follows_cancel_move_and_series(self):
+        """Test that cancelled and moved appointments and recurring series are reflected"""
+        cancelled = self._appointment(self.first, 15, 9)
+        moved = self._appointment(self.second, 15, 10)
+        self.first.remove_appointment(cancelled.appointment_id)
+        self.second.move_appointment(moved.appointment_id, datetime(2024, 1, 17, 10, 0), datetime(2024, 1, 17, 11, 0))
+        self.first.add_recurring_appointment(RecurringAppointment(
+            invitee="invitee",
+            start_time=datetime(2024, 1, 1, 14, 0),
+            end_time=datetime(2024, 1, 1, 15, 0)
+        ))
+
+        result = list_invitee_appointments("invitee", datetime(2024, 1, 15), datetime(2024, 1, 23))
+
+        self.assertEqual([a["start_time"] for a in result], [
+            "2024-01-15T14:00", "2024-01-17T10:00", "2024-01-22T14:00"
+        ])
+
+    def test_invitee_conflict(self):
+        """Test cross-owner double booking detection around the insertion point"""
+        self._appointment(self.first, 15, 9)
+        self._appointment(self.second, 15, 12)
+
+        self.assertTrue(has_invitee_conflict("invitee", datetime(2024, 1, 15, 9, 30), datetime(2024, 1, 15, 10, 30)))
+        self.assertTrue(has_invitee_conflict("invitee", datetime(2024, 1, 15, 11, 30), datetime(2024, 1, 15, 12, 30)))
+        self.assertFalse(has_invitee_conflict("invitee", datetime(2024, 1, 15, 10, 0), datetime(2024, 1, 15, 11, 0)))
+        self.assertFalse(has_invitee_conflict("other", datetime(2024, 1, 15, 9, 0), datetime(2024, 1, 15, 10, 0)))
@@ -0,0 +1,137 @@
+import threading
+import unittest
+from datetime import datetime, time
+
+from app.exceptions.exceptions import NoAvailableSlotsInCacheException, NoCalenderFoundException
+from app.models.book_team_slot_request import BookTeamSlotRequest
+from app.models.models import (
+    calendars,
+    teams,
+    available_slots_cache,
+    encoded_slots_cache,
+    free_gaps_cache,
+    invitee_index,
+    Appointment,
+    AvailabilityRule,
+    Calendar,
+    RecurringAppointment
+)
+from app.services.team_service import set_team, search_team_slots, book_team_slot
+
+
+class TestTeamService(unittest.TestCase):
+    def setUp(self):
+        """Set up three members free from 09:00 to 12:00."""
+        calendars.clear()
+        teams.clear()
+        available_slots_cache.clear()
+        encoded_slots_cache.clear()
+        free_gaps_cache.clear()
+        invitee_index.clear()
+        self.test_date = datetime(2024, 1, 15)
+        self.members = ["rep_a", "rep_b", "rep_c"]
+        for member in self.members:
+            calendars[member] = Calendar(owner=member, availability_rules=[AvailabilityRule(
+                start_date=self.test_date,
+                end_date=self.test_date,
+                start_time=time(9, 0),
+                end_time=time(12, 0)
+            )])
+        set_team("sales", self.members)
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        calendars.clear()
+        teams.clear()
+        available_slots_cache.clear()
+        encoded_slots_cache.clear()
+        free_gaps_cache.clear()
+        invitee_index.clear()
+
+    def _request(self, invitee: str, hour: int = 9) -> BookTeamSlotRequest:
+        return BookTeamSlotRequest(
+            team="sales",
+            invitee=invitee,
+            start_time=datetime(2024, 1, 15, hour, 0),
+            end_time=datetime(2024, 1, 15, hour + 1, 0)
+        )
+
+    def test_search_merges_member_slots(self):
+        """Test that equal slots of different members are merged and counted"""
+        calendars["rep_b"].add_appointment(Appointment(
+            start_time=datetime(2024, 1, 15, 10, 0),
+            end_time=datetime(2024, 1, 15, 11, 0),
+            invitee="customer"
+        ))
+
+        result = search_team_slots("sales", self.test_date)
+
+        self.assertEqual(result["available_slots"], [
+            {"start": "2024-01-15T09:00", "end": "2024-01-15T10:00", "free_members": 3},
+            {"start": "2024-01-15T10:00", "end": "2024-01-15T11:00", "free_members": 2},
+            {"start": "2024-01-15T11:00", "end": "2024-01-15T12:00", "free_members": 3}
+        ])
+
+    def test_book_least_loaded_member(self):
+        """Test that bookings go to the free member with the fewest appointments"""
+        calendars["rep_a"].add_appointment(Appointment(
+            start_time=datetime(2024, 1, 15, 11, 0),
+            end_time=datetime(2024, 1, 15, 12, 0),
+            invitee="customer"
+        ))
+
+        first = book_team_slot(self._request("first"))
+        second = book_team_slot(self._request("second"))
+
+        self.assertEqual(first["appointment"]["owner"], "rep_b")
+        self.assertEqual(second["appointment"]["owner"], "rep_c")
+        self.assertEqual(first["team"], "sales")
+
+    def test_load_counts_series_and_nearby_days_only(self):
+        """Test that members are compared by appointments and occurrences around the booked day"""
+        calendars["rep_a"].add_recurring_appointment(RecurringAppointment(
+            invitee="weekly",
+            start_time=datetime(2024, 1, 2, 14, 0),
+            end_time=datetime(2024, 1, 2, 15, 0)
+        ))
+        calendars["rep_b"].add_appointment(Appointment(
+            start_time=datetime(2024, 3, 1, 9, 0),
+            end_time=datetime(2024, 3, 1, 10, 0),
+            invitee="far_away"
+        ))
+        calendars["rep_c"].add_appointment(Appointment(
+            start_time=datetime(2024, 1, 17, 9, 0),
+            end_time=datetime(2024, 1, 17, 10, 0),
+            invitee="nearby"
+        ))
+
+        result = book_team_slot(self._request("customer"))
+
+        self.assertEqual(result["appointment"]["owner"], "rep_b")
+
+    def test_concurrent_bookings_use_each_member_once(self):
+        """Test that concurrent bookings of one slot never give a member's slot twice"""
+        search_team_slots("sales", self.test_date)
+        owners, failures = [], []
+
+        def book(invitee):
+            try:
+                owners.append(book_team_slot(self._request(invitee))["appointment"]["owner"])
+            except NoAvailableSlotsInCacheException:
+                failures.append(invitee)
+
+        threads = [threading.Thread(target=book, args=(f"invitee_{i}",)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(owners), self.members)
+        self.assertEqual(len(failures), 5)
+
+    def test_unknown_team_and_invalid_members(self):
+        """Test errors for an unknown team and an empty member list"""
+        with self.assertRaises(NoCalenderFoundException):
+            search_team_slots("support", self.test_date)
+        with self.assertRaises(ValueError):
+            set_team("support", [])
@@ -0,0 +1,120 @@
+import gzip
+import json
+import unittest
+import zlib
+from datetime import datetime, time
+
+from app import create_app
+from app.constans import constants
+from app.models.models import calendars, available_slots_cache, encoded_slots_cache, Calendar, AvailabilityRule
+from app.services import expiry_sweeper_service, hold_reaper_service
+
+
+class TestCreateApp(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.app = create_app({"TESTING": True, "COMPRESSION_MIN_SIZE": 200})
+        self.client = self.app.test_client()
+        calendars.clear()
+        available_slots_cache.clear()
+        encoded_slots_cache.clear()
+
+        self.test_owner = "test_owner"
+        calendar = Calendar(owner=self.test_owner)
+        calendar.availability_rules.append(AvailabilityRule(
+            start_date=datetime(2024, 1, 15),
+            end_date=datetime(2024, 1, 15),
+            start_time=time(8, 0),
+            end_time=time(18, 0)
+        ))
+        calendars[self.test_owner] = calendar
+        self.search_payload = {"owner": self.test_owner, "request_date": "2024-01-15"}
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        calendars.clear()
+        available_slots_cache.clear()
+        encoded_slots_cache.clear()
+        expiry_sweeper_service.stop_expiry_sweeper()
+        hold_reaper_service.stop_hold_reaper()
+
+    def test_gzip_compression(self):
+        """Test that large responses are gzip compressed when accepted"""
+        response = self.client.get('/api/appointments/search_slots', json=self.search_payload,
+                                   headers={"Accept-Encoding": "gzip"})
+
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        data = json.loads(gzip.decompress(response.data))
+        self.assertEqual(len(data["available_slots"]), 10)
+        self.assertTrue(response.headers["ETag"].startswith("W/"))
+
+    def test_deflate_compression(self):
+        """Test that deflate is used when it is the only accepted encoding"""
+        response = self.client.get('/api/appointments/search_slots', json=self.search_payload,
+                                   headers={"Accept-Encoding": "deflate"})
+
+        self.assertEqual(response.headers["Content-Encoding"], "deflate")
+        self.assertEqual(len(json.loads(zlib.decompress(response.data))["available_slots"]), 10)
+
+    def test_weak_etag_still_matches(self):
+        """Test that the weak ETag of a compressed response still yields 304"""
+        first = self.client.get('/api/appointments/search_slots', json=self.search_payload,
+                                headers={"Accept-Encoding": "gzip"})
+        second = self.client.get('/api/appointments/search_slots', json=self.search_payload,
+                                 headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]})
+
+        self.assertEqual(second.status_code, 304)
+
+    def test_small_responses_are_not_compressed(self):
+        """Test that responses under the size threshold are sent as is"""
+        response = self.client.get('/api/calendar/appointments/list_upcoming',
+                                   query_string={"owner": self.test_owner},
+                                   headers={"Accept-Encoding": "gzip"})
+
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(json.loads(response.data), {"upcoming_appointments": []})
+
+    def test_no_compression_without_accept_encoding(self):
+        """Test that responses are not compressed for clients that do not accept it"""
+        response = self.client.get('/api/appointments/search_slots', json=self.search_payload)
+
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_compact_search_response(self):
+        """Test that the compact format returns minute offsets from the start of the day"""
+        response = self.client.get('/api/appointments/search_slots', json=self.search_payload,
+                                   headers={"Accept": constants.COMPACT_JSON_MIMETYPE})
+
+        self.assertEqual(response.mimetype, constants.COMPACT_JSON_MIMETYPE)
+        data = json.loads(response.data)
+        self.assertEqual(data["base"], "2024-01-15T00:00")
+        self.assertEqual(data["available_slots"][0], [480, 540])
+        self.assertIn("Accept", response.headers["Vary"])
+
+    def test_formats_have_distinct_etags(self):
+        """Test that a JSON ETag does not validate a compact response"""
+        first = self.client.get('/api/appointments/search_slots', json=self.search_payload)
+        second = self.client.get('/api/appointments/search_slots', json=self.search_payload,
+                                 headers={"Accept": constants.COMPACT_JSON_MIMETYPE,
+                                          "If-None-Match": first.headers["ETag"]})
+
+        self.assertEqual(second.status_code, 200)
+
+    def test_debug_endpoints_not_registered_by_default(self):
+        """Test that the debug endpoints are only served when enabled"""
+        self.assertEqual(self.client.get('/api/debug/traces').status_code, 404)
+
+        app = create_app({"TESTING": True, "DEBUG_ENDPOINTS_ENABLED": True})
+        self.assertEqual(app.test_client().get('/api/debug/traces').status_code, 200)
+
+    def test_background_threads_off_when_testing(self):
+        """Test that the expiry sweeper and hold reaper only start by default outside of tests"""
+        self.assertFalse(self.app.config["EXPIRY_SWEEPER_ENABLED"])
+        self.assertFalse(self.app.config["HOLD_REAPER_ENABLED"])
+        self.assertIsNone(expiry_sweeper_service.expiry_sweeper)
+        self.assertIsNone(hold_reaper_service.hold_reaper)
+
+        app = create_app()
+        self.assertIs(app.extensions["expiry_sweeper"], expiry_sweeper_service.expiry_sweeper)
+        self.assertIs(app.extensions["hold_reaper"], hold_reaper_service.hold_reaper)
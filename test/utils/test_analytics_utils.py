@@ -0,0 +1,39 @@
+import unittest
+from datetime import date
+from unittest.mock import patch
+
+from app.utils import analytics_utils
+from app.utils.analytics_utils import get_bucket_starts, get_bucket_totals, sum_rows_by_bucket
+
+
+class TestAnalyticsUtils(unittest.TestCase):
+    def test_bucket_starts(self):
+        """Test day buckets and week buckets cut at the range ends"""
+        self.assertEqual(len(get_bucket_starts(date(2024, 1, 1), date(2024, 1, 31), "day")), 31)
+        self.assertEqual(get_bucket_starts(date(2024, 1, 3), date(2024, 1, 15), "week"),
+                         [date(2024, 1, 3), date(2024, 1, 8), date(2024, 1, 15)])
+
+    def test_invalid_buckets(self):
+        """Test that unknown buckets, reversed and too long ranges raise ValueError"""
+        with self.assertRaises(ValueError):
+            get_bucket_starts(date(2024, 1, 1), date(2024, 1, 31), "month")
+        with self.assertRaises(ValueError):
+            get_bucket_starts(date(2024, 1, 31), date(2024, 1, 1), "day")
+        with self.assertRaises(ValueError):
+            get_bucket_starts(date(2020, 1, 1), date(2024, 1, 1), "day")
+
+    def test_bucket_totals(self):
+        """Test bucket totals from running totals"""
+        self.assertEqual(get_bucket_totals([0, 1, 3, 6, 10], [0, 1, 4]), [1, 9])
+
+    def test_sum_rows_without_numpy(self):
+        """Test that the pure Python path totals rows per bucket like the NumPy one"""
+        rows = [[1, 2, 3, 4], [10, 20, 30, 40]]
+        with patch.object(analytics_utils, "numpy", None):
+            self.assertEqual(sum_rows_by_bucket(rows, [0, 1, 4]), [11, 99])
+            self.assertEqual(sum_rows_by_bucket([], [0, 2]), [0])
+
+    @unittest.skipIf(analytics_utils.numpy is None, "NumPy is not installed")
+    def test_sum_rows_with_numpy(self):
+        """Test the NumPy path against the same rows"""
+        self.assertEqual(sum_rows_by_bucket([[1, 2, 3, 4], [10, 20, 30, 40]], [0, 1, 4]), [11, 99])
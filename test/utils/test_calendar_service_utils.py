@@ -1,8 +1,8 @@
 import unittest
-from datetime import datetime, time
+from datetime import date, datetime, time, timedelta
 
 from app.models.models import AvailabilityRule
-from app.utils.calendar_service_utils import is_rules_overlapping
+from app.utils.calendar_service_utils import coalesce_rules, is_rules_overlapping
 
 
 class TestRulesOverlapping(unittest.TestCase):
@@ -187,4 +187,134 @@ class TestRulesOverlapping(unittest.TestCase):
 
         for rule1, rule2, expected in test_cases:
             result = is_rules_overlapping(rule1, rule2)
-            self.assertEqual(result, expected)
\ No newline at end of file
+            self.assertEqual(result, expected)
+
+    def _recurring_rule(self, start_date, end_date, weekday_mask, interval_weeks=1):
+        return AvailabilityRule(
+            start_date=start_date,
+            end_date=end_date,
+            start_time=time(9, 0),
+            end_time=time(12, 0),
+            weekday_mask=weekday_mask,
+            interval_weeks=interval_weeks
+        )
+
+    def test_recurring_rules_on_different_weekdays(self):
+        """Test that rules on disjoint weekdays do not overlap"""
+        mon_wed_fri = self._recurring_rule(self.base_date, datetime(2024, 6, 30), 0b0010101)
+        tue_thu = self._recurring_rule(self.base_date, datetime(2024, 6, 30), 0b0001010)
+
+        self.assertFalse(is_rules_overlapping(mon_wed_fri, tue_thu))
+        self.assertTrue(is_rules_overlapping(mon_wed_fri, self.base_rule))
+
+    def test_recurring_rules_on_alternate_weeks(self):
+        """Test that every-other-week rules starting on adjacent weeks do not overlap"""
+        even_weeks = self._recurring_rule(self.base_date, datetime(2024, 6, 30), 0b0000001, 2)
+        odd_weeks = self._recurring_rule(datetime(2024, 1, 22), datetime(2024, 6, 30), 0b0000001, 2)
+        every_third = self._recurring_rule(datetime(2024, 1, 22), datetime(2024, 6, 30), 0b0000001, 3)
+
+        self.assertFalse(is_rules_overlapping(even_weeks, odd_weeks))
+        self.assertTrue(is_rules_overlapping(even_weeks, every_third))
+
+    def test_recurring_overlap_matches_expansion(self):
+        """Test the overlap check against expanding both rules day by day"""
+        rules = [
+            self._recurring_rule(
+                datetime(2024, 1, 1) + timedelta(days=start),
+                datetime(2024, 1, 1) + timedelta(days=start + length),
+                mask,
+                interval
+            )
+            for start, length in ((0, 3), (2, 20), (5, 60))
+            for mask in (0b0000001, 0b0100100, 0b1111111)
+            for interval in (1, 2, 3)
+        ]
+        for rule1 in rules:
+            for rule2 in rules:
+                days = (rule1.end_date - rule1.start_date).days + 1
+                expanded = any(
+                    rule1.applies_on(day) and rule2.applies_on(day)
+                    for day in (rule1.start_date + timedelta(days=offset) for offset in range(days))
+                )
+                self.assertEqual(is_rules_overlapping(rule1, rule2), expanded)
+
+
+class TestCoalesceRules(unittest.TestCase):
+    def _rule(self, start_date, end_date, start_hour=9, end_hour=17, **kwargs):
+        return AvailabilityRule(
+            start_date=start_date,
+            end_date=end_date,
+            start_time=time(start_hour, 0),
+            end_time=time(end_hour, 0),
+            **kwargs
+        )
+
+    def test_adjacent_rules_are_merged(self):
+        """Test that rules with the same hours on consecutive date ranges become one rule"""
+        rules = [
+            self._rule(datetime(2024, 3, 1), datetime(2024, 3, 31)),
+            self._rule(datetime(2024, 1, 1), datetime(2024, 1, 31)),
+            self._rule(datetime(2024, 2, 1), datetime(2024, 2, 29))
+        ]
+
+        coalesced = coalesce_rules(rules)
+
+        self.assertEqual(len(coalesced), 1)
+        self.assertEqual(coalesced[0].start_date, datetime(2024, 1, 1))
+        self.assertEqual(coalesced[0].end_date, datetime(2024, 3, 31))
+        self.assertEqual(rules[1].end_date, datetime(2024, 1, 31))
+
+    def test_rules_with_gap_or_other_hours_are_kept(self):
+        """Test that rules are kept apart when their dates leave a gap or their hours differ"""
+        rules = [
+            self._rule(datetime(2024, 1, 1), datetime(2024, 1, 31)),
+            self._rule(datetime(2024, 2, 2), datetime(2024, 2, 29)),
+            self._rule(datetime(2024, 2, 1), datetime(2024, 2, 1), 10, 17)
+        ]
+
+        coalesced = coalesce_rules(rules)
+
+        self.assertEqual([rule.start_date for rule in coalesced], [
+            datetime(2024, 1, 1), datetime(2024, 2, 1), datetime(2024, 2, 2)
+        ])
+
+    def test_recurring_rules_merge_only_in_phase(self):
+        """Test that alternate-week rules merge only when their weeks line up"""
+        in_phase = [
+            self._rule(datetime(2024, 1, 1), datetime(2024, 1, 14), weekday_mask=0b0000001, interval_weeks=2),
+            self._rule(datetime(2024, 1, 15), datetime(2024, 1, 28), weekday_mask=0b0000001, interval_weeks=2,
+                       exception_dates=frozenset({datetime(2024, 1, 15).date()}))
+        ]
+        out_of_phase = [
+            self._rule(datetime(2024, 1, 1), datetime(2024, 1, 7), weekday_mask=0b0000001, interval_weeks=2),
+            self._rule(datetime(2024, 1, 8), datetime(2024, 1, 28), weekday_mask=0b0000001, interval_weeks=2)
+        ]
+
+        merged = coalesce_rules(in_phase)
+        self.assertEqual(len(merged), 1)
+        self.assertEqual(merged[0].exception_dates, frozenset({datetime(2024, 1, 15).date()}))
+        self.assertEqual(len(coalesce_rules(out_of_phase)), 2)
+
+    def test_out_of_range_exceptions_do_not_spread(self):
+        """Test that an exception outside its own rule's range does not remove a merged neighbour's day"""
+        rules = [
+            self._rule(datetime(2024, 1, 1), datetime(2024, 1, 10),
+                       exception_dates=frozenset({date(2024, 1, 15), date(2024, 1, 5)})),
+            self._rule(datetime(2024, 1, 11), datetime(2024, 1, 20))
+        ]
+
+        merged = coalesce_rules(rules)
+
+        self.assertEqual(len(merged), 1)
+        self.assertEqual(merged[0].exception_dates, frozenset({date(2024, 1, 5)}))
+
+    def test_exceptions_of_overlapping_rules_kept_only_where_both_except(self):
+        """Test that a day excepted by one overlapping rule stays covered by the other"""
+        rules = [
+            self._rule(datetime(2024, 1, 1), datetime(2024, 1, 15),
+                       exception_dates=frozenset({date(2024, 1, 12), date(2024, 1, 13)})),
+            self._rule(datetime(2024, 1, 10), datetime(2024, 1, 20),
+                       exception_dates=frozenset({date(2024, 1, 13)}))
+        ]
+
+        self.assertEqual(coalesce_rules(rules)[0].exception_dates, frozenset({date(2024, 1, 13)}))
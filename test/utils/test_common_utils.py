@@ -1,10 +1,23 @@
 import unittest
-from datetime import datetime, date, time
+from datetime import datetime, date, time, timedelta
 
 from app.constans import constants
 from app.exceptions.exceptions import NoCalenderFoundException
-from app.models.models import Calendar, Appointment, calendars
-from app.utils.common_utils import get_calendar, is_slot_booked, get_slot_in_cache
+from app.models.models import (
+    Calendar,
+    Appointment,
+    RecurringAppointment,
+    calendars,
+    invitee_index,
+    invitee_series_index
+)
+from app.utils.common_utils import (
+    get_calendar,
+    get_booking_violation,
+    has_invitee_conflict,
+    is_slot_booked,
+    get_slot_in_cache
+)
 
 
 class TestCommonUtils(unittest.TestCase):
@@ -12,6 +25,8 @@ class TestCommonUtils(unittest.TestCase):
         """Set up test fixtures before each test method."""
         # Clear calendars before each test
         calendars.clear()
+        invitee_index.clear()
+        invitee_series_index.clear()
 
         self.test_owner = "test_owner"
         self.test_date = datetime(2024, 1, 15)
@@ -20,6 +35,8 @@ class TestCommonUtils(unittest.TestCase):
     def tearDown(self):
         """Clean up after each test method."""
         calendars.clear()
+        invitee_index.clear()
+        invitee_series_index.clear()
 
     def test_get_calendar_success(self):
         """Test successful calendar retrieval"""
@@ -112,6 +129,87 @@ class TestCommonUtils(unittest.TestCase):
         result = is_slot_booked(start_time, end_time, self.test_calendar)
         self.assertTrue(result)
 
+    def test_booking_violation_buffers(self):
+        """Test that buffers block slots next to an appointment but not further away"""
+        self.test_calendar.buffer_before = timedelta(minutes=15)
+        self.test_calendar.buffer_after = timedelta(minutes=30)
+        self.test_calendar.add_appointment(Appointment(
+            start_time=datetime(2024, 1, 15, 11, 0),
+            end_time=datetime(2024, 1, 15, 12, 0),
+            invitee="test_invitee"
+        ))
+        now = datetime(2024, 1, 1)
+
+        self.assertIsNotNone(get_booking_violation(
+            datetime(2024, 1, 15, 10, 0), datetime(2024, 1, 15, 11, 0), self.test_calendar, now))
+        self.assertIsNotNone(get_booking_violation(
+            datetime(2024, 1, 15, 12, 0), datetime(2024, 1, 15, 13, 0), self.test_calendar, now))
+        self.assertIsNone(get_booking_violation(
+            datetime(2024, 1, 15, 12, 30), datetime(2024, 1, 15, 13, 30), self.test_calendar, now))
+        self.assertIsNone(get_booking_violation(
+            datetime(2024, 1, 15, 9, 45), datetime(2024, 1, 15, 10, 45), self.test_calendar, now))
+
+    def test_booking_violation_notice_and_daily_cap(self):
+        """Test the minimum notice cutoff and the daily appointment limit"""
+        self.test_calendar.min_notice = timedelta(hours=2)
+        self.test_calendar.max_per_day = 1
+        self.test_calendar.add_appointment(Appointment(
+            start_time=datetime(2024, 1, 16, 9, 0),
+            end_time=datetime(2024, 1, 16, 10, 0),
+            invitee="test_invitee"
+        ))
+        now = datetime(2024, 1, 15, 9, 0)
+
+        self.assertIn("notice", get_booking_violation(
+            datetime(2024, 1, 15, 10, 0), datetime(2024, 1, 15, 11, 0), self.test_calendar, now))
+        self.assertIsNone(get_booking_violation(
+            datetime(2024, 1, 15, 11, 0), datetime(2024, 1, 15, 12, 0), self.test_calendar, now))
+        self.assertIn("daily", get_booking_violation(
+            datetime(2024, 1, 16, 14, 0), datetime(2024, 1, 16, 15, 0), self.test_calendar, now))
+
+    def test_invitee_conflict_with_overlapping_entries(self):
+        """Test that a long appointment is found past a shorter one starting after it"""
+        for start_hour, start_minute, end_hour in ((9, 0, 12), (9, 30, 10)):
+            self.test_calendar.add_appointment(Appointment(
+                start_time=datetime(2024, 1, 15, start_hour, start_minute),
+                end_time=datetime(2024, 1, 15, end_hour, 0),
+                invitee="test_invitee"
+            ))
+
+        self.assertTrue(has_invitee_conflict("test_invitee", datetime(2024, 1, 15, 11, 0), datetime(2024, 1, 15, 11, 30)))
+        self.assertFalse(has_invitee_conflict("test_invitee", datetime(2024, 1, 15, 12, 0), datetime(2024, 1, 15, 13, 0)))
+
+    def test_invitee_conflict_excluding_an_appointment(self):
+        """Test that the excluded appointment is ignored even when its end is the running latest end"""
+        long_appointment = Appointment(
+            start_time=datetime(2024, 1, 15, 9, 0),
+            end_time=datetime(2024, 1, 15, 12, 0),
+            invitee="test_invitee"
+        )
+        self.test_calendar.add_appointment(long_appointment)
+        self.test_calendar.add_appointment(Appointment(
+            start_time=datetime(2024, 1, 15, 9, 30),
+            end_time=datetime(2024, 1, 15, 10, 0),
+            invitee="test_invitee"
+        ))
+
+        self.assertFalse(has_invitee_conflict("test_invitee", datetime(2024, 1, 15, 11, 0), datetime(2024, 1, 15, 11, 30),
+                                              exclude_id=long_appointment.appointment_id))
+        self.assertTrue(has_invitee_conflict("test_invitee", datetime(2024, 1, 15, 9, 45), datetime(2024, 1, 15, 10, 15),
+                                             exclude_id=long_appointment.appointment_id))
+
+    def test_invitee_conflict_with_recurring_series(self):
+        """Test that occurrences of the invitee's series count as conflicts"""
+        calendars[self.test_owner] = self.test_calendar
+        self.test_calendar.add_recurring_appointment(RecurringAppointment(
+            invitee="test_invitee",
+            start_time=datetime(2024, 1, 15, 9, 0),
+            end_time=datetime(2024, 1, 15, 10, 0)
+        ))
+
+        self.assertTrue(has_invitee_conflict("test_invitee", datetime(2024, 1, 22, 9, 30), datetime(2024, 1, 22, 10, 30)))
+        self.assertFalse(has_invitee_conflict("test_invitee", datetime(2024, 1, 23, 9, 30), datetime(2024, 1, 23, 10, 30)))
+
     def test_get_slot_in_cache_success(self):
         """Test successful slot retrieval from cache"""
         requested_slot = {
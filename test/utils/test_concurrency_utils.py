@@ -0,0 +1,71 @@
+import threading
+import time
+import unittest
+
+from app.utils.concurrency_utils import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.single_flight = SingleFlight()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def _slow_call(self):
+        self.calls += 1
+        self.release.wait(timeout=5)
+        return ["slot"]
+
+    def _run_concurrently(self, key_fn, count):
+        results = [None] * count
+        errors = [None] * count
+
+        def worker(index):
+            try:
+                results[index] = self.single_flight.do(key_fn(index), self._slow_call)
+            except Exception as e:
+                errors[index] = e
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads, results, errors
+
+    def test_single_call(self):
+        """Test that a lone call runs the function and returns its result"""
+        self.assertEqual(self.single_flight.do("key", lambda: 42), 42)
+        self.assertEqual(self.single_flight.in_flight(), 0)
+
+    def test_concurrent_identical_calls_are_coalesced(self):
+        """Test that concurrent calls with the same key share one execution"""
+        threads, results, errors = self._run_concurrently(lambda i: "key", 10)
+        deadline = time.monotonic() + 5
+        while self.single_flight.waiting("key") < 9 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(errors, [None] * 10)
+
+    def test_different_keys_run_independently(self):
+        """Test that calls with different keys are not coalesced"""
+        self.release.set()
+        for key in ("a", "b"):
+            self.single_flight.do(key, self._slow_call)
+
+        self.assertEqual(self.calls, 2)
+
+    def test_error_is_shared_and_flight_is_cleared(self):
+        """Test that an exception reaches the caller and does not leave the key in flight"""
+        def failing_call():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            self.single_flight.do("key", failing_call)
+
+        self.assertEqual(self.single_flight.in_flight(), 0)
+        self.assertEqual(self.single_flight.do("key", lambda: 1), 1)
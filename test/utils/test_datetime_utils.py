@@ -1,7 +1,7 @@
 import unittest
-from datetime import datetime, time
+from datetime import date, datetime, time
 
-from app.utils.datetime_utils import parse_date, parse_time
+from app.utils.datetime_utils import parse_date, parse_time, parse_weekdays, weekdays_between
 
 
 class TestDateTimeParsing(unittest.TestCase):
@@ -54,4 +54,21 @@ class TestDateTimeParsing(unittest.TestCase):
         """Test handling an invalid minute value."""
         with self.assertRaises(ValueError) as context:
             parse_time("14:60")  # Invalid minute
-        self.assertIn("Invalid time format", str(context.exception))
\ No newline at end of file
+        self.assertIn("Invalid time format", str(context.exception))
+
+    # Tests for weekday masks
+    def test_weekdays_between(self):
+        """Test weekday masks of short, wrapping and full ranges."""
+        # 2024-01-15 is a Monday
+        self.assertEqual(weekdays_between(date(2024, 1, 15), date(2024, 1, 17)), 0b0000111)
+        self.assertEqual(weekdays_between(date(2024, 1, 20), date(2024, 1, 22)), 0b1100001)
+        self.assertEqual(weekdays_between(datetime(2024, 1, 1), datetime(2024, 2, 1)), 0b1111111)
+        self.assertEqual(weekdays_between(date(2024, 1, 17), date(2024, 1, 15)), 0)
+
+    def test_parse_weekdays(self):
+        """Test parsing weekday names into a mask."""
+        self.assertEqual(parse_weekdays(["MON", "wed", "Friday"]), 0b0010101)
+        with self.assertRaises(ValueError):
+            parse_weekdays(["Funday"])
+        with self.assertRaises(ValueError):
+            parse_weekdays([])
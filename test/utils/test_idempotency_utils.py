@@ -0,0 +1,87 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from app.exceptions.exceptions import IdempotencyKeyConflictException
+from app.utils.idempotency_utils import IdempotencyStore
+
+
+class TestIdempotencyStore(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.store = IdempotencyStore(ttl_seconds=60, max_keys=2)
+        self.calls = 0
+
+    def _book(self):
+        self.calls += 1
+        return {"booking": self.calls}
+
+    def test_first_call_runs_and_retry_is_replayed(self):
+        """Test that a retry with the same key returns the stored result"""
+        first = self.store.run("key", "payload", self._book)
+        second = self.store.run("key", "payload", self._book)
+
+        self.assertEqual(first, ({"booking": 1}, False))
+        self.assertEqual(second, ({"booking": 1}, True))
+        self.assertEqual(self.calls, 1)
+
+    def test_key_reused_with_different_payload(self):
+        """Test that reusing a key for another request is rejected"""
+        self.store.run("key", "payload", self._book)
+
+        with self.assertRaises(IdempotencyKeyConflictException):
+            self.store.run("key", "other payload", self._book)
+
+    def test_failed_attempts_are_not_stored(self):
+        """Test that an attempt that raised can be retried"""
+        def failing():
+            raise ValueError("not available")
+
+        with self.assertRaises(ValueError):
+            self.store.run("key", "payload", failing)
+
+        self.assertEqual(self.store.run("key", "payload", self._book), ({"booking": 1}, False))
+
+    def test_store_is_bounded(self):
+        """Test that the oldest key is evicted when the store is full"""
+        for key in ("a", "b", "c"):
+            self.store.run(key, "payload", self._book)
+
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.run("a", "payload", self._book), ({"booking": 4}, False))
+
+    @patch('app.utils.idempotency_utils.time.monotonic')
+    def test_entries_expire(self, mock_monotonic):
+        """Test that entries older than the TTL are discarded"""
+        mock_monotonic.return_value = 1000
+        self.store.run("key", "payload", self._book)
+
+        mock_monotonic.return_value = 1061
+        result, replayed = self.store.run("key", "payload", self._book)
+
+        self.assertFalse(replayed)
+        self.assertEqual(self.calls, 2)
+
+    def test_concurrent_retries_run_once(self):
+        """Test that concurrent requests with the same key book only once"""
+        release = threading.Event()
+
+        def slow_book():
+            release.wait(timeout=5)
+            return self._book()
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.store.run("key", "payload", slow_book)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while self.store._single_flight.waiting("key") < 3 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(sorted(replayed for _, replayed in results), [False, True, True, True])
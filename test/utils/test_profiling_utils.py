@@ -0,0 +1,89 @@
+import unittest
+from datetime import datetime, date, time
+
+from app.models.models import calendars, available_slots_cache, Calendar, Appointment, AvailabilityRule
+from app.utils.profiling_utils import (
+    configure_profiling,
+    start_profile,
+    stop_profile,
+    get_profile_report,
+    reset_profiles,
+    get_structure_sizes,
+    deep_sizeof
+)
+
+
+class TestProfilingUtils(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        calendars.clear()
+        available_slots_cache.clear()
+        reset_profiles()
+        configure_profiling(enabled=True, sample_rate=0.0)
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        calendars.clear()
+        available_slots_cache.clear()
+        reset_profiles()
+        configure_profiling(enabled=False, sample_rate=0.0)
+
+    def test_disabled_profiling_never_profiles(self):
+        """Test that no profiler is started when profiling is disabled"""
+        configure_profiling(enabled=False, sample_rate=1.0)
+
+        self.assertIsNone(start_profile(force=True))
+
+    def test_unsampled_request_is_not_profiled(self):
+        """Test that requests are not profiled at a zero sample rate"""
+        self.assertIsNone(start_profile())
+
+    def test_stats_are_aggregated_per_route(self):
+        """Test that forced profiles are merged into one entry per route"""
+        for _ in range(2):
+            profiler = start_profile(force=True)
+            self.assertIsNotNone(profiler)
+            sorted(range(100))
+            stop_profile(profiler, "appointments.search_available_slots")
+
+        report = get_profile_report()
+
+        self.assertEqual(list(report), ["appointments.search_available_slots"])
+        self.assertEqual(report["appointments.search_available_slots"]["requests"], 2)
+        self.assertIn("function calls", report["appointments.search_available_slots"]["stats"])
+
+    def test_invalid_sample_rate(self):
+        """Test configuring an out of range sample rate"""
+        with self.assertRaises(ValueError):
+            configure_profiling(enabled=True, sample_rate=-0.1)
+
+    def test_structure_sizes(self):
+        """Test that the memory held by calendars and the slot cache is reported per day"""
+        calendar = Calendar(owner="test_owner")
+        calendar.availability_rules.append(AvailabilityRule(
+            start_date=datetime(2024, 1, 15),
+            end_date=datetime(2024, 1, 15),
+            start_time=time(9, 0),
+            end_time=time(17, 0)
+        ))
+        calendar.add_appointment(Appointment(
+            invitee="test_invitee",
+            start_time=datetime(2024, 1, 15, 9, 0),
+            end_time=datetime(2024, 1, 15, 10, 0)
+        ))
+        calendars["test_owner"] = calendar
+        available_slots_cache["test_owner"] = {
+            "2024-01-15": [{"start": "2024-01-15T10:00", "end": "2024-01-15T11:00"}]
+        }
+
+        sizes = get_structure_sizes()
+
+        self.assertGreater(sizes["calendars"], 0)
+        self.assertGreater(sizes["available_slots_cache"], 0)
+        self.assertEqual(sizes["largest_appointment_days"][0]["date"], "2024-01-15")
+        self.assertEqual(sizes["largest_cached_slot_days"][0]["owner"], "test_owner")
+
+    def test_deep_sizeof_counts_shared_objects_once(self):
+        """Test that objects reachable twice are only counted once"""
+        shared = [date(2024, 1, 15)] * 10
+        self.assertLess(deep_sizeof([shared, shared]), 2 * deep_sizeof(shared))
@@ -0,0 +1,45 @@
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from app.utils.timezone_utils import get_day_bounds, get_offset_transitions, get_zone, local_to_utc, utc_to_local
+
+
+class TestTimezoneUtils(unittest.TestCase):
+    def test_offset_transitions(self):
+        """Test that the transitions of a year are found to the minute"""
+        instants, offsets = get_offset_transitions("America/New_York", 2024)
+
+        self.assertEqual(instants[1:], [datetime(2024, 3, 10, 7, 0), datetime(2024, 11, 3, 6, 0)])
+        self.assertEqual(offsets, [timedelta(hours=-5), timedelta(hours=-4), timedelta(hours=-5)])
+
+    def test_conversions_match_zoneinfo(self):
+        """Test both conversions against zoneinfo every 15 minutes around the clock changes"""
+        for zone_name in ("America/New_York", "Europe/London", "Australia/Lord_Howe", "Asia/Kolkata"):
+            zone = ZoneInfo(zone_name)
+            for month in (3, 4, 10, 11):
+                instant = datetime(2024, month, 1)
+                while instant < datetime(2024, month, 1) + timedelta(days=8):
+                    expected = instant.replace(tzinfo=timezone.utc).astimezone(zone).replace(tzinfo=None)
+                    self.assertEqual(utc_to_local(instant, zone_name), expected)
+                    expected_utc = expected.replace(tzinfo=zone, fold=0).astimezone(timezone.utc).replace(tzinfo=None)
+                    self.assertEqual(local_to_utc(expected, zone_name), expected_utc)
+                    instant += timedelta(minutes=15)
+
+    def test_skipped_and_repeated_wall_times(self):
+        """Test that a skipped wall time moves forward and a repeated one takes its first occurrence"""
+        self.assertEqual(local_to_utc(datetime(2024, 3, 10, 2, 30), "America/New_York"), datetime(2024, 3, 10, 7, 30))
+        self.assertEqual(local_to_utc(datetime(2024, 11, 3, 1, 30), "America/New_York"), datetime(2024, 11, 3, 5, 30))
+
+    def test_day_bounds(self):
+        """Test that days are 23 or 25 hours long when the clocks change"""
+        start, end = get_day_bounds(date(2024, 3, 10), "America/New_York")
+        self.assertEqual((start, end - start), (datetime(2024, 3, 10, 5, 0), timedelta(hours=23)))
+        start, end = get_day_bounds(date(2024, 11, 3), "America/New_York")
+        self.assertEqual(end - start, timedelta(hours=25))
+        self.assertEqual(get_day_bounds(date(2024, 11, 3)), (datetime(2024, 11, 3), datetime(2024, 11, 4)))
+
+    def test_unknown_zone(self):
+        """Test that an unknown timezone raises ValueError"""
+        with self.assertRaises(ValueError):
+            get_zone("Mars/Olympus_Mons")
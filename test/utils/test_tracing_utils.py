@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+import unittest
+
+from app.utils import tracing_utils
+from app.utils.tracing_utils import (
+    configure_tracing,
+    start_trace,
+    end_trace,
+    span,
+    traced,
+    get_current_span
+)
+
+
+class TestTracingUtils(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        configure_tracing(sample_rate=0.0, buffer_size=100)
+        tracing_utils.ring_buffer_exporter.clear()
+
+    def tearDown(self):
+        """Clean up after each test method."""
+        configure_tracing(sample_rate=0.0, buffer_size=100)
+        tracing_utils.ring_buffer_exporter.clear()
+
+    def test_unsampled_request_records_nothing(self):
+        """Test that spans are no-ops when the request is not sampled"""
+        token = start_trace("GET /search_slots")
+        self.assertIsNone(token)
+
+        with span("search_time_slots") as current:
+            self.assertIsNone(current)
+
+        end_trace(token)
+        self.assertEqual(tracing_utils.ring_buffer_exporter.get_spans(), [])
+
+    def test_forced_trace_records_nested_spans(self):
+        """Test that nested spans are parented to the enclosing span"""
+        token = start_trace("GET /search_slots", force=True)
+
+        with span("search_time_slots") as outer:
+            with span("generate_daily_available_slots") as inner:
+                self.assertEqual(inner.parent_id, outer.span_id)
+        root = end_trace(token)
+
+        spans = tracing_utils.ring_buffer_exporter.get_spans(root.trace_id)
+        self.assertEqual(len(spans), 3)
+        self.assertEqual(outer.parent_id, root.span_id)
+        self.assertTrue(all(s.trace_id == root.trace_id for s in spans))
+        self.assertIsNone(get_current_span())
+
+    def test_sample_rate_one_traces_every_request(self):
+        """Test that a sample rate of 1 traces every request"""
+        configure_tracing(sample_rate=1.0, buffer_size=100)
+
+        token = start_trace("GET /search_slots")
+
+        self.assertIsNotNone(token)
+        end_trace(token)
+
+    def test_invalid_sample_rate(self):
+        """Test configuring an out of range sample rate"""
+        with self.assertRaises(ValueError):
+            configure_tracing(sample_rate=1.5, buffer_size=100)
+
+    def test_traced_decorator(self):
+        """Test that the decorator opens a span named after the function"""
+        @traced()
+        def add(a, b):
+            return a + b
+
+        self.assertEqual(add(1, 2), 3)
+        token = start_trace("root", force=True)
+        self.assertEqual(add(2, 3), 5)
+        root = end_trace(token)
+
+        names = [s.name for s in tracing_utils.ring_buffer_exporter.get_spans(root.trace_id)]
+        self.assertIn("add", names)
+
+    def test_ring_buffer_is_bounded(self):
+        """Test that the ring buffer keeps only the most recent spans"""
+        configure_tracing(sample_rate=0.0, buffer_size=2)
+
+        for _ in range(3):
+            end_trace(start_trace("root", force=True))
+
+        self.assertEqual(len(tracing_utils.ring_buffer_exporter.get_spans()), 2)
+
+    def test_file_exporter(self):
+        """Test that spans are appended to the export file as JSON lines"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "spans.jsonl")
+            configure_tracing(sample_rate=0.0, buffer_size=100, export_file=path)
+
+            token = start_trace("root", force=True)
+            with span("child"):
+                pass
+            end_trace(token)
+
+            with open(path) as trace_file:
+                lines = [json.loads(line) for line in trace_file]
+            self.assertEqual([line["name"] for line in lines], ["child", "root"])
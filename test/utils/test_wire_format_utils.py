@@ -0,0 +1,72 @@
+import json
+import unittest
+from datetime import datetime
+
+from werkzeug.datastructures import MIMEAccept
+
+from app.constans import constants
+from app.utils.wire_format_utils import (
+    negotiate_media_type,
+    compact_slots,
+    compact_appointments,
+    encode_payload,
+    get_supported_media_types
+)
+
+
+class TestWireFormatUtils(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.base = datetime(2024, 1, 15)
+
+    def test_negotiate_defaults_to_json(self):
+        """Test that plain JSON is chosen for wildcard or missing Accept headers"""
+        self.assertEqual(negotiate_media_type(MIMEAccept()), constants.JSON_MIMETYPE)
+        self.assertEqual(negotiate_media_type(MIMEAccept([("*/*", 1)])), constants.JSON_MIMETYPE)
+
+    def test_negotiate_compact(self):
+        """Test that the compact format is chosen when requested"""
+        accept = MIMEAccept([(constants.COMPACT_JSON_MIMETYPE, 1), (constants.JSON_MIMETYPE, 0.5)])
+
+        self.assertEqual(negotiate_media_type(accept), constants.COMPACT_JSON_MIMETYPE)
+
+    def test_negotiate_unsupported_falls_back_to_json(self):
+        """Test that an unsupported Accept header falls back to JSON"""
+        self.assertEqual(negotiate_media_type(MIMEAccept([("text/html", 1)])), constants.JSON_MIMETYPE)
+
+    def test_msgpack_offered_only_when_installed(self):
+        """Test that MessagePack is only negotiated when the library is available"""
+        try:
+            import msgpack  # noqa: F401
+            self.assertIn(constants.MSGPACK_MIMETYPE, get_supported_media_types())
+        except ImportError:
+            self.assertNotIn(constants.MSGPACK_MIMETYPE, get_supported_media_types())
+
+    def test_compact_slots(self):
+        """Test that slots become minute offsets from the base, including slots ending at midnight"""
+        slots = [
+            {"start": "2024-01-15T09:00", "end": "2024-01-15T10:00"},
+            {"start": "2024-01-15T23:00", "end": "2024-01-16T00:00"}
+        ]
+
+        self.assertEqual(compact_slots(slots, self.base), [[540, 600], [1380, 1440]])
+        shared_slot = {"start": "2024-01-15T09:00", "end": "2024-01-15T10:00", "seats_left": 4}
+        self.assertEqual(compact_slots([shared_slot], self.base), [[540, 600, 4]])
+
+    def test_compact_appointments(self):
+        """Test that appointments become invitee, minute offsets and appointment id entries"""
+        appointments = [{
+            "appointment_id": "abc123",
+            "invitee": "a",
+            "start_time": "2024-01-16T09:30",
+            "end_time": "2024-01-16T10:00"
+        }]
+
+        self.assertEqual(compact_appointments(appointments, self.base), [["a", 2010, 2040, "abc123"]])
+
+    def test_encode_json_payload(self):
+        """Test that JSON payloads are encoded compactly"""
+        encoded = encode_payload({"b": 1, "a": [1, 2]}, constants.JSON_MIMETYPE)
+
+        self.assertEqual(encoded, b'{"a":[1,2],"b":1}\n')
+        self.assertEqual(json.loads(encoded), {"a": [1, 2], "b": 1})